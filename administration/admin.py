@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Announcement, Committee, CommitteeMember, Meeting, MeetingAttendance,
-    Policy, Grievance, Report, AuditLog
+    Policy, Grievance, Report, AuditLog, PersonSearchEntry
 )
 
 @admin.register(Announcement)
@@ -50,9 +50,19 @@ class GrievanceAdmin(admin.ModelAdmin):
 
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
-    list_display = ('title', 'report_type', 'status', 'generated_by', 'generated_at', 'download_count')
+    list_display = ('title', 'report_type', 'status', 'generated_by', 'generated_at', 'completed_at', 'claimed_by', 'download_count')
     list_filter = ('report_type', 'status', 'is_scheduled', 'generated_at')
     search_fields = ('title', 'description')
+    readonly_fields = ('claimed_at', 'claimed_by', 'error_message', 'next_run_at', 'data_watermark')
+    actions = ['regenerate_reports']
+
+    def regenerate_reports(self, request, queryset):
+        """Queue the selected reports for the background report worker"""
+        from .report_utils import queue_report
+        for report in queryset:
+            queue_report(report)
+        self.message_user(request, f'{queryset.count()} reports queued for generation.')
+    regenerate_reports.short_description = 'Regenerate selected reports'
 
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
@@ -61,3 +71,10 @@ class AuditLogAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'model_name', 'object_repr')
     readonly_fields = ('user', 'action_type', 'model_name', 'object_id', 'object_repr', 'changes', 'ip_address', 'user_agent', 'timestamp', 'session_key')
     date_hierarchy = 'timestamp'
+
+@admin.register(PersonSearchEntry)
+class PersonSearchEntryAdmin(admin.ModelAdmin):
+    list_display = ('identifier', 'full_name', 'person_type', 'email', 'phone_number', 'description', 'updated_at')
+    list_filter = ('person_type',)
+    search_fields = ('^identifier', '^full_name', '^email')
+    readonly_fields = ('person_type', 'object_id', 'identifier', 'full_name', 'email', 'phone_number', 'description', 'search_text', 'updated_at')
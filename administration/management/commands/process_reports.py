@@ -0,0 +1,60 @@
+"""
+Django management command that generates queued administrative reports
+"""
+import os
+import socket
+import time
+from django.core.management.base import BaseCommand
+from administration.report_utils import process_queued_reports
+
+class Command(BaseCommand):
+    help = 'Claim queued reports from the database and generate them; run one per node to share the queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1,
+            help='Number of reports generated per poll, claimed one at a time'
+        )
+        parser.add_argument(
+            '--worker-id',
+            type=str,
+            default=f'{socket.gethostname()}:{os.getpid()}',
+            help='Name recorded on claimed reports (defaults to host:pid)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new reports instead of exiting once the queue is empty'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10.0,
+            help='Seconds to sleep between polls when the queue is empty (with --loop)'
+        )
+
+    def handle(self, *args, **options):
+        totals = {'completed': 0, 'failed': 0}
+
+        try:
+            while True:
+                result = process_queued_reports(options['worker_id'], batch_size=options['batch_size'])
+                for key in totals:
+                    totals[key] += result[key]
+
+                if sum(result.values()):
+                    self.stdout.write(f"Batch: {result['completed']} completed, {result['failed']} failed")
+                    continue
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Interrupted, stopping report worker'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Report queue drained: {totals['completed']} completed, {totals['failed']} failed"
+        ))
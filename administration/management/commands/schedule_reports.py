@@ -0,0 +1,41 @@
+"""
+Django management command that queues scheduled reports when they are due
+"""
+import time
+from django.core.management.base import BaseCommand
+from administration.report_utils import schedule_due_reports
+
+class Command(BaseCommand):
+    help = 'Queue scheduled reports whose cron schedule is due; the process_reports worker generates them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep checking schedules instead of exiting after one pass'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds between schedule checks (with --loop)'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+
+        try:
+            while True:
+                queued = schedule_due_reports()
+                total += queued
+                if queued:
+                    self.stdout.write(f'{queued} scheduled reports queued')
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Interrupted, stopping report scheduler'))
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} scheduled reports queued'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['status', 'claimed_at'], name='administrat_status_8ca5d3_idx'),
+        ),
+    ]
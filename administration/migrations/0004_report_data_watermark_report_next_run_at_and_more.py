@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0003_report_claimed_at_report_claimed_by_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='data_watermark',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='next_run_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['is_scheduled', 'next_run_at'], name='administrat_is_sche_02b99b_idx'),
+        ),
+    ]
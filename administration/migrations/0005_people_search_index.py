@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0004_report_data_watermark_report_next_run_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonSearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('person_type', models.CharField(choices=[('applicant', 'Applicant'), ('student', 'Student'), ('faculty', 'Faculty'), ('employee', 'Employee')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('identifier', models.CharField(max_length=30)),
+                ('full_name', models.CharField(max_length=150)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('phone_number', models.CharField(blank=True, max_length=20)),
+                ('description', models.CharField(blank=True, max_length=200)),
+                ('search_text', models.CharField(blank=True, max_length=500)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('person_type', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PersonSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='administration.personsearchentry')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'entry'], name='administrat_token_c6277f_idx')],
+                'unique_together': {('entry', 'token')},
+            },
+        ),
+    ]
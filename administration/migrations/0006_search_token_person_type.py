@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:05
+
+from django.db import migrations, models
+
+
+def copy_person_types(apps, schema_editor):
+    PersonSearchEntry = apps.get_model('administration', 'PersonSearchEntry')
+    PersonSearchToken = apps.get_model('administration', 'PersonSearchToken')
+
+    for person_type in PersonSearchEntry.objects.order_by().values_list('person_type', flat=True).distinct():
+        PersonSearchToken.objects.filter(entry__person_type=person_type).update(person_type=person_type)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0005_people_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personsearchtoken',
+            name='person_type',
+            field=models.CharField(default='', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='personsearchtoken',
+            index=models.Index(fields=['person_type', 'token', 'entry'], name='administrat_person__6437d5_idx'),
+        ),
+        migrations.RunPython(copy_person_types, migrations.RunPython.noop),
+    ]
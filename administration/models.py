@@ -295,6 +295,17 @@ class Report(models.Model):
     download_count = models.PositiveIntegerField(default=0)
     is_scheduled = models.BooleanField(default=False)
     schedule_frequency = models.CharField(max_length=20, blank=True)  # daily, weekly, monthly
+    claimed_at = models.DateTimeField(null=True, blank=True)  # Set while a worker is generating the report
+    claimed_by = models.CharField(max_length=100, blank=True)
+    error_message = models.TextField(blank=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)  # Next scheduled run for recurring reports
+    data_watermark = models.DateTimeField(null=True, blank=True)  # Source rows changed after this are not in the file yet
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'claimed_at']),
+            models.Index(fields=['is_scheduled', 'next_run_at']),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.generated_at.date()}"
@@ -328,3 +339,44 @@ class AuditLog(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.action_type} - {self.model_name} ({self.timestamp})"
+
+class PersonSearchEntry(models.Model):
+    """People search index entry for an applicant, student, faculty member or employee"""
+    PERSON_TYPES = (
+        ('applicant', 'Applicant'),
+        ('student', 'Student'),
+        ('faculty', 'Faculty'),
+        ('employee', 'Employee'),
+    )
+
+    person_type = models.CharField(max_length=20, choices=PERSON_TYPES)
+    object_id = models.PositiveBigIntegerField()
+    identifier = models.CharField(max_length=30)  # application_number / student_id / faculty_id / employee_id
+    full_name = models.CharField(max_length=150)
+    email = models.CharField(max_length=254, blank=True)
+    phone_number = models.CharField(max_length=20, blank=True)
+    description = models.CharField(max_length=200, blank=True)  # Program or department shown in results
+    search_text = models.CharField(max_length=500, blank=True)  # Normalized tokens, space separated
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['person_type', 'object_id']
+
+    def __str__(self):
+        return f"{self.get_person_type_display()} {self.identifier} - {self.full_name}"
+
+class PersonSearchToken(models.Model):
+    """Inverted index row: one normalized token of a search entry, matched by prefix"""
+    entry = models.ForeignKey(PersonSearchEntry, on_delete=models.CASCADE, related_name='tokens')
+    person_type = models.CharField(max_length=20, default='')  # Copied from the entry so type filters use the index
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ['entry', 'token']
+        indexes = [
+            models.Index(fields=['token', 'entry']),
+            models.Index(fields=['person_type', 'token', 'entry']),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.entry_id}"
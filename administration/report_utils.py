@@ -0,0 +1,759 @@
+"""
+Report generation utilities for administrative reports
+"""
+import csv
+import heapq
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from openpyxl import Workbook
+from students.models import Course, Department, Enrollment, RemovedEnrollment
+from .models import Report
+from .schedule_utils import next_run_after, report_schedule
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = 'reports'
+REPORT_FORMATS = ('csv', 'xlsx')
+REPORT_CHUNK_SIZE = 2000
+REPORT_WRITE_BUFFER = 1024 * 1024
+
+# Scheduled runs fall back to a full rebuild past this many changed groups
+INCREMENTAL_GROUP_LIMIT = 500
+
+# report_type -> callable(report) returning (columns, rows)
+REPORT_GENERATORS = {}
+
+
+class ReportClaimLost(Exception):
+    """
+    Another worker took over the report's claim; this worker's output is discarded
+    """
+
+# report_type -> callable(report, since, previous_path) returning (columns, rows),
+# or None when a full rebuild is cheaper
+INCREMENTAL_REPORT_GENERATORS = {}
+
+
+def report_generator(report_type):
+    """
+    Register a generator for a Report.report_type
+    """
+    def register(func):
+        REPORT_GENERATORS[report_type] = func
+        return func
+    return register
+
+
+def incremental_report_generator(report_type):
+    """
+    Register a generator that merges changed source rows into a report's previous CSV output
+    """
+    def register(func):
+        INCREMENTAL_REPORT_GENERATORS[report_type] = func
+        return func
+    return register
+
+
+def read_report_rows(path):
+    """
+    Lazily yield the data rows of a previously written CSV report
+    """
+    with open(path, newline='', encoding='utf-8') as report_file:
+        reader = csv.reader(report_file)
+        next(reader, None)
+        yield from reader
+
+
+def run_per_department(func, department_ids, *args):
+    """
+    Run func(department_id, *args) for every department on a thread pool.
+
+    Results are returned in department order. Each worker closes its own
+    database connection when done so pool threads never leak connections.
+    """
+    def work(department_id):
+        try:
+            return func(department_id, *args)
+        finally:
+            connection.close()
+
+    workers = max(getattr(settings, 'REPORT_WORKERS', 4), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(work, department_ids))
+
+
+def _report_departments(parameters):
+    departments = Department.objects.filter(is_active=True)
+    if parameters.get('department'):
+        departments = departments.filter(id=parameters['department'])
+    return list(departments.order_by('name').values_list('id', flat=True))
+
+
+def _parse_date_parameter(parameters, key):
+    value = parameters.get(key)
+    if not value:
+        return None
+    parsed = parse_date(str(value))
+    if parsed is None:
+        raise ValueError(f"Invalid {key} '{value}'. Use YYYY-MM-DD.")
+    return parsed
+
+
+ATTENDANCE_COLUMNS = [
+    'Department', 'Student ID', 'Student Name', 'Program', 'Course Code', 'Course Name',
+    'Semester', 'Year', 'Present', 'Absent', 'Late', 'Excused', 'Total Sessions',
+    'Attendance %', 'Below Threshold'
+]
+
+
+def _attendance_rows_for_department(department_id, parameters, threshold):
+    """
+    Per-student, per-course attendance for the courses of one department.
+
+    Without a date window the counters maintained on Enrollment are read
+    directly; with `from_date`/`to_date` the attendance records in that
+    window are counted with one grouped aggregate.
+    """
+    enrollments = Enrollment.objects.filter(course__department_id=department_id, status='enrolled')
+    if parameters.get('semester'):
+        enrollments = enrollments.filter(semester=parameters['semester'])
+    if parameters.get('year'):
+        enrollments = enrollments.filter(year=parameters['year'])
+    if parameters.get('course'):
+        enrollments = enrollments.filter(course_id=parameters['course'])
+
+    from_date = _parse_date_parameter(parameters, 'from_date')
+    to_date = _parse_date_parameter(parameters, 'to_date')
+
+    if from_date or to_date:
+        window = Q()
+        if from_date:
+            window &= Q(attendance_records__date__gte=from_date)
+        if to_date:
+            window &= Q(attendance_records__date__lte=to_date)
+        enrollments = enrollments.annotate(
+            present=Count('attendance_records', filter=window & Q(attendance_records__status='present')),
+            absent=Count('attendance_records', filter=window & Q(attendance_records__status='absent')),
+            late=Count('attendance_records', filter=window & Q(attendance_records__status='late')),
+            excused=Count('attendance_records', filter=window & Q(attendance_records__status='excused')),
+            total=Count('attendance_records', filter=window),
+        )
+        counter_fields = ('present', 'absent', 'late', 'excused', 'total')
+    else:
+        counter_fields = (
+            'attendance_present', 'attendance_absent', 'attendance_late',
+            'attendance_excused', 'attendance_total'
+        )
+
+    rows = []
+    for record in enrollments.order_by('course__code', 'student__student_id').values(
+        'course__department__name', 'student__student_id', 'student__user__first_name',
+        'student__user__last_name', 'student__program__name', 'course__code', 'course__name',
+        'semester', 'year', *counter_fields
+    ):
+        present, absent, late, excused, total = (record[field] for field in counter_fields)
+        percentage = (
+            (Decimal(present + late) * 100 / total).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            if total else Decimal('0.00')
+        )
+        below = percentage < threshold
+        if parameters.get('only_shortage', True) and not below:
+            continue
+
+        rows.append([
+            record['course__department__name'],
+            record['student__student_id'],
+            f"{record['student__user__first_name']} {record['student__user__last_name']}".strip(),
+            record['student__program__name'],
+            record['course__code'],
+            record['course__name'],
+            record['semester'],
+            record['year'],
+            present,
+            absent,
+            late,
+            excused,
+            total,
+            percentage,
+            'Yes' if below else 'No',
+        ])
+    return rows
+
+
+@report_generator('attendance')
+def generate_attendance_report(report):
+    """
+    Attendance shortage list, computed per department in parallel
+    """
+    parameters = report.parameters or {}
+    threshold = Decimal(str(parameters.get(
+        'threshold', getattr(settings, 'ATTENDANCE_SHORTAGE_THRESHOLD', 75)
+    )))
+
+    department_rows = run_per_department(
+        _attendance_rows_for_department, _report_departments(parameters), parameters, threshold
+    )
+    return ATTENDANCE_COLUMNS, (row for rows in department_rows for row in rows)
+
+
+ENROLLMENT_COLUMNS = [
+    'Department', 'Course Code', 'Course Name', 'Semester', 'Year',
+    'Enrolled', 'Completed', 'Dropped', 'Failed', 'Total'
+]
+
+
+def _enrollment_queryset(parameters):
+    enrollments = Enrollment.objects.all()
+    if parameters.get('semester'):
+        enrollments = enrollments.filter(semester=parameters['semester'])
+    if parameters.get('year'):
+        enrollments = enrollments.filter(year=parameters['year'])
+    return enrollments
+
+
+def _enrollment_summary_rows(enrollments):
+    grouped = (
+        enrollments
+        .values('course__department__name', 'course__code', 'course__name', 'semester', 'year')
+        .annotate(
+            enrolled=Count('id', filter=Q(status='enrolled')),
+            completed=Count('id', filter=Q(status='completed')),
+            dropped=Count('id', filter=Q(status='dropped')),
+            failed=Count('id', filter=Q(status='failed')),
+            total=Count('id'),
+        )
+        .order_by('course__code', 'year', 'semester')
+    )
+    return [
+        [
+            row['course__department__name'], row['course__code'], row['course__name'], row['semester'],
+            row['year'], row['enrolled'], row['completed'], row['dropped'], row['failed'], row['total'],
+        ]
+        for row in grouped
+    ]
+
+
+def _enrollment_rows_for_department(department_id, parameters):
+    return _enrollment_summary_rows(_enrollment_queryset(parameters).filter(course__department_id=department_id))
+
+
+@report_generator('enrollment')
+def generate_enrollment_report(report):
+    """
+    Enrollment counts by status for every course, computed per department in parallel
+    """
+    parameters = report.parameters or {}
+    department_rows = run_per_department(
+        _enrollment_rows_for_department, _report_departments(parameters), parameters
+    )
+    return ENROLLMENT_COLUMNS, (row for rows in department_rows for row in rows)
+
+
+@incremental_report_generator('enrollment')
+def refresh_enrollment_report(report, since, previous_path):
+    """
+    Recount only the course/semester/year groups enrollments joined, changed or left since the watermark.
+
+    A recounted group with no enrollments left is dropped from the report.
+    Attendance counter updates do not touch updated_at, so taking attendance
+    does not mark a group changed.
+    """
+    parameters = report.parameters or {}
+    enrollments = _enrollment_queryset(parameters).filter(
+        course__department_id__in=_report_departments(parameters)
+    )
+
+    changed_groups = set(
+        enrollments.filter(updated_at__gte=since).order_by().values_list('course_id', 'semester', 'year').distinct()
+    )
+    changed_groups.update(
+        RemovedEnrollment.objects.filter(removed_at__gte=since).order_by()
+        .values_list('course_id', 'semester', 'year').distinct()
+    )
+    if len(changed_groups) > INCREMENTAL_GROUP_LIMIT:
+        return None
+
+    course_codes = dict(
+        Course.objects.filter(id__in={course_id for course_id, _, _ in changed_groups}).values_list('id', 'code')
+    )
+    if any(course_id not in course_codes for course_id, _, _ in changed_groups):
+        # A deleted course's rows can no longer be matched by code
+        return None
+
+    rows = {}
+    for row in read_report_rows(previous_path):
+        rows[(row[1], str(row[3]), str(row[4]))] = row
+
+    if changed_groups:
+        groups = Q()
+        for course_id, semester, year in changed_groups:
+            rows.pop((course_codes[course_id], str(semester), str(year)), None)
+            groups |= Q(course_id=course_id, semester=semester, year=year)
+        for row in _enrollment_summary_rows(enrollments.filter(groups)):
+            rows[(row[1], str(row[3]), str(row[4]))] = row
+
+    merged = sorted(rows.values(), key=lambda row: (row[0], row[1], int(row[4]), int(row[3])))
+    return ENROLLMENT_COLUMNS, merged
+
+
+FINANCIAL_COLUMNS = [
+    'Transaction ID', 'Date', 'Type', 'Account Code', 'Account Name', 'Account Type',
+    'Description', 'Amount', 'Reference', 'Student ID', 'Employee ID'
+]
+
+
+def _financial_queryset(parameters):
+    from backoffice.models import Transaction
+
+    transactions = Transaction.objects.all()
+    from_date = _parse_date_parameter(parameters, 'from_date')
+    to_date = _parse_date_parameter(parameters, 'to_date')
+    if from_date:
+        transactions = transactions.filter(transaction_date__gte=from_date)
+    if to_date:
+        transactions = transactions.filter(transaction_date__lte=to_date)
+    if parameters.get('transaction_type'):
+        transactions = transactions.filter(transaction_type=parameters['transaction_type'])
+    if parameters.get('account_type'):
+        transactions = transactions.filter(account__account_type=parameters['account_type'])
+    return transactions
+
+
+def _financial_rows(transactions):
+    return (
+        transactions
+        .order_by('transaction_date', 'transaction_id')
+        .values_list(
+            'transaction_id', 'transaction_date', 'transaction_type', 'account__account_code',
+            'account__account_name', 'account__account_type', 'description', 'amount',
+            'reference_number', 'student__student_id', 'employee__employee_id'
+        )
+        .iterator(chunk_size=REPORT_CHUNK_SIZE)
+    )
+
+
+@report_generator('financial')
+def generate_financial_report(report):
+    """
+    Transaction register for a date range, streamed from the database in chunks
+    """
+    return FINANCIAL_COLUMNS, _financial_rows(_financial_queryset(report.parameters or {}))
+
+
+@incremental_report_generator('financial')
+def refresh_financial_report(report, since, previous_path):
+    """
+    Merge transactions created or edited since the watermark into the previous register.
+
+    Every transaction ID saved or removed (deleted or renumbered) since the
+    watermark has its previous row dropped, and the saved ones that still
+    match the report's filters are read again; a transaction edited out of
+    the date range or type is therefore dropped rather than left stale. Both
+    streams are sorted by date and transaction ID and are merged lazily
+    without loading the previous file into memory. The watermark is taken
+    when the previous run started, so changes made during that run are read
+    again.
+    """
+    from backoffice.models import RemovedTransaction, Transaction
+
+    stale_ids = set(Transaction.objects.filter(updated_at__gte=since).values_list('transaction_id', flat=True))
+    stale_ids.update(
+        RemovedTransaction.objects.filter(removed_at__gte=since).values_list('transaction_id', flat=True)
+    )
+    changed_rows = list(
+        _financial_rows(_financial_queryset(report.parameters or {}).filter(updated_at__gte=since))
+    )
+    previous_rows = (row for row in read_report_rows(previous_path) if row[0] not in stale_ids)
+    return FINANCIAL_COLUMNS, heapq.merge(
+        previous_rows, changed_rows, key=lambda row: (str(row[1]), str(row[0]))
+    )
+
+
+FACULTY_PERFORMANCE_COLUMNS = [
+    'Department', 'Faculty ID', 'Faculty Name', 'Faculty Type', 'Experience (Years)',
+    'Active Course Assignments', 'Evaluations', 'Average Overall Rating',
+    'Average Teaching Effectiveness', 'Research Works', 'Total Citations'
+]
+
+
+def _faculty_performance_rows_for_department(department_id, parameters):
+    """
+    Each measure is a separate grouped aggregate so joins never multiply rows
+    """
+    from faculty.models import Faculty, CourseAssignment, FacultyEvaluation, ResearchWork
+
+    faculty_members = list(
+        Faculty.objects.filter(department_id=department_id, employment_status='active')
+        .order_by('faculty_id')
+        .values('id', 'department__name', 'faculty_id', 'user__first_name', 'user__last_name',
+                'faculty_type', 'experience_years')
+    )
+    faculty_ids = [member['id'] for member in faculty_members]
+
+    assignments = CourseAssignment.objects.filter(faculty_id__in=faculty_ids, is_active=True)
+    evaluations = FacultyEvaluation.objects.filter(faculty_id__in=faculty_ids)
+    if parameters.get('academic_year'):
+        assignments = assignments.filter(academic_year=parameters['academic_year'])
+        evaluations = evaluations.filter(academic_year=parameters['academic_year'])
+
+    assignment_counts = dict(
+        assignments.values('faculty_id').annotate(total=Count('id')).values_list('faculty_id', 'total')
+    )
+    evaluation_stats = {
+        row['faculty_id']: row
+        for row in evaluations.values('faculty_id').annotate(
+            total=Count('id'),
+            overall=Avg('overall_rating'),
+            teaching=Avg('teaching_effectiveness'),
+        )
+    }
+    research_stats = {
+        row['faculty_id']: row
+        for row in ResearchWork.objects.filter(faculty_id__in=faculty_ids).values('faculty_id').annotate(
+            total=Count('id'),
+            citations=Sum('citation_count'),
+        )
+    }
+
+    rows = []
+    for member in faculty_members:
+        evaluation = evaluation_stats.get(member['id'], {})
+        research = research_stats.get(member['id'], {})
+        rows.append([
+            member['department__name'],
+            member['faculty_id'],
+            f"{member['user__first_name']} {member['user__last_name']}".strip(),
+            member['faculty_type'],
+            member['experience_years'],
+            assignment_counts.get(member['id'], 0),
+            evaluation.get('total', 0),
+            round(evaluation['overall'], 2) if evaluation.get('overall') is not None else '',
+            round(evaluation['teaching'], 2) if evaluation.get('teaching') is not None else '',
+            research.get('total', 0),
+            research.get('citations') or 0,
+        ])
+    return rows
+
+
+@report_generator('faculty_performance')
+def generate_faculty_performance_report(report):
+    """
+    Teaching load, evaluation and research summary per faculty member, computed per department in parallel
+    """
+    parameters = report.parameters or {}
+    department_rows = run_per_department(
+        _faculty_performance_rows_for_department, _report_departments(parameters), parameters
+    )
+    return FACULTY_PERFORMANCE_COLUMNS, (row for rows in department_rows for row in rows)
+
+
+def _chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_csv(path, columns, rows):
+    with open(path, 'w', newline='', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as report_file:
+        writer = csv.writer(report_file)
+        writer.writerow(columns)
+        # Rows are consumed lazily, so only one buffer's worth is held in memory
+        for chunk in _chunked(rows, REPORT_CHUNK_SIZE):
+            writer.writerows(chunk)
+
+
+def _write_xlsx(path, columns, rows):
+    # write_only keeps memory flat regardless of the number of rows
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Report')
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([float(value) if isinstance(value, Decimal) else value for value in row])
+    workbook.save(path)
+
+
+def _write_report_tmp(report, columns, rows, media_root=None):
+    """
+    Write report rows to a temporary file beside the report's output; returns (tmp_path, path, relative_path)
+    """
+    output_format = (report.parameters or {}).get('format', 'csv')
+    if output_format not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format '{output_format}'. Expected one of: {', '.join(REPORT_FORMATS)}")
+
+    relative_path = os.path.join(REPORT_DIR, str(report.id), f"{report.report_type}_report_{report.id}.{output_format}")
+    path = os.path.join(str(media_root or settings.MEDIA_ROOT), relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=f'.{output_format}.tmp')
+    os.close(fd)
+    try:
+        if output_format == 'xlsx':
+            _write_xlsx(tmp_path, columns, rows)
+        else:
+            _write_csv(tmp_path, columns, rows)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, path, relative_path
+
+
+def write_report_file(report, columns, rows, media_root=None):
+    """
+    Write report rows to MEDIA_ROOT/reports/<id>/ and return the path relative to MEDIA_ROOT
+    """
+    # Written to a temporary file first so a half-written report is never served
+    tmp_path, path, relative_path = _write_report_tmp(report, columns, rows, media_root)
+    try:
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return relative_path
+
+
+def queue_report(report):
+    """
+    Put a report (back) on the queue for the process_reports worker
+    """
+    Report.objects.filter(id=report.id).update(
+        status='generating',
+        claimed_at=None,
+        claimed_by='',
+        error_message='',
+        completed_at=None
+    )
+    report.status = 'generating'
+    report.claimed_at = None
+    report.claimed_by = ''
+    report.error_message = ''
+    report.completed_at = None
+    return report
+
+
+def claim_queued_reports(worker, batch_size=1):
+    """
+    Claim queued reports for this worker.
+
+    Reports in 'generating' with no claim are locked with SKIP LOCKED so
+    workers on several nodes can share the queue without a broker. Claims
+    older than REPORT_CLAIM_TIMEOUT_SECONDS are treated as abandoned by a
+    crashed worker and taken over; a live worker keeps its claim fresh with
+    _renew_claim while it writes.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=getattr(settings, 'REPORT_CLAIM_TIMEOUT_SECONDS', 3600))
+
+    with transaction.atomic():
+        reports = list(
+            Report.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='generating')
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale_before))
+            .order_by('generated_at', 'id')[:batch_size]
+        )
+        if reports:
+            Report.objects.filter(id__in=[report.id for report in reports]).update(claimed_at=now, claimed_by=worker)
+            for report in reports:
+                report.claimed_at = now
+                report.claimed_by = worker
+
+    return reports
+
+
+def _claim_filter(report):
+    # claimed_at is part of the claim, so a takeover is noticed even under a reused worker name
+    return Report.objects.filter(
+        id=report.id, status='generating', claimed_by=report.claimed_by, claimed_at=report.claimed_at
+    )
+
+
+def _renew_claim(report):
+    """
+    Re-stamp this worker's claim on a report; raises ReportClaimLost if another worker took it over
+    """
+    now = timezone.now()
+    if not _claim_filter(report).update(claimed_at=now):
+        raise ReportClaimLost(f"Report {report.id} was claimed by another worker")
+    report.claimed_at = now
+
+
+def _heartbeat_rows(report, rows):
+    """
+    Pass rows through, renewing the report's claim every third of REPORT_CLAIM_TIMEOUT_SECONDS
+    """
+    refresh_every = getattr(settings, 'REPORT_CLAIM_TIMEOUT_SECONDS', 3600) / 3
+    # Building the rows may already have taken a while
+    _renew_claim(report)
+    refreshed_at = time.monotonic()
+    for row in rows:
+        if time.monotonic() - refreshed_at >= refresh_every:
+            # A large report can outlast the claim timeout; keep other workers from taking it over
+            _renew_claim(report)
+            refreshed_at = time.monotonic()
+        yield row
+
+
+def _incremental_generator(report):
+    """
+    The incremental generator and previous output for a scheduled run, or (None, None)
+    """
+    parameters = report.parameters or {}
+    if not report.is_scheduled or report.data_watermark is None or parameters.get('full_refresh'):
+        return None, None
+    if parameters.get('format', 'csv') != 'csv':
+        return None, None
+
+    generator = INCREMENTAL_REPORT_GENERATORS.get(report.report_type)
+    previous_path = report_file_path(report)
+    if generator is None or previous_path is None:
+        return None, None
+    return generator, previous_path
+
+
+def generate_report(report):
+    """
+    Run the registered generator for a claimed report and record the outcome.
+
+    Scheduled reports with a previous CSV output are refreshed incrementally
+    from source rows changed since `data_watermark` when the report type
+    supports it. The report moves from `generating` to `completed` (with
+    file_path, completed_at and the new watermark set) or `failed` with the
+    error recorded.
+
+    Rows are written to a temporary file while the claim is renewed. The
+    output is only moved into place, and the outcome only recorded, while
+    this worker still holds the claim: the completing UPDATE locks the row
+    until the file has been replaced, so a worker that lost the claim never
+    overwrites the new holder's output. Returns True on success.
+    """
+    started = timezone.now()
+    try:
+        output = None
+        generator, previous_path = _incremental_generator(report)
+        if generator is not None:
+            output = generator(report, report.data_watermark, previous_path)
+        if output is None:
+            generator = REPORT_GENERATORS.get(report.report_type)
+            if generator is None:
+                raise ValueError(f"No generator registered for report type '{report.report_type}'")
+            output = generator(report)
+
+        columns, rows = output
+        tmp_path, path, relative_path = _write_report_tmp(report, columns, _heartbeat_rows(report, rows))
+        completed_at = timezone.now()
+        try:
+            with transaction.atomic():
+                completed = _claim_filter(report).update(
+                    status='completed',
+                    file_path=relative_path,
+                    error_message='',
+                    completed_at=completed_at,
+                    data_watermark=started
+                )
+                if not completed:
+                    raise ReportClaimLost(f"Report {report.id} was claimed by another worker")
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except ReportClaimLost as e:
+        logger.warning(f"Discarding report {report.id}: {str(e)}")
+        return False
+    except Exception as e:
+        logger.error(f"Failed to generate report {report.id}: {str(e)}")
+        report.status = 'failed'
+        report.error_message = str(e)
+        report.completed_at = timezone.now()
+        _claim_filter(report).update(
+            status=report.status, error_message=report.error_message, completed_at=report.completed_at
+        )
+        return False
+
+    report.file_path = relative_path
+    report.status = 'completed'
+    report.error_message = ''
+    report.completed_at = completed_at
+    report.data_watermark = started
+    return True
+
+
+def process_queued_reports(worker, batch_size=1):
+    """
+    Generate up to batch_size queued reports.
+
+    Reports are claimed one at a time as each starts, so the rest of the
+    queue stays free for other workers and every claim is stamped when its
+    work begins. Returns a dict with the number of completed and failed
+    reports.
+    """
+    result = {'completed': 0, 'failed': 0}
+    for _ in range(batch_size):
+        reports = claim_queued_reports(worker)
+        if not reports:
+            break
+        if generate_report(reports[0]):
+            result['completed'] += 1
+        else:
+            result['failed'] += 1
+    return result
+
+
+def schedule_due_reports(now=None):
+    """
+    Queue every scheduled report whose next run is due and plan its following run.
+
+    A report with no next_run_at yet (just created, its first build already
+    queued) only gets its next run planned. Reports still being generated are
+    left alone. Returns the number of reports queued.
+    """
+    now = now or timezone.now()
+    queued = 0
+
+    with transaction.atomic():
+        due_reports = (
+            Report.objects
+            .select_for_update(skip_locked=True)
+            .filter(is_scheduled=True)
+            .exclude(status='generating')
+            .filter(Q(next_run_at__isnull=True) | Q(next_run_at__lte=now))
+        )
+        for report in due_reports:
+            try:
+                next_run_at = next_run_after(report_schedule(report), now)
+            except ValueError as e:
+                logger.error(f"Invalid schedule for report {report.id}: {str(e)}")
+                continue
+
+            if report.next_run_at is not None:
+                queue_report(report)
+                queued += 1
+            Report.objects.filter(id=report.id).update(next_run_at=next_run_at)
+
+    return queued
+
+
+def report_file_path(report, media_root=None):
+    """
+    Absolute path of a report's latest output, or None if it has none yet.
+
+    A scheduled report keeps serving its previous output while it is refreshed.
+    """
+    if not report.file_path:
+        return None
+    path = os.path.join(str(media_root or settings.MEDIA_ROOT), report.file_path)
+    return path if os.path.exists(path) else None
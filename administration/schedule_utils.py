@@ -0,0 +1,129 @@
+"""
+Cron-style schedule utilities for recurring reports
+"""
+from datetime import timedelta
+from django.utils import timezone
+
+SCHEDULE_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@nightly': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+# Report.schedule_frequency values understood when parameters has no 'schedule'
+FREQUENCY_SCHEDULES = {
+    'hourly': '@hourly',
+    'daily': '@daily',
+    'weekly': '@weekly',
+    'monthly': '@monthly',
+}
+
+# (name, minimum, maximum) for the five cron fields
+CRON_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7),
+)
+
+# Give up looking for a matching minute after this long (e.g. "0 0 31 2 *")
+MAX_LOOKAHEAD_DAYS = 366 * 5
+
+
+def _parse_cron_field(value, name, minimum, maximum):
+    allowed = set()
+    for part in value.split(','):
+        expression, _, step = part.partition('/')
+        try:
+            step = int(step) if step else 1
+            if expression == '*':
+                start, end = minimum, maximum
+            elif '-' in expression:
+                start, end = (int(bound) for bound in expression.split('-', 1))
+            else:
+                start = int(expression)
+                end = maximum if step > 1 else start
+        except ValueError:
+            raise ValueError(f"Invalid {name} field '{value}' in schedule")
+
+        if step < 1 or start < minimum or end > maximum or start > end:
+            raise ValueError(f"Invalid {name} field '{value}' in schedule")
+        allowed.update(range(start, end + 1, step))
+    return allowed
+
+
+def parse_schedule(spec):
+    """
+    Parse a five-field cron spec (or @daily style alias) into sets of allowed values
+    """
+    if not spec or not isinstance(spec, str):
+        raise ValueError('A schedule is required, e.g. "0 2 * * *" or "@daily"')
+
+    spec = SCHEDULE_ALIASES.get(spec.strip().lower(), spec.strip())
+    fields = spec.split()
+    if len(fields) != len(CRON_FIELDS):
+        raise ValueError(f"Schedule '{spec}' must have five fields: minute hour day-of-month month day-of-week")
+
+    minutes, hours, days, months, weekdays = (
+        _parse_cron_field(value, *field) for value, field in zip(fields, CRON_FIELDS)
+    )
+    # Both 0 and 7 mean Sunday
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+
+    return {
+        'minutes': minutes,
+        'hours': hours,
+        'days': days,
+        'months': months,
+        'weekdays': weekdays,
+        # Standard cron: when both day fields are restricted, either may match
+        'day_or': fields[2] != '*' and fields[4] != '*',
+    }
+
+
+def _day_matches(schedule, moment):
+    day_match = moment.day in schedule['days']
+    # Python counts Monday as 0, cron counts Sunday as 0
+    weekday_match = (moment.weekday() + 1) % 7 in schedule['weekdays']
+    if schedule['day_or']:
+        return day_match or weekday_match
+    return day_match and weekday_match
+
+
+def next_run_after(spec, after=None):
+    """
+    Return the first time strictly after `after` (default now) matching the schedule.
+
+    Times are evaluated in the project's local timezone.
+    """
+    schedule = parse_schedule(spec)
+    moment = timezone.localtime(after or timezone.now()).replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = moment + timedelta(days=MAX_LOOKAHEAD_DAYS)
+
+    while moment < limit:
+        if moment.month not in schedule['months'] or not _day_matches(schedule, moment):
+            moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+        if moment.hour not in schedule['hours']:
+            moment = (moment + timedelta(hours=1)).replace(minute=0)
+            continue
+        if moment.minute not in schedule['minutes']:
+            moment += timedelta(minutes=1)
+            continue
+        return moment
+
+    raise ValueError(f"Schedule '{spec}' never matches")
+
+
+def report_schedule(report):
+    """
+    The cron spec of a scheduled report, from parameters['schedule'] or schedule_frequency
+    """
+    spec = (report.parameters or {}).get('schedule')
+    if not spec and report.schedule_frequency:
+        spec = FREQUENCY_SCHEDULES.get(report.schedule_frequency.lower())
+    return spec
@@ -0,0 +1,300 @@
+"""
+People search index utilities for applicants, students, faculty and employees
+"""
+import re
+import unicodedata
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Q
+from .models import PersonSearchEntry, PersonSearchToken
+
+# person_type -> (model, {entry field: source field path})
+PERSON_SOURCES = {
+    'applicant': ('admissions.Applicant', {
+        'identifier': 'application_number',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'email': 'email',
+        'phone_number': 'phone_number',
+        'description': 'city',
+    }),
+    'student': ('students.Student', {
+        'identifier': 'student_id',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'email': 'user__email',
+        'phone_number': 'user__phone_number',
+        'description': 'program__name',
+    }),
+    'faculty': ('faculty.Faculty', {
+        'identifier': 'faculty_id',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'email': 'user__email',
+        'phone_number': 'user__phone_number',
+        'description': 'department__name',
+    }),
+    'employee': ('backoffice.Employee', {
+        'identifier': 'employee_id',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'email': 'user__email',
+        'phone_number': 'user__phone_number',
+        'description': 'designation',
+    }),
+}
+
+DISPLAY_FIELDS = ('identifier', 'full_name', 'email', 'phone_number', 'description')
+ENTRY_FIELDS = DISPLAY_FIELDS + ('search_text',)
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+MAX_TOKEN_LENGTH = 64
+INDEX_BATCH_SIZE = 2000
+
+# Index rows read per page of a lookup before the remaining query terms are checked
+SEARCH_CANDIDATE_LIMIT = 500
+SEARCH_RESULT_LIMIT = 20
+
+
+def normalize_tokens(value):
+    """
+    Lowercase ASCII alphanumeric tokens of a value, with accents folded
+    """
+    value = unicodedata.normalize('NFKD', str(value or '')).encode('ascii', 'ignore').decode('ascii').lower()
+    return TOKEN_RE.findall(value)
+
+
+def _phone_tokens(phone_number):
+    digits = ''.join(char for char in str(phone_number or '') if char.isdigit())
+    # Numbers stored with a country code are also found by their last ten digits
+    return {digits, digits[-10:]} - {''}
+
+
+def person_tokens(identifier, first_name, last_name, email, phone_number):
+    """
+    Index tokens of one person: name parts, the identifier, the email's local part and phone digits
+    """
+    local_part = str(email or '').split('@')[0]
+    tokens = set(normalize_tokens(first_name)) | set(normalize_tokens(last_name))
+    tokens |= set(normalize_tokens(identifier)) | set(normalize_tokens(local_part))
+    tokens.add(''.join(normalize_tokens(identifier)))
+    tokens.add(''.join(normalize_tokens(local_part)))
+    tokens |= _phone_tokens(phone_number)
+    return sorted(token[:MAX_TOKEN_LENGTH] for token in tokens if token)
+
+
+def query_terms(query):
+    """
+    Normalized terms of a search query; an email address is matched on its local part
+    """
+    terms = []
+    for word in str(query or '').split():
+        if '@' in word:
+            word = word.split('@')[0]
+        terms.extend(normalize_tokens(word))
+    return list(dict.fromkeys(term[:MAX_TOKEN_LENGTH] for term in terms))
+
+
+def _source_rows(person_type, object_ids=None, after_id=None, limit=None):
+    model_label, field_map = PERSON_SOURCES[person_type]
+    queryset = apps.get_model(model_label).objects.order_by('id')
+    if object_ids is not None:
+        queryset = queryset.filter(id__in=list(object_ids))
+    if after_id is not None:
+        queryset = queryset.filter(id__gt=after_id)
+    rows = queryset.values_list('id', *field_map.values())
+    if limit is not None:
+        rows = rows[:limit]
+    return [(row[0], dict(zip(field_map, row[1:]))) for row in rows]
+
+
+def _build_entry(person_type, object_id, values):
+    tokens = person_tokens(
+        values['identifier'], values['first_name'], values['last_name'],
+        values['email'], values['phone_number']
+    )
+    full_name = f"{values['first_name'] or ''} {values['last_name'] or ''}".strip()
+    entry = PersonSearchEntry(
+        person_type=person_type,
+        object_id=object_id,
+        identifier=(values['identifier'] or '')[:30],
+        full_name=full_name[:150],
+        email=values['email'] or '',
+        phone_number=(values['phone_number'] or '')[:20],
+        description=(values['description'] or '')[:200],
+        search_text=' '.join(tokens)[:500],
+    )
+    return entry, tokens
+
+
+def _write_entries(person_type, rows):
+    """
+    Upsert the entries of source rows and replace the tokens of those that changed
+    """
+    built = {object_id: _build_entry(person_type, object_id, values) for object_id, values in rows}
+    stored = {
+        row['object_id']: row
+        for row in PersonSearchEntry.objects.filter(
+            person_type=person_type, object_id__in=list(built)
+        ).values('id', 'object_id', *ENTRY_FIELDS)
+    }
+    changed = {
+        object_id: (entry, tokens)
+        for object_id, (entry, tokens) in built.items()
+        if object_id not in stored
+        or any(stored[object_id][field] != getattr(entry, field) for field in ENTRY_FIELDS)
+    }
+    if not changed:
+        return 0
+
+    upsert_options = {'update_conflicts': True, 'update_fields': list(ENTRY_FIELDS) + ['updated_at']}
+    # MySQL's ON DUPLICATE KEY UPDATE cannot name the conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        upsert_options['unique_fields'] = ['person_type', 'object_id']
+
+    with transaction.atomic():
+        PersonSearchEntry.objects.bulk_create(
+            [entry for entry, _ in changed.values()], batch_size=1000, **upsert_options
+        )
+        # bulk_create does not return primary keys on MySQL, so read them back
+        entry_ids = dict(
+            PersonSearchEntry.objects.filter(
+                person_type=person_type, object_id__in=list(changed)
+            ).values_list('object_id', 'id')
+        )
+        PersonSearchToken.objects.filter(entry_id__in=list(entry_ids.values())).delete()
+        PersonSearchToken.objects.bulk_create([
+            PersonSearchToken(entry_id=entry_ids[object_id], person_type=person_type, token=token)
+            for object_id, (_, tokens) in changed.items()
+            for token in tokens
+        ], batch_size=5000)
+    return len(changed)
+
+
+def index_people(person_type, object_ids):
+    """
+    Bring the index entries of the given people up to date; ids that no longer exist are removed
+    """
+    object_ids = set(object_ids)
+    rows = _source_rows(person_type, object_ids=object_ids)
+    written = _write_entries(person_type, rows)
+    missing = object_ids - {object_id for object_id, _ in rows}
+    if missing:
+        remove_people(person_type, missing)
+    return written
+
+
+def remove_people(person_type, object_ids):
+    """
+    Drop the index entries of deleted people
+    """
+    PersonSearchEntry.objects.filter(person_type=person_type, object_id__in=list(object_ids)).delete()
+
+
+def rebuild_search_index(person_types=None, batch_size=INDEX_BATCH_SIZE):
+    """
+    Re-index every person of the given types (all types if None) in primary-key batches.
+
+    Unchanged entries are left untouched and entries of people who no longer
+    exist are removed. Returns {person_type: {'indexed': n, 'updated': n, 'removed': n}}.
+    """
+    summary = {}
+    for person_type in person_types or PERSON_SOURCES:
+        indexed = updated = 0
+        seen = set()
+        last_id = None
+        while True:
+            rows = _source_rows(person_type, after_id=last_id, limit=batch_size)
+            if not rows:
+                break
+            updated += _write_entries(person_type, rows)
+            indexed += len(rows)
+            seen.update(object_id for object_id, _ in rows)
+            last_id = rows[-1][0]
+
+        stale = set(
+            PersonSearchEntry.objects.filter(person_type=person_type).values_list('object_id', flat=True)
+        ) - seen
+        stale = sorted(stale)
+        for start in range(0, len(stale), batch_size):
+            remove_people(person_type, stale[start:start + batch_size])
+
+        summary[person_type] = {'indexed': indexed, 'updated': updated, 'removed': len(stale)}
+    return summary
+
+
+def _prefix_upper_bound(prefix):
+    # Smallest string greater than every string starting with `prefix` (tokens are [a-z0-9])
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _term_tokens(term, person_types):
+    tokens = PersonSearchToken.objects.filter(token__gte=term, token__lt=_prefix_upper_bound(term))
+    if person_types:
+        tokens = tokens.filter(person_type__in=list(person_types))
+    return tokens
+
+
+def search_people(query, person_types=None, limit=SEARCH_RESULT_LIMIT):
+    """
+    Typeahead search over the people index.
+
+    Every query term must prefix-match a token of the person. The rarest
+    term (by a count capped at SEARCH_CANDIDATE_LIMIT index rows) leads: its
+    range of the (person_type, token, entry) index is read in pages of
+    SEARCH_CANDIDATE_LIMIT rows and the other terms are checked against each
+    page, until `limit` people match or the range ends. A typical lookup
+    costs a few indexed queries regardless of how many people are indexed.
+    Exact identifier matches rank first, then exact token matches, then the
+    rest in token order.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if len(terms) > 1:
+        counts = {term: _term_tokens(term, person_types)[:SEARCH_CANDIDATE_LIMIT].count() for term in terms}
+        if not all(counts.values()):
+            return []
+        lead = min(terms, key=lambda term: (counts[term], -len(term)))
+    else:
+        lead = terms[0]
+
+    joined_query = ''.join(terms)
+    lead_tokens = _term_tokens(lead, person_types).order_by('token', 'entry_id')
+    results = []
+    seen = set()
+    position = 0
+    last = None
+    while len(results) < limit:
+        page = lead_tokens
+        if last is not None:
+            page = page.filter(Q(token__gt=last[0]) | Q(token=last[0], entry_id__gt=last[1]))
+        page = list(page.values_list('token', 'entry_id')[:SEARCH_CANDIDATE_LIMIT])
+        if not page:
+            break
+        last = page[-1]
+
+        candidate_ids = [entry_id for _, entry_id in page if entry_id not in seen]
+        seen.update(candidate_ids)
+        entries = {
+            row['id']: row
+            for row in PersonSearchEntry.objects.filter(id__in=candidate_ids).values(
+                'id', 'person_type', 'object_id', 'search_text', *DISPLAY_FIELDS
+            )
+        }
+        for entry_id in candidate_ids:
+            position += 1
+            entry = entries.get(entry_id)
+            if entry is None:
+                continue
+            tokens = entry.pop('search_text').split()
+            if not all(any(token.startswith(term) for token in tokens) for term in terms):
+                continue
+            identifier = ''.join(normalize_tokens(entry['identifier']))
+            rank = 0 if identifier == joined_query else 1 if lead in tokens else 2
+            results.append((rank, position, entry))
+        if len(page) < SEARCH_CANDIDATE_LIMIT:
+            break
+
+    results.sort(key=lambda result: result[:2])
+    return [entry for _, _, entry in results[:limit]]
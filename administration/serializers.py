@@ -0,0 +1,76 @@
+from rest_framework import serializers
+from .models import (
+    Announcement, Committee, Meeting, Policy, Grievance, Report
+)
+from .schedule_utils import next_run_after, report_schedule
+
+class AnnouncementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Announcement
+        fields = [
+            'id', 'title', 'content', 'announcement_type', 'target_audience', 'priority',
+            'is_active', 'publish_date', 'expiry_date', 'attachment', 'created_at', 'updated_at',
+            'department', 'program', 'created_by'
+        ]
+
+class CommitteeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Committee
+        fields = [
+            'id', 'name', 'committee_type', 'description', 'establishment_date', 'is_active',
+            'meeting_frequency', 'created_at', 'chairperson'
+        ]
+
+class MeetingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Meeting
+        fields = [
+            'id', 'title', 'agenda', 'meeting_date', 'duration_minutes', 'venue', 'meeting_link',
+            'status', 'minutes', 'action_items', 'next_meeting_date', 'created_at', 'committee',
+            'created_by'
+        ]
+
+class PolicySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Policy
+        fields = [
+            'id', 'title', 'policy_number', 'policy_type', 'description', 'content', 'version',
+            'status', 'effective_date', 'review_date', 'approval_date', 'document_file',
+            'created_at', 'updated_at', 'department', 'approved_by', 'created_by'
+        ]
+
+class GrievanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Grievance
+        fields = [
+            'id', 'grievance_id', 'grievance_type', 'subject', 'description', 'priority', 'status',
+            'supporting_documents', 'resolution', 'resolution_date', 'is_anonymous', 'created_at',
+            'updated_at', 'complainant', 'assigned_to', 'resolved_by'
+        ]
+
+class ReportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Report
+        fields = [
+            'id', 'title', 'report_type', 'description', 'parameters', 'status', 'file_path',
+            'generated_at', 'completed_at', 'download_count', 'is_scheduled', 'schedule_frequency',
+            'generated_by', 'claimed_at', 'claimed_by', 'error_message', 'next_run_at', 'data_watermark'
+        ]
+        read_only_fields = [
+            'status', 'file_path', 'completed_at', 'download_count', 'generated_by',
+            'claimed_at', 'claimed_by', 'error_message', 'next_run_at', 'data_watermark'
+        ]
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        is_scheduled = attrs.get('is_scheduled', getattr(self.instance, 'is_scheduled', False))
+        if is_scheduled:
+            report = Report(
+                parameters=attrs.get('parameters', getattr(self.instance, 'parameters', {})),
+                schedule_frequency=attrs.get('schedule_frequency', getattr(self.instance, 'schedule_frequency', ''))
+            )
+            try:
+                next_run_after(report_schedule(report))
+            except ValueError as e:
+                raise serializers.ValidationError({'parameters': str(e)})
+        return attrs
@@ -0,0 +1,46 @@
+"""
+Signal handlers that keep the people search index current
+"""
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from admissions.models import Applicant
+from backoffice.models import Employee
+from faculty.models import Faculty
+from students.models import Student
+from .search_utils import index_people, remove_people
+
+PERSON_MODELS = {
+    Applicant: 'applicant',
+    Student: 'student',
+    Faculty: 'faculty',
+    Employee: 'employee',
+}
+
+
+@receiver(post_save, sender=Applicant)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Faculty)
+@receiver(post_save, sender=Employee)
+def person_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_people(PERSON_MODELS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender=Applicant)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_delete, sender=Employee)
+def person_deleted(sender, instance, **kwargs):
+    remove_people(PERSON_MODELS[sender], [instance.pk])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    # Students, faculty and employees are indexed with their user's name, email and phone
+    if created or raw:
+        return
+    for model in (Student, Faculty, Employee):
+        object_id = model.objects.filter(user_id=instance.pk).values_list('id', flat=True).first()
+        if object_id is not None:
+            index_people(PERSON_MODELS[model], [object_id])
@@ -20,4 +20,7 @@ urlpatterns = [
     # Report URLs
     path('reports/', views.ReportListCreateView.as_view(), name='report-list-create'),
     path('reports/<int:pk>/download/', views.ReportDownloadView.as_view(), name='report-download'),
+
+    # People search URLs
+    path('search/people/', views.people_search, name='people-search'),
 ]
@@ -1,105 +1,63 @@
-from rest_framework import generics, permissions
+import os
+from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.db.models import F
+from django.http import FileResponse
 from .models import (
     Announcement, Committee, CommitteeMember, Meeting, MeetingAttendance,
     Policy, Grievance, Report, AuditLog
 )
+from .serializers import (
+    AnnouncementSerializer, CommitteeSerializer, MeetingSerializer,
+    PolicySerializer, GrievanceSerializer, ReportSerializer
+)
+from .report_utils import report_file_path
+from .search_utils import PERSON_SOURCES, SEARCH_RESULT_LIMIT, search_people
 
 class AnnouncementListCreateView(generics.ListCreateAPIView):
     queryset = Announcement.objects.all()
+    serializer_class = AnnouncementSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class AnnouncementSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Announcement
-                fields = '__all__'
-        return AnnouncementSerializer
-
 class AnnouncementDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Announcement.objects.all()
+    serializer_class = AnnouncementSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class AnnouncementSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Announcement
-                fields = '__all__'
-        return AnnouncementSerializer
-
 class CommitteeListView(generics.ListAPIView):
     queryset = Committee.objects.all()
+    serializer_class = CommitteeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class CommitteeSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Committee
-                fields = '__all__'
-        return CommitteeSerializer
-
 class MeetingListCreateView(generics.ListCreateAPIView):
     queryset = Meeting.objects.all()
+    serializer_class = MeetingSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class MeetingSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Meeting
-                fields = '__all__'
-        return MeetingSerializer
-
 class PolicyListView(generics.ListAPIView):
     queryset = Policy.objects.all()
+    serializer_class = PolicySerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class PolicySerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Policy
-                fields = '__all__'
-        return PolicySerializer
-
 class GrievanceListCreateView(generics.ListCreateAPIView):
     queryset = Grievance.objects.all()
+    serializer_class = GrievanceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class GrievanceSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Grievance
-                fields = '__all__'
-        return GrievanceSerializer
-
 class GrievanceDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Grievance.objects.all()
+    serializer_class = GrievanceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class GrievanceSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Grievance
-                fields = '__all__'
-        return GrievanceSerializer
-
 class ReportListCreateView(generics.ListCreateAPIView):
     queryset = Report.objects.all()
+    serializer_class = ReportSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ReportSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Report
-                fields = '__all__'
-        return ReportSerializer
+    def perform_create(self, serializer):
+        # Saved as 'generating' with no claim; the process_reports worker picks it up
+        serializer.save(generated_by=self.request.user)
 
 class ReportDownloadView(generics.RetrieveAPIView):
     queryset = Report.objects.all()
@@ -107,4 +65,33 @@ class ReportDownloadView(generics.RetrieveAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        return Response({'download_url': f'/media/reports/{instance.file_path}'})
+        path = report_file_path(instance)
+        if path is None:
+            return Response(
+                {'error': f'Report has no output to download yet (status: {instance.status})'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        Report.objects.filter(id=instance.id).update(download_count=F('download_count') + 1)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=os.path.basename(path))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def people_search(request):
+    """
+    Typeahead search for applicants, students, faculty and employees by name,
+    email, phone or ID. Optional ?type=student,employee and ?limit=.
+    """
+    try:
+        query = request.query_params.get('q', '').strip()
+        person_types = [value for value in request.query_params.get('type', '').split(',') if value]
+        unknown = set(person_types) - set(PERSON_SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown type(s): {', '.join(sorted(unknown))}. Use {', '.join(PERSON_SOURCES)}.")
+        limit = min(max(int(request.query_params.get('limit', SEARCH_RESULT_LIMIT)), 1), 100)
+
+        results = search_people(query, person_types=person_types or None, limit=limit)
+        return Response({'query': query, 'count': len(results), 'results': results})
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
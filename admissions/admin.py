@@ -8,17 +8,59 @@ from django.utils import timezone
 from decimal import Decimal, InvalidOperation
 from .models import (
     AdmissionCycle, AdmissionRequirement, Applicant, Application,
-    ApplicationDocument, AdmissionTest, TestRegistration, TestResult, AdmissionFee
+    ApplicationDocument, AdmissionTest, TestRegistration, TestResult, AdmissionFee,
+    OutboundEmail
 )
-from .email_utils import send_admission_confirmation_email, send_rejection_email, send_fee_payment_confirmation_email
+from .email_utils import queue_admission_confirmation_email, queue_rejection_email
+from .payment_utils import record_admission_fee_payment
+from .portal_utils import invalidate_portal_status
 
 @admin.register(AdmissionCycle)
 class AdmissionCycleAdmin(admin.ModelAdmin):
-    list_display = ('name', 'academic_year', 'application_start_date', 'application_end_date', 'is_active')
+    list_display = ('name', 'academic_year', 'application_start_date', 'application_end_date', 'is_active', 'letter_archive_actions')
     list_filter = ('is_active', 'academic_year')
     search_fields = ('name', 'academic_year')
     date_hierarchy = 'application_start_date'
 
+    def letter_archive_actions(self, obj):
+        """Display download links for the cycle's letter archive"""
+        letters_url = reverse('admin:download_cycle_letters', args=[obj.id])
+        return format_html(
+            '<a href="{}" class="button" style="margin-right: 5px;">Download Letters</a>'
+            '<a href="{}?include_receipts=1" class="button">Letters + Receipts</a>',
+            letters_url,
+            letters_url
+        )
+    letter_archive_actions.short_description = 'Letter Archive'
+
+    def get_urls(self):
+        """Add custom URL for the streaming letter archive"""
+        from django.urls import path
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                'download-letters/<int:cycle_id>/',
+                self.admin_site.admin_view(self.download_letters_view),
+                name='download_cycle_letters',
+            ),
+        ]
+        return custom_urls + urls
+
+    def download_letters_view(self, request, cycle_id):
+        """Stream a ZIP of every admitted applicant's letter for the cycle"""
+        from django.http import StreamingHttpResponse
+        from .archive_utils import stream_cycle_letters_zip
+
+        admission_cycle = AdmissionCycle.objects.get(id=cycle_id)
+        include_receipts = request.GET.get('include_receipts') == '1'
+
+        response = StreamingHttpResponse(
+            stream_cycle_letters_zip(admission_cycle, include_receipts=include_receipts),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = f'attachment; filename="admission_letters_cycle_{admission_cycle.id}.zip"'
+        return response
+
 @admin.register(AdmissionRequirement)
 class AdmissionRequirementAdmin(admin.ModelAdmin):
     list_display = ('program', 'admission_cycle', 'minimum_percentage', 'total_seats', 'application_fee')
@@ -80,7 +122,10 @@ class ApplicationAdmin(admin.ModelAdmin):
             )
         }),
         ('Selection Details', {
-            'fields': ('merit_score', 'merit_rank', 'waitlist_number')
+            'fields': (
+                'merit_score', 'merit_rank', 'waitlist_number',
+                'preference_order', 'allocated_category', 'allocation_round'
+            )
         }),
         ('Admission Decision', {
             'fields': (
@@ -233,14 +278,14 @@ class ApplicationAdmin(admin.ModelAdmin):
                     messages.error(request, 'Invalid fee amount. Please enter a valid number.')
                     return HttpResponseRedirect(reverse('admin:admissions_application_changelist'))
 
-                # Send admission confirmation email
-                email_sent = send_admission_confirmation_email(application)
+                # Queue admission confirmation email
+                email_queued = queue_admission_confirmation_email(application)
 
-                if email_sent:
-                    messages.success(request, f'Applicant {application.applicant.first_name} {application.applicant.last_name} has been admitted successfully! Confirmation email sent to {application.applicant.email}.')
+                if email_queued:
+                    messages.success(request, f'Applicant {application.applicant.first_name} {application.applicant.last_name} has been admitted successfully! Confirmation email queued for {application.applicant.email}.')
                 else:
                     messages.success(request, f'Applicant {application.applicant.first_name} {application.applicant.last_name} has been admitted successfully!')
-                    messages.warning(request, 'Admission email could not be sent. Please check email configuration.')
+                    messages.warning(request, 'Admission email could not be queued. Please check the outbox.')
             else:
                 messages.error(request, 'Please provide the first semester fee amount.')
         else:
@@ -264,41 +309,48 @@ class ApplicationAdmin(admin.ModelAdmin):
         application.admission_decision_by = request.user
         application.save()
 
-        # Send rejection email
-        email_sent = send_rejection_email(application)
+        # Queue rejection email
+        email_queued = queue_rejection_email(application)
 
-        if email_sent:
-            messages.success(request, f'Applicant {application.applicant.first_name} {application.applicant.last_name} has been rejected. Notification email sent to {application.applicant.email}.')
+        if email_queued:
+            messages.success(request, f'Applicant {application.applicant.first_name} {application.applicant.last_name} has been rejected. Notification email queued for {application.applicant.email}.')
         else:
             messages.success(request, f'Applicant {application.applicant.first_name} {application.applicant.last_name} has been rejected.')
-            messages.warning(request, 'Rejection email could not be sent. Please check email configuration.')
+            messages.warning(request, 'Rejection email could not be queued. Please check the outbox.')
 
         return HttpResponseRedirect(reverse('admin:admissions_application_changelist'))
 
     def generate_letter_view(self, request, application_id):
         """Custom view to generate admission letter"""
-        from .pdf_utils import generate_admission_letter_pdf
-        from django.http import HttpResponse
+        from .pdf_utils import get_admission_letter_path
+        from django.http import FileResponse
 
-        application = Application.objects.get(id=application_id)
+        application = Application.objects.select_related(
+            'applicant', 'program__department', 'admission_cycle'
+        ).get(id=application_id)
 
         if application.admission_decision != 'admitted':
             messages.error(request, 'Admission letter can only be generated for admitted students.')
             return HttpResponseRedirect(reverse('admin:admissions_application_changelist'))
 
-        # Generate PDF
-        pdf_buffer = generate_admission_letter_pdf(application)
+        # Serve the cached PDF, rendering it only if this version is missing
+        letter_path = get_admission_letter_path(application)
 
-        # Update letter generation status
-        application.admission_letter_generated = True
-        application.admission_letter_generated_date = timezone.now()
-        application.save()
+        # Update letter generation status on first download only
+        if not application.admission_letter_generated:
+            Application.objects.filter(id=application.id, admission_letter_generated=False).update(
+                admission_letter_generated=True,
+                admission_letter_generated_date=timezone.now()
+            )
+            invalidate_portal_status(applicant_ids=[application.applicant_id])
 
         # Return PDF response
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="admission_letter_{application.applicant.application_number}.pdf"'
-
-        return response
+        return FileResponse(
+            open(letter_path, 'rb'),
+            as_attachment=True,
+            filename=f"admission_letter_{application.applicant.application_number}.pdf",
+            content_type='application/pdf'
+        )
 
     def record_payment_view(self, request, application_id):
         """Custom view to record fee payment"""
@@ -310,42 +362,23 @@ class ApplicationAdmin(admin.ModelAdmin):
             payment_method = request.POST.get('payment_method', 'Online')
 
             if payment_amount:
+                # Same locked, deduplicated path as the API, so a double-submitted form records one payment
                 try:
-                    application.first_semester_fee_paid = True
-                    application.first_semester_fee_payment_date = timezone.now()
-                    application.first_semester_fee_transaction_id = transaction_id
-                    application.save()
-
-                    # Create fee record
-                    AdmissionFee.objects.create(
-                        application=application,
-                        fee_type='tuition_fee',
-                        amount=Decimal(str(payment_amount)),
-                        paid_amount=Decimal(str(payment_amount)),
-                        payment_date=timezone.now(),
-                        payment_method=payment_method,
-                        transaction_id=transaction_id,
-                        is_paid=True,
-                        due_date=timezone.now().date()
+                    fee, created, email_queued = record_admission_fee_payment(
+                        application.id, payment_amount, transaction_id, payment_method
                     )
-                except (InvalidOperation, ValueError, TypeError):
-                    messages.error(request, 'Invalid payment amount. Please enter a valid number.')
+                except ValueError as e:
+                    # PaymentConflict, a non-admitted application or an invalid amount
+                    messages.error(request, str(e))
                     return HttpResponseRedirect(reverse('admin:admissions_application_changelist'))
 
-                # Send fee payment confirmation email
-                payment_details = {
-                    'amount': float(payment_amount),
-                    'transaction_id': transaction_id,
-                    'payment_method': payment_method,
-                    'payment_date': application.first_semester_fee_payment_date
-                }
-                email_sent = send_fee_payment_confirmation_email(application, payment_details)
-
-                if email_sent:
-                    messages.success(request, f'Fee payment of ₹{payment_amount} recorded successfully! Confirmation email sent to {application.applicant.email}.')
+                if not created:
+                    messages.warning(request, f'Fee payment {fee.transaction_id or ""} was already recorded; nothing was changed.')
+                elif email_queued:
+                    messages.success(request, f'Fee payment of ₹{payment_amount} recorded successfully! Confirmation email queued for {application.applicant.email}.')
                 else:
                     messages.success(request, f'Fee payment of ₹{payment_amount} recorded successfully!')
-                    messages.warning(request, 'Payment confirmation email could not be sent. Please check email configuration.')
+                    messages.warning(request, 'Payment confirmation email could not be queued. Please check the outbox.')
             else:
                 messages.error(request, 'Please provide the payment amount.')
         else:
@@ -390,3 +423,11 @@ class AdmissionFeeAdmin(admin.ModelAdmin):
     list_filter = ('fee_type', 'is_paid', 'payment_method')
     search_fields = ('application__applicant__application_number', 'transaction_id')
     date_hierarchy = 'payment_date'
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'email_type', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'email_type')
+    search_fields = ('recipient', 'subject', 'application__applicant__application_number')
+    readonly_fields = ('created_at', 'updated_at', 'sent_at', 'last_error')
+    date_hierarchy = 'created_at'
@@ -0,0 +1,292 @@
+"""
+Counselling round seat allocation utilities for multi-program admission cycles
+"""
+import heapq
+from collections import defaultdict, deque
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from students.models import Program
+from .models import AdmissionCycle, AdmissionRequirement, Application
+from .decision_utils import DECISION_UPDATES, CLOSED_STATUSES
+from .email_utils import queue_decision_emails
+from .merit_utils import RESERVED_CATEGORIES
+from .portal_utils import invalidate_portal_status
+
+# Seat bucket open to every category; reserved buckets are named after their category
+OPEN_SEATS = 'open'
+
+ALLOCATION_BATCH_SIZE = 2000
+
+
+class SeatMatrix:
+    """
+    Deferred acceptance (applicant-proposing stable matching) over program seat buckets.
+
+    Every program has an open bucket and one bucket per reserved category.
+    A program holding proposals keeps the best merit ranks in its open seats
+    and, among the rest, the best of each category in that category's
+    reserved seats; everyone else is rejected. Applicants propose down their
+    preference list until a program holds them. Because programs only ever
+    trade a held applicant for a better one, the result is stable: nobody
+    prefers a program that would take them over their seat.
+    """
+
+    def __init__(self, applications, preferences, capacities):
+        # application id -> (applicant id, program id, merit rank, category)
+        self.applications = applications
+        # applicant id -> application ids, most preferred first
+        self.preferences = preferences
+        self.position = {
+            application_id: index
+            for application_ids in preferences.values()
+            for index, application_id in enumerate(application_ids)
+        }
+        # (program id, bucket) -> seats
+        self.capacities = capacities
+        # (program id, bucket) -> heap of (-merit rank, application id), worst holder first
+        self.buckets = defaultdict(list)
+        self.seat_of = {}  # application id -> bucket key it is held in
+        self.held = {}  # applicant id -> held application id
+        self.free = deque()
+
+    def _place(self, application_id, key):
+        # Seat in the bucket, bumping its worst holder if this one ranks better; returns who is left out
+        heap = self.buckets[key]
+        rank = self.applications[application_id][2]
+        if len(heap) < self.capacities.get(key, 0):
+            heapq.heappush(heap, (-rank, application_id))
+            self.seat_of[application_id] = key
+            return None
+        if heap and -heap[0][0] > rank:
+            _, bumped_id = heapq.heapreplace(heap, (-rank, application_id))
+            del self.seat_of[bumped_id]
+            self.seat_of[application_id] = key
+            return bumped_id
+        return application_id
+
+    def _propose(self, application_id):
+        """
+        Offer an application to its program; returns the application left without a seat, if any
+        """
+        program_id = self.applications[application_id][1]
+        left_out = self._place(application_id, (program_id, OPEN_SEATS))
+        if left_out is None:
+            return None
+        category = self.applications[left_out][3]
+        if category in RESERVED_CATEGORIES:
+            return self._place(left_out, (program_id, category))
+        return left_out
+
+    def _drain_free(self):
+        while self.free:
+            applicant_id, start = self.free.popleft()
+            for application_id in self.preferences[applicant_id][start:]:
+                left_out = self._propose(application_id)
+                if left_out == application_id:
+                    continue
+                self.held[applicant_id] = application_id
+                if left_out is not None:
+                    self._bump(left_out)
+                break
+
+    def _bump(self, application_id):
+        applicant_id = self.applications[application_id][0]
+        del self.held[applicant_id]
+        self.free.append((applicant_id, self.position[application_id] + 1))
+
+    def _release_reserved_vacancies(self):
+        # Reserved seats no candidate of the category took fall back to the program's open seats
+        converted = False
+        for (program_id, bucket), seats in list(self.capacities.items()):
+            if bucket == OPEN_SEATS:
+                continue
+            vacant = seats - len(self.buckets[(program_id, bucket)])
+            if vacant > 0:
+                self.capacities[(program_id, bucket)] -= vacant
+                self.capacities[(program_id, OPEN_SEATS)] = self.capacities.get((program_id, OPEN_SEATS), 0) + vacant
+                converted = True
+        return converted
+
+    def solve(self, applicant_ids=()):
+        """
+        Let the given applicants propose from their first choice until every one is held or rejected everywhere.
+
+        Reserved seats left vacant are then released to open merit and the
+        matching is solved again from scratch, until no reserved seat is
+        vacant. Repairing the matching in place would also end stable but
+        not necessarily applicant-optimal, so the result would depend on the
+        order of events rather than only on the market.
+        """
+        applicant_ids = list(applicant_ids)
+        while True:
+            self.buckets.clear()
+            self.seat_of.clear()
+            self.held.clear()
+            self.free.extend((applicant_id, 0) for applicant_id in applicant_ids)
+            self._drain_free()
+            if not self._release_reserved_vacancies():
+                break
+
+
+def _requirement_capacities(admission_cycle):
+    capacities = {}
+    for requirement in AdmissionRequirement.objects.filter(admission_cycle=admission_cycle):
+        reserved = {category: getattr(requirement, field) for category, field in RESERVED_CATEGORIES.items()}
+        capacities[(requirement.program_id, OPEN_SEATS)] = max(requirement.total_seats - sum(reserved.values()), 0)
+        for category, seats in reserved.items():
+            capacities[(requirement.program_id, category)] = seats
+    return capacities
+
+
+def _write_allocation(groups, allocation_round, decided_by, now):
+    """
+    Apply the decisions of changed applications with one UPDATE per decision, bucket and batch
+    """
+    fee_per_semester = Subquery(Program.objects.filter(pk=OuterRef('program_id')).values('fees_per_semester')[:1])
+    updated = 0
+    for (decision, bucket), application_ids in groups.items():
+        values = dict(DECISION_UPDATES[decision])
+        values['allocated_category'] = bucket
+        values['allocation_round'] = allocation_round
+        values['admission_decision_date'] = now
+        values['admission_decision_by'] = decided_by
+        values['updated_at'] = now
+        if decision == 'admitted':
+            values['first_semester_fee_amount'] = Coalesce('first_semester_fee_amount', fee_per_semester)
+        for start in range(0, len(application_ids), ALLOCATION_BATCH_SIZE):
+            # A withdrawal committed since the read keeps its status; the next run reallocates its seat
+            updated += Application.objects.filter(
+                id__in=application_ids[start:start + ALLOCATION_BATCH_SIZE]
+            ).exclude(status__in=CLOSED_STATUSES).update(**values)
+        invalidate_portal_status(application_ids=application_ids)
+    return updated
+
+
+def run_seat_allocation(admission_cycle, decided_by=None, notify=False):
+    """
+    Allocate the seats of every program of a cycle with deferred acceptance.
+
+    Each applicant's ranked applications (those with a merit_rank outside
+    draft/cancelled) are taken in preference_order, then submission order.
+    Programs choose by merit_rank within the seat matrix of their
+    AdmissionRequirement; programs without one take no part. Applicants who
+    paid the first semester fee keep their seat and are not moved.
+
+    The held application is admitted, applications the applicant prefers
+    to it stay waitlisted for later rounds and the rest are rejected.
+
+    The matching is always solved over the whole current market in memory,
+    so a re-run after withdrawals gives the same (applicant-optimal) result
+    as a first run without the withdrawn applications; repairing the
+    previous round's seats with vacancy chains would also be stable but can
+    leave applicants in seats they like less. Only applications whose
+    outcome changed are written, so a re-run costs writes along the chains
+    the withdrawals opened. Returns a summary.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # One allocation run per cycle at a time
+        AdmissionCycle.objects.select_for_update().filter(pk=admission_cycle.pk).first()
+
+        capacities = _requirement_capacities(admission_cycle)
+        rows = list(
+            Application.objects.filter(
+                admission_cycle=admission_cycle,
+                program_id__in={program_id for program_id, _ in capacities},
+                merit_rank__isnull=False,
+            )
+            .exclude(status__in=CLOSED_STATUSES)
+            .order_by('id')
+            .values_list(
+                'id', 'applicant_id', 'program_id', 'merit_rank', 'applicant__category',
+                'preference_order', 'submission_date', 'application_date',
+                'admission_decision', 'status', 'allocated_category', 'first_semester_fee_paid'
+            )
+        )
+        previous_round = Application.objects.filter(
+            admission_cycle=admission_cycle, allocation_round__isnull=False
+        ).order_by('-allocation_round').values_list('allocation_round', flat=True).first() or 0
+        allocation_round = previous_round + 1
+
+        # Seats taken by applicants who paid are fixed
+        locked = {row[1] for row in rows if row[11] and row[8] == 'admitted'}
+        locked_seats = defaultdict(int)
+        for row in rows:
+            if row[1] in locked and row[8] == 'admitted':
+                key = (row[2], row[10] or OPEN_SEATS)
+                capacities[key] = max(capacities.get(key, 0) - 1, 0)
+                locked_seats[row[2]] += 1
+
+        applications = {}
+        choices = defaultdict(list)
+        for row in rows:
+            if row[1] in locked:
+                continue
+            applications[row[0]] = (row[1], row[2], row[3], row[4])
+            preference = row[5] if row[5] is not None else float('inf')
+            choices[row[1]].append((preference, row[6] or row[7], row[0]))
+        preferences = {
+            applicant_id: [application_id for *_, application_id in sorted(options)]
+            for applicant_id, options in choices.items()
+        }
+
+        matrix = SeatMatrix(applications, preferences, capacities)
+        matrix.solve(applicant_ids=preferences)
+
+        groups = defaultdict(list)
+        changes = {'admitted': [], 'rejected': []}
+        for row in rows:
+            if row[0] not in applications:
+                continue
+            applicant_id = row[1]
+            held_id = matrix.held.get(applicant_id)
+            bucket = ''
+            if held_id == row[0]:
+                decision = 'admitted'
+                bucket = matrix.seat_of[row[0]][1]
+            elif held_id is None or matrix.position[row[0]] < matrix.position[held_id]:
+                decision = 'waitlisted'
+            else:
+                decision = 'rejected'
+            target = DECISION_UPDATES[decision]
+            if (row[8], row[9], row[10]) == (target['admission_decision'], target['status'], bucket):
+                continue
+            groups[(decision, bucket)].append(row[0])
+            if decision in changes:
+                changes[decision].append(row[0])
+
+        updated = _write_allocation(groups, allocation_round, decided_by, now)
+        # Withdrawn applications no longer hold the seat they were allocated
+        Application.objects.filter(
+            admission_cycle=admission_cycle, status__in=CLOSED_STATUSES
+        ).exclude(allocated_category='').update(allocated_category='', updated_at=now)
+        emails_queued = 0
+        if notify:
+            for decision, application_ids in changes.items():
+                emails_queued += queue_decision_emails(application_ids, decision)
+
+    seats = defaultdict(lambda: {'seats': 0, 'allocated': 0})
+    for program_id, count in locked_seats.items():
+        seats[program_id]['seats'] += count
+        seats[program_id]['allocated'] += count
+    for (program_id, bucket), capacity in capacities.items():
+        seats[program_id]['seats'] += capacity
+        seats[program_id]['allocated'] += len(matrix.buckets[(program_id, bucket)])
+    program_names = dict(Program.objects.filter(id__in=seats).values_list('id', 'name'))
+
+    return {
+        'round': allocation_round,
+        'applicants': len(preferences),
+        'allocated': len(matrix.held) + len(locked),
+        'locked': len(locked),
+        'updated': updated,
+        'emails_queued': emails_queued,
+        'programs': {
+            program_names.get(program_id, str(program_id)): {
+                **counts, 'vacant': counts['seats'] - counts['allocated']
+            }
+            for program_id, counts in sorted(seats.items())
+        },
+    }
@@ -0,0 +1,99 @@
+"""
+Streaming ZIP archive utilities for bulk admission letter downloads
+"""
+import zipfile
+from .models import Application
+from .pdf_utils import get_admission_letter_path, generate_fee_receipt_pdf
+
+ARCHIVE_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ZipStreamBuffer:
+    """
+    Write-only, non-seekable file object for zipfile.
+
+    zipfile writes local headers, file data and data descriptors into it;
+    the streaming generator drains whatever has been written so far, so only
+    one chunk of the archive is held in memory at a time.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _copy_file_into_archive(archive, buffer, name, source_path):
+    with open(source_path, 'rb') as source, archive.open(name, 'w') as target:
+        while True:
+            chunk = source.read(ARCHIVE_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            target.write(chunk)
+            data = buffer.drain()
+            if data:
+                yield data
+
+
+def stream_cycle_letters_zip(admission_cycle, include_receipts=False):
+    """
+    Yield a ZIP archive of every admitted applicant's letter for a cycle.
+
+    Cached letters are copied from disk in small chunks and missing ones are
+    rendered as the archive streams. With `include_receipts`, a receipt is
+    rendered for every paid AdmissionFee of the application.
+    """
+    applications = (
+        Application.objects
+        .filter(admission_cycle=admission_cycle, admission_decision='admitted')
+        .select_related('applicant', 'program__department', 'admission_cycle')
+        .order_by('program_id', 'merit_rank', 'id')
+    )
+    if include_receipts:
+        applications = applications.prefetch_related('fee_payments')
+
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for application in applications.iterator(chunk_size=200):
+            application_number = application.applicant.application_number
+            letter_path = get_admission_letter_path(application)
+            yield from _copy_file_into_archive(
+                archive, buffer, f"letters/admission_letter_{application_number}.pdf", letter_path
+            )
+
+            if not include_receipts:
+                continue
+
+            for fee in application.fee_payments.all():
+                if not fee.is_paid:
+                    continue
+                receipt = generate_fee_receipt_pdf(application, {
+                    'receipt_number': fee.receipt_number or f'AF-{fee.id}',
+                    'amount': fee.paid_amount,
+                    'payment_method': fee.payment_method or 'N/A',
+                    'transaction_id': fee.transaction_id or 'N/A',
+                })
+                archive.writestr(f"receipts/fee_receipt_{application_number}_{fee.id}.pdf", receipt.getvalue())
+                data = buffer.drain()
+                if data:
+                    yield data
+
+    # Central directory written when the archive is closed
+    data = buffer.drain()
+    if data:
+        yield data
@@ -0,0 +1,176 @@
+"""
+Bulk admission decision utilities
+"""
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from students.models import Program
+from .models import Application
+from .email_utils import queue_decision_emails
+from .portal_utils import invalidate_portal_status
+
+# Field values written for each decision class
+DECISION_UPDATES = {
+    'admitted': {'admission_decision': 'admitted', 'status': 'admitted'},
+    'rejected': {'admission_decision': 'not_admitted', 'status': 'rejected'},
+    'waitlisted': {'admission_decision': 'pending', 'status': 'waitlisted'},
+}
+
+# Applications in these states can no longer receive a decision
+CLOSED_STATUSES = ('draft', 'cancelled')
+
+
+def _resolve_selection(entry, base_queryset):
+    """
+    Build the queryset of candidate applications for one decision class
+    """
+    application_ids = entry.get('application_ids')
+    rank_from = entry.get('merit_rank_from')
+    rank_to = entry.get('merit_rank_to')
+
+    if application_ids:
+        return base_queryset.filter(id__in=[int(pk) for pk in application_ids])
+
+    if rank_from is None and rank_to is None:
+        raise ValueError("Each decision needs 'application_ids' or a 'merit_rank_from'/'merit_rank_to' range")
+
+    queryset = base_queryset.filter(merit_rank__isnull=False)
+    if rank_from is not None:
+        queryset = queryset.filter(merit_rank__gte=int(rank_from))
+    if rank_to is not None:
+        queryset = queryset.filter(merit_rank__lte=int(rank_to))
+    return queryset
+
+
+def _parse_fee_amount(value):
+    if value in (None, ''):
+        return None
+    try:
+        amount = Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        raise ValueError(f"Invalid first semester fee amount: {value}")
+    if amount < 0:
+        raise ValueError("First semester fee amount cannot be negative")
+    return amount
+
+
+def apply_bulk_decisions(decisions, admission_cycle=None, program=None, decided_by=None, overwrite=False, notify=False):
+    """
+    Apply admitted/rejected/waitlisted decisions to a merit list.
+
+    `decisions` is a list of dicts, each with a `decision` key and either an
+    `application_ids` list or a `merit_rank_from`/`merit_rank_to` range.
+    Admitted entries may carry a `first_semester_fee_amount`; when omitted the
+    program's `fees_per_semester` is used.
+
+    All classes are applied inside one transaction with a single UPDATE per
+    decision class. With `notify`, admission and rejection emails are added
+    to the outbox in the same transaction rather than sent inline.
+    Returns a summary and a per-row outcome report.
+    """
+    if not decisions:
+        raise ValueError('At least one decision is required')
+
+    base_queryset = Application.objects.all()
+    if admission_cycle is not None:
+        base_queryset = base_queryset.filter(admission_cycle=admission_cycle)
+    if program is not None:
+        base_queryset = base_queryset.filter(program=program)
+
+    parsed = []
+    for entry in decisions:
+        decision = entry.get('decision')
+        if decision not in DECISION_UPDATES:
+            raise ValueError(f"Unknown decision '{decision}'. Expected one of: {', '.join(DECISION_UPDATES)}")
+        parsed.append({
+            'decision': decision,
+            'queryset': _resolve_selection(entry, base_queryset),
+            'requested_ids': [int(pk) for pk in entry.get('application_ids') or []],
+            'fee_amount': _parse_fee_amount(entry.get('first_semester_fee_amount')) if decision == 'admitted' else None,
+        })
+
+    results = []
+    summary = {decision: 0 for decision in DECISION_UPDATES}
+    summary['skipped'] = 0
+    summary['emails_queued'] = 0
+    now = timezone.now()
+
+    with transaction.atomic():
+        claimed = set()
+        plans = []
+        for entry in parsed:
+            rows = list(
+                entry['queryset']
+                .select_for_update()
+                .order_by('merit_rank', 'id')
+                .values_list('id', 'merit_rank', 'status', 'admission_decision')
+            )
+            found_ids = {row[0] for row in rows}
+            for missing_id in entry['requested_ids']:
+                if missing_id not in found_ids:
+                    results.append({
+                        'application_id': missing_id,
+                        'merit_rank': None,
+                        'outcome': 'skipped',
+                        'detail': 'Application not found in the selected cycle/program',
+                    })
+                    summary['skipped'] += 1
+
+            target_ids = []
+            for application_id, merit_rank, app_status, admission_decision in rows:
+                detail = None
+                if application_id in claimed:
+                    detail = 'Application already matched by an earlier decision in this request'
+                elif app_status in CLOSED_STATUSES:
+                    detail = f"Application is in '{app_status}' status"
+                elif admission_decision != 'pending' and not overwrite:
+                    detail = f"Decision already recorded as '{admission_decision}'"
+
+                if detail:
+                    results.append({
+                        'application_id': application_id,
+                        'merit_rank': merit_rank,
+                        'outcome': 'skipped',
+                        'detail': detail,
+                    })
+                    summary['skipped'] += 1
+                    continue
+
+                claimed.add(application_id)
+                target_ids.append(application_id)
+                results.append({
+                    'application_id': application_id,
+                    'merit_rank': merit_rank,
+                    'outcome': entry['decision'],
+                    'detail': None,
+                })
+            plans.append((entry, target_ids))
+
+        for entry, target_ids in plans:
+            if not target_ids:
+                continue
+
+            values = dict(DECISION_UPDATES[entry['decision']])
+            values['admission_decision_date'] = now
+            values['admission_decision_by'] = decided_by
+            values['updated_at'] = now
+            if entry['decision'] == 'admitted':
+                if entry['fee_amount'] is not None:
+                    values['first_semester_fee_amount'] = entry['fee_amount']
+                else:
+                    values['first_semester_fee_amount'] = Subquery(
+                        Program.objects.filter(pk=OuterRef('program_id')).values('fees_per_semester')[:1]
+                    )
+
+            summary[entry['decision']] += Application.objects.filter(id__in=target_ids).update(**values)
+            invalidate_portal_status(application_ids=target_ids)
+
+            if notify:
+                summary['emails_queued'] += queue_decision_emails(target_ids, entry['decision'])
+
+    return {
+        'summary': summary,
+        'decided_at': now,
+        'results': results,
+    }
@@ -7,36 +7,40 @@ from django.utils.html import strip_tags
 from django.conf import settings
 from django.utils import timezone
 from decimal import Decimal
+from datetime import timedelta
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-def send_admission_confirmation_email(application):
+# SMTP round trips one message can wait on (connect, EHLO, STARTTLS, AUTH, MAIL, RCPT, DATA, QUIT), each up to EMAIL_TIMEOUT
+SMTP_ROUND_TRIPS = 8
+
+def build_admission_confirmation_email(application):
     """
-    Send admission confirmation email to the admitted student
+    Build the subject and body of the admission confirmation email
     """
-    try:
-        applicant = application.applicant
-
-        # Email subject
-        subject = f'Admission Confirmation - {application.program.name}'
-
-        # Email context
-        context = {
-            'applicant_name': f"{applicant.first_name} {applicant.last_name}",
-            'application_number': applicant.application_number,
-            'program_name': application.program.name,
-            'department_name': getattr(application.program.department, 'name', 'University'),
-            'academic_year': application.admission_cycle.academic_year,
-            'admission_cycle': application.admission_cycle.name,
-            'first_semester_fee': application.first_semester_fee_amount or Decimal('0'),
-            'admission_date': application.admission_decision_date,
-            'session_start_date': application.admission_cycle.session_start_date,
-            'confirmation_deadline': application.admission_cycle.admission_confirmation_deadline,
-        }
-
-        # Create email content
-        email_content = f"""
+    applicant = application.applicant
+
+    # Email subject
+    subject = f'Admission Confirmation - {application.program.name}'
+
+    # Email context
+    context = {
+        'applicant_name': f"{applicant.first_name} {applicant.last_name}",
+        'application_number': applicant.application_number,
+        'program_name': application.program.name,
+        'department_name': getattr(application.program.department, 'name', 'University'),
+        'academic_year': application.admission_cycle.academic_year,
+        'admission_cycle': application.admission_cycle.name,
+        'first_semester_fee': Decimal(str(application.first_semester_fee_amount or 0)),
+        'admission_date': application.admission_decision_date,
+        'session_start_date': application.admission_cycle.session_start_date,
+        'confirmation_deadline': application.admission_cycle.admission_confirmation_deadline,
+    }
+
+    # Create email content
+    email_content = f"""
 Dear {context['applicant_name']},
 
 Congratulations! We are delighted to inform you that you have been ADMITTED to the {context['program_name']} program for the academic year {context['academic_year']}.
@@ -76,6 +80,15 @@ University ERP System
 ---
 This is an automated email. Please do not reply to this email address.
 """
+    return subject, email_content
+
+def send_admission_confirmation_email(application):
+    """
+    Send admission confirmation email to the admitted student
+    """
+    try:
+        applicant = application.applicant
+        subject, email_content = build_admission_confirmation_email(application)
 
         # Send email
         send_mail(
@@ -93,18 +106,17 @@ This is an automated email. Please do not reply to this email address.
         logger.error(f"Failed to send admission confirmation email: {str(e)}")
         return False
 
-def send_rejection_email(application):
+def build_rejection_email(application):
     """
-    Send admission rejection email to the applicant
+    Build the subject and body of the admission rejection email
     """
-    try:
-        applicant = application.applicant
+    applicant = application.applicant
 
-        # Email subject
-        subject = f'Admission Decision - {application.program.name}'
+    # Email subject
+    subject = f'Admission Decision - {application.program.name}'
 
-        # Email content
-        email_content = f"""
+    # Email content
+    email_content = f"""
 Dear {applicant.first_name} {applicant.last_name},
 
 Thank you for your interest in the {application.program.name} program at our university for the academic year {application.admission_cycle.academic_year}.
@@ -127,6 +139,15 @@ University ERP System
 ---
 This is an automated email. Please do not reply to this email address.
 """
+    return subject, email_content
+
+def send_rejection_email(application):
+    """
+    Send admission rejection email to the applicant
+    """
+    try:
+        applicant = application.applicant
+        subject, email_content = build_rejection_email(application)
 
         # Send email
         send_mail(
@@ -144,26 +165,25 @@ This is an automated email. Please do not reply to this email address.
         logger.error(f"Failed to send admission rejection email: {str(e)}")
         return False
 
-def send_fee_payment_confirmation_email(application, payment_details):
+def build_fee_payment_confirmation_email(application, payment_details):
     """
-    Send fee payment confirmation email to the student
+    Build the subject and body of the fee payment confirmation email
     """
-    try:
-        applicant = application.applicant
+    applicant = application.applicant
 
-        # Email subject
-        subject = f'Fee Payment Confirmation - {application.program.name}'
+    # Email subject
+    subject = f'Fee Payment Confirmation - {application.program.name}'
 
-        # Email content
-        payment_amount = payment_details.get('amount', application.first_semester_fee_amount) or Decimal('0')
-        try:
-            payment_amount = Decimal(str(payment_amount))
-        except Exception:
-            payment_amount = Decimal('0')
-        transaction_id = payment_details.get('transaction_id', application.first_semester_fee_transaction_id)
-        payment_date = payment_details.get('payment_date', application.first_semester_fee_payment_date)
+    # Email content
+    payment_amount = payment_details.get('amount', application.first_semester_fee_amount) or Decimal('0')
+    try:
+        payment_amount = Decimal(str(payment_amount))
+    except Exception:
+        payment_amount = Decimal('0')
+    transaction_id = payment_details.get('transaction_id', application.first_semester_fee_transaction_id)
+    payment_date = payment_details.get('payment_date', application.first_semester_fee_payment_date)
 
-        email_content = f"""
+    email_content = f"""
 Dear {applicant.first_name} {applicant.last_name},
 
 This email confirms that we have received your fee payment for the {application.program.name} program.
@@ -200,6 +220,15 @@ University ERP System
 ---
 This is an automated email. Please do not reply to this email address.
 """
+    return subject, email_content
+
+def send_fee_payment_confirmation_email(application, payment_details):
+    """
+    Send fee payment confirmation email to the student
+    """
+    try:
+        applicant = application.applicant
+        subject, email_content = build_fee_payment_confirmation_email(application, payment_details)
 
         # Send email
         send_mail(
@@ -216,3 +245,234 @@ This is an automated email. Please do not reply to this email address.
     except Exception as e:
         logger.error(f"Failed to send fee payment confirmation email: {str(e)}")
         return False
+
+def _outbox_max_attempts():
+    return getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+
+def queue_email(recipient, subject, body, email_type='other', application=None):
+    """
+    Add an email to the outbox; the send_queued_emails worker delivers it
+    """
+    from .models import OutboundEmail
+
+    return OutboundEmail.objects.create(
+        email_type=email_type,
+        application=application,
+        subject=subject,
+        body=body,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'admissions@university.edu'),
+        recipient=recipient,
+        max_attempts=_outbox_max_attempts(),
+    )
+
+def queue_admission_confirmation_email(application):
+    """
+    Queue the admission confirmation email for the admitted student
+    """
+    try:
+        subject, email_content = build_admission_confirmation_email(application)
+        queue_email(application.applicant.email, subject, email_content, 'admission_confirmation', application)
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to queue admission confirmation email: {str(e)}")
+        return False
+
+def queue_rejection_email(application):
+    """
+    Queue the admission rejection email for the applicant
+    """
+    try:
+        subject, email_content = build_rejection_email(application)
+        queue_email(application.applicant.email, subject, email_content, 'rejection', application)
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to queue admission rejection email: {str(e)}")
+        return False
+
+def queue_fee_payment_confirmation_email(application, payment_details):
+    """
+    Queue the fee payment confirmation email for the student
+    """
+    try:
+        subject, email_content = build_fee_payment_confirmation_email(application, payment_details)
+        queue_email(application.applicant.email, subject, email_content, 'fee_payment_confirmation', application)
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to queue fee payment confirmation email: {str(e)}")
+        return False
+
+def queue_decision_emails(application_ids, decision, batch_size=1000):
+    """
+    Queue admission or rejection emails for many applications with bulk inserts
+    """
+    from .models import Application, OutboundEmail
+
+    builders = {
+        'admitted': (build_admission_confirmation_email, 'admission_confirmation'),
+        'rejected': (build_rejection_email, 'rejection'),
+    }
+    if decision not in builders or not application_ids:
+        return 0
+
+    build, email_type = builders[decision]
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'admissions@university.edu')
+    max_attempts = _outbox_max_attempts()
+    applications = (
+        Application.objects
+        .filter(id__in=application_ids)
+        .select_related('applicant', 'program__department', 'admission_cycle')
+    )
+
+    queued = 0
+    batch = []
+    for application in applications.iterator(chunk_size=batch_size):
+        subject, email_content = build(application)
+        batch.append(OutboundEmail(
+            email_type=email_type,
+            application=application,
+            subject=subject,
+            body=email_content,
+            from_email=from_email,
+            recipient=application.applicant.email,
+            max_attempts=max_attempts,
+        ))
+        if len(batch) >= batch_size:
+            OutboundEmail.objects.bulk_create(batch)
+            queued += len(batch)
+            batch = []
+
+    if batch:
+        OutboundEmail.objects.bulk_create(batch)
+        queued += len(batch)
+
+    return queued
+
+def _retry_delay(attempts):
+    """
+    Exponential backoff delay for the given number of failed attempts
+    """
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+    ceiling = getattr(settings, 'EMAIL_OUTBOX_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * (2 ** max(attempts - 1, 0)), ceiling))
+
+def _outbox_stale_seconds():
+    """
+    Age after which a 'sending' row counts as abandoned by its worker.
+
+    Never less than three times the longest one message can take, so a
+    worker refreshing its claim every third of the window cannot lose it.
+    """
+    timeout = getattr(settings, 'EMAIL_TIMEOUT', None) or 0
+    return max(getattr(settings, 'EMAIL_OUTBOX_STALE_SECONDS', 900), 3 * SMTP_ROUND_TRIPS * timeout)
+
+def claim_queued_emails(batch_size=100):
+    """
+    Claim a batch of due outbox rows for this worker.
+
+    Rows are locked with SKIP LOCKED so several workers can drain the outbox
+    concurrently. Rows stuck in 'sending' by a crashed worker are reclaimed
+    once they are older than EMAIL_OUTBOX_STALE_SECONDS; the delivering
+    worker refreshes its claim while it works through the batch.
+    """
+    from django.db import transaction
+    from django.db.models import Q
+    from .models import OutboundEmail
+
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=_outbox_stale_seconds())
+
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now) |
+                Q(status='sending', updated_at__lt=stale_before)
+            )
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if emails:
+            OutboundEmail.objects.filter(id__in=[email.id for email in emails]).update(status='sending', updated_at=now)
+
+    return emails
+
+def deliver_queued_emails(batch_size=100):
+    """
+    Deliver one batch from the outbox over a single reused SMTP connection.
+
+    Returns a dict with the number of sent, retried and failed emails.
+    """
+    from django.core.mail import EmailMessage, get_connection
+    from .models import OutboundEmail
+
+    emails = claim_queued_emails(batch_size)
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not emails:
+        return result
+
+    connection = get_connection(fail_silently=False, timeout=getattr(settings, 'EMAIL_TIMEOUT', None))
+    sent_ids = []
+    refresh_every = _outbox_stale_seconds() / 3
+    refreshed_at = time.monotonic()
+
+    try:
+        for email in emails:
+            if time.monotonic() - refreshed_at >= refresh_every:
+                # A batch can outlast the stale window; keep other workers off the rows still held (sent ones included)
+                OutboundEmail.objects.filter(
+                    id__in=[claimed.id for claimed in emails], status='sending'
+                ).update(updated_at=timezone.now())
+                refreshed_at = time.monotonic()
+            try:
+                connection.open()
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=[email.recipient],
+                    connection=connection,
+                ).send()
+                sent_ids.append(email.id)
+
+            except Exception as e:
+                # Drop the connection so the next message starts on a fresh one
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+                attempts = email.attempts + 1
+                if attempts >= email.max_attempts:
+                    result['failed'] += 1
+                    OutboundEmail.objects.filter(id=email.id).update(
+                        status='failed', attempts=attempts, last_error=str(e), updated_at=timezone.now()
+                    )
+                    logger.error(f"Giving up on email {email.id} to {email.recipient} after {attempts} attempts: {str(e)}")
+                else:
+                    result['retried'] += 1
+                    OutboundEmail.objects.filter(id=email.id).update(
+                        status='pending',
+                        attempts=attempts,
+                        last_error=str(e),
+                        next_attempt_at=timezone.now() + _retry_delay(attempts),
+                        updated_at=timezone.now(),
+                    )
+                    logger.warning(f"Email {email.id} to {email.recipient} failed (attempt {attempts}), will retry: {str(e)}")
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+        if sent_ids:
+            now = timezone.now()
+            OutboundEmail.objects.filter(id__in=sent_ids).update(
+                status='sent', sent_at=now, last_error='', updated_at=now
+            )
+            result['sent'] = len(sent_ids)
+
+    logger.info(f"Outbox batch delivered: {result['sent']} sent, {result['retried']} retried, {result['failed']} failed")
+    return result
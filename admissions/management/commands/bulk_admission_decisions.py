@@ -0,0 +1,118 @@
+"""
+Django management command to apply admission decisions to a whole merit list
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from admissions.models import AdmissionCycle
+from admissions.decision_utils import apply_bulk_decisions
+from students.models import Program
+
+class Command(BaseCommand):
+    help = 'Apply admitted/waitlisted/rejected decisions to a merit list in one transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cycle', type=int, required=True, help='Admission cycle ID')
+        parser.add_argument('--program', type=int, help='Restrict the merit list to one program ID')
+        for decision in ('admit', 'waitlist', 'reject'):
+            parser.add_argument(
+                f'--{decision}',
+                type=str,
+                help=f'Merit rank range to {decision}, e.g. "1-3000" or "3501-" for an open-ended range'
+            )
+            parser.add_argument(
+                f'--{decision}-ids',
+                type=str,
+                help=f'Comma-separated application IDs to {decision}'
+            )
+        parser.add_argument(
+            '--fee-amount',
+            type=str,
+            help='First semester fee for admitted applicants (defaults to the program fee per semester)'
+        )
+        parser.add_argument('--decided-by', type=str, help='Username recorded as the decision maker')
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Also change applications that already have an admitted/not admitted decision'
+        )
+        parser.add_argument(
+            '--notify',
+            action='store_true',
+            help='Queue admission/rejection emails in the outbox for the send_queued_emails worker'
+        )
+        parser.add_argument('--report', type=str, help='Write the per-row outcome report to this JSON file')
+
+    def _parse_range(self, value):
+        start, sep, end = value.partition('-')
+        if not sep or not start.strip().isdigit() or (end.strip() and not end.strip().isdigit()):
+            raise CommandError(f'Invalid merit rank range "{value}". Use "FROM-TO" or "FROM-".')
+        return int(start), int(end) if end.strip() else None
+
+    def handle(self, *args, **options):
+        try:
+            admission_cycle = AdmissionCycle.objects.get(id=options['cycle'])
+        except AdmissionCycle.DoesNotExist:
+            raise CommandError(f"Admission cycle {options['cycle']} not found")
+
+        program = None
+        if options['program']:
+            try:
+                program = Program.objects.get(id=options['program'])
+            except Program.DoesNotExist:
+                raise CommandError(f"Program {options['program']} not found")
+
+        decided_by = None
+        if options['decided_by']:
+            try:
+                decided_by = get_user_model().objects.get(username=options['decided_by'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['decided_by']} not found")
+
+        decisions = []
+        for option, decision in (('admit', 'admitted'), ('waitlist', 'waitlisted'), ('reject', 'rejected')):
+            if options[option]:
+                rank_from, rank_to = self._parse_range(options[option])
+                decisions.append({'decision': decision, 'merit_rank_from': rank_from, 'merit_rank_to': rank_to})
+            if options[f'{option}_ids']:
+                ids = [pk.strip() for pk in options[f'{option}_ids'].split(',') if pk.strip()]
+                decisions.append({'decision': decision, 'application_ids': ids})
+
+        for entry in decisions:
+            if entry['decision'] == 'admitted':
+                entry['first_semester_fee_amount'] = options['fee_amount']
+
+        if not decisions:
+            raise CommandError('Nothing to do. Pass at least one of --admit, --waitlist, --reject or their -ids variants.')
+
+        try:
+            report = apply_bulk_decisions(
+                decisions,
+                admission_cycle=admission_cycle,
+                program=program,
+                decided_by=decided_by,
+                overwrite=options['overwrite'],
+                notify=options['notify'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        summary = report['summary']
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Decisions applied for {admission_cycle}: "
+            f"{summary['admitted']} admitted, {summary['waitlisted']} waitlisted, "
+            f"{summary['rejected']} rejected, {summary['skipped']} skipped"
+        ))
+        if options['notify']:
+            self.stdout.write(f"{summary['emails_queued']} notification emails queued")
+
+        for row in report['results']:
+            if row['outcome'] == 'skipped':
+                self.stdout.write(self.style.WARNING(
+                    f"Skipped application {row['application_id']}: {row['detail']}"
+                ))
+
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2, default=str)
+            self.stdout.write(f"Outcome report written to {options['report']}")
@@ -0,0 +1,95 @@
+"""
+Django management command to pre-render admission letters for a whole cycle
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from admissions.models import AdmissionCycle, Application
+from admissions.pdf_utils import (
+    build_admission_letter_context, admission_letter_cache_path, write_admission_letter
+)
+from admissions.portal_utils import invalidate_portal_status
+
+def _render_letter(context, path):
+    """Worker entry point; renders from plain data so it never touches the database"""
+    write_admission_letter(context, path)
+    return context['application_id']
+
+class Command(BaseCommand):
+    help = 'Render and cache admission letters for every admitted applicant of a cycle in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cycle', type=int, required=True, help='Admission cycle ID')
+        parser.add_argument('--program', type=int, help='Only render letters for this program ID')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of rendering processes (defaults to the CPU count)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render letters even if the current version is already cached'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            admission_cycle = AdmissionCycle.objects.get(id=options['cycle'])
+        except AdmissionCycle.DoesNotExist:
+            raise CommandError(f"Admission cycle {options['cycle']} not found")
+
+        applications = Application.objects.filter(
+            admission_cycle=admission_cycle,
+            admission_decision='admitted'
+        ).select_related('applicant', 'program__department', 'admission_cycle')
+        if options['program']:
+            applications = applications.filter(program_id=options['program'])
+
+        media_root = str(settings.MEDIA_ROOT)
+        jobs = []
+        cached = 0
+        for application in applications.iterator(chunk_size=2000):
+            context = build_admission_letter_context(application)
+            path = admission_letter_cache_path(context, media_root)
+            if not options['force'] and os.path.exists(path):
+                cached += 1
+                continue
+            jobs.append((context, path))
+
+        self.stdout.write(f"{len(jobs)} letters to render, {cached} already cached")
+        if not jobs:
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+
+        started = time.monotonic()
+        rendered_ids = []
+        failures = 0
+        with ProcessPoolExecutor(max_workers=max(options['workers'], 1)) as executor:
+            futures = [executor.submit(_render_letter, context, path) for context, path in jobs]
+            for future in as_completed(futures):
+                try:
+                    rendered_ids.append(future.result())
+                except Exception as e:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f'❌ Failed to render a letter: {str(e)}'))
+
+        elapsed = time.monotonic() - started
+
+        if rendered_ids:
+            Application.objects.filter(id__in=rendered_ids, admission_letter_generated=False).update(
+                admission_letter_generated=True,
+                admission_letter_generated_date=timezone.now()
+            )
+            invalidate_portal_status(application_ids=rendered_ids)
+
+        rate = len(rendered_ids) / elapsed if elapsed else len(rendered_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rendered {len(rendered_ids)} letters in {elapsed:.1f}s ({rate:.1f} letters/s), {failures} failed'
+        ))
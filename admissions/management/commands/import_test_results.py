@@ -0,0 +1,70 @@
+"""
+Django management command to import an OMR/CSV admission test result file
+"""
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from admissions.models import AdmissionTest
+from admissions.result_utils import RESULT_CHUNK_SIZE, import_test_results
+
+class Command(BaseCommand):
+    help = 'Import test results keyed by admit card number, dense-rank each test and fill application entrance scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', type=str, help='CSV result file (comma, semicolon, tab or pipe separated)')
+        parser.add_argument('--test', type=int, help='Reject rows whose admit card belongs to another admission test ID')
+        parser.add_argument('--publish', action='store_true', help='Stamp the imported results as published now')
+        parser.add_argument('--strict', action='store_true', help='Import nothing if any row is invalid')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=RESULT_CHUNK_SIZE,
+            help=f'Rows validated and written per chunk (default: {RESULT_CHUNK_SIZE})'
+        )
+        parser.add_argument('--report', type=str, help='Write the import summary and rejected rows to this JSON file')
+
+    def handle(self, *args, **options):
+        test = None
+        if options['test']:
+            try:
+                test = AdmissionTest.objects.get(id=options['test'])
+            except AdmissionTest.DoesNotExist:
+                raise CommandError(f"Admission test {options['test']} not found")
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        started = time.monotonic()
+        try:
+            report = import_test_results(
+                options['file'],
+                test=test,
+                publish=options['publish'],
+                strict=options['strict'],
+                chunk_size=options['chunk_size'],
+            )
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['file']}: {str(e)}")
+        except (ValueError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+
+        for test_name, counts in report['tests'].items():
+            self.stdout.write(
+                f"{test_name}: {counts['results']} results ranked, {counts['ranks_updated']} ranks and "
+                f"{counts['applications_updated']} application scores updated"
+            )
+        for error in report['errors'][:20]:
+            self.stdout.write(self.style.WARNING(
+                f"Line {error['line']} ({error['admit_card_number'] or 'no admit card'}): {error['error']}"
+            ))
+        if report['rejected'] > 20:
+            self.stdout.write(self.style.WARNING(f"... and {report['rejected'] - 20} more rejected rows"))
+
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2, default=str)
+            self.stdout.write(f"Import report written to {options['report']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {report['imported']} results imported, {report['absent']} absent, "
+            f"{report['rejected']} rejected from {report['rows']} rows in {time.monotonic() - started:.1f}s"
+        ))
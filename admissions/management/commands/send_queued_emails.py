@@ -0,0 +1,55 @@
+"""
+Django management command that drains the outbound email queue
+"""
+import time
+from django.core.management.base import BaseCommand
+from admissions.email_utils import deliver_queued_emails
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbound emails in batches over a reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of emails claimed and sent per SMTP connection'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting once it is empty'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls when the outbox is empty (with --loop)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+
+        try:
+            while True:
+                result = deliver_queued_emails(batch_size=batch_size)
+                for key in totals:
+                    totals[key] += result[key]
+
+                if sum(result.values()):
+                    self.stdout.write(
+                        f"Batch: {result['sent']} sent, {result['retried']} retried, {result['failed']} failed"
+                    )
+                    continue
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Interrupted, stopping outbox worker'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Outbox drained: {totals['sent']} sent, {totals['retried']} scheduled for retry, {totals['failed']} failed"
+        ))
@@ -0,0 +1,232 @@
+"""
+Merit list computation utilities for admission cycles
+"""
+from decimal import Decimal
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from students.models import Program
+from university_erp.db_utils import bulk_update_values
+from .models import Application, AdmissionRequirement, AdmissionTest
+
+DEFAULT_MERIT_WEIGHTS = {
+    'overall_percentage': 0.4,
+    'entrance_exam_score': 0.4,
+    'interview_score': 0.2,
+}
+
+# Applications in these states are left out of the merit list
+UNRANKED_STATUSES = ('draft', 'cancelled')
+
+# Applicant categories with reserved seats, mapped to the AdmissionRequirement field holding them
+RESERVED_CATEGORIES = {
+    'sc': 'reserved_seats_sc',
+    'st': 'reserved_seats_st',
+    'obc': 'reserved_seats_obc',
+    'pwd': 'reserved_seats_pwd',
+}
+
+MERIT_FIELDS = ('merit_score', 'merit_rank', 'waitlist_number')
+
+
+def get_merit_weights():
+    """
+    Merit component weights from settings.MERIT_WEIGHTS over the defaults
+    """
+    return {**DEFAULT_MERIT_WEIGHTS, **getattr(settings, 'MERIT_WEIGHTS', {})}
+
+
+def _float_array(values):
+    return np.array([np.nan if value is None else float(value) for value in values], dtype=np.float64)
+
+
+def compute_merit_scores(overall, entrance, interview, weights, entrance_max, interview_max):
+    """
+    Weighted merit scores out of 100 for arrays of applications.
+
+    Each component is scaled to a percentage of its maximum marks; a missing
+    score counts as zero. Weights of components set to 0 drop out and the
+    remaining weights are normalized to sum to one. Returns scores rounded
+    to two decimals, as stored.
+    """
+    components = (
+        (overall, 100.0, weights['overall_percentage']),
+        (entrance, entrance_max, weights['entrance_exam_score']),
+        (interview, interview_max, weights['interview_score']),
+    )
+    total_weight = sum(weight for _, _, weight in components)
+    if total_weight <= 0:
+        raise ValueError('At least one merit weight must be positive')
+
+    scores = np.zeros(len(overall), dtype=np.float64)
+    for values, max_marks, weight in components:
+        if weight and max_marks:
+            scores += np.clip(np.nan_to_num(values, nan=0.0) / max_marks, 0, 1) * 100 * weight
+    return np.round(scores / total_weight, 2)
+
+
+def merit_order(scores, entrance, overall, submitted, application_ids):
+    """
+    Indices of applications in merit order.
+
+    Ties on the merit score are broken by the higher entrance exam score,
+    then the higher overall percentage, then the earlier submission, then
+    the lower application id, so the order never depends on load order.
+    """
+    # np.lexsort sorts by the last key first, ascending
+    return np.lexsort((
+        application_ids,
+        submitted,
+        -np.nan_to_num(overall, nan=-1.0),
+        -np.nan_to_num(entrance, nan=-1.0),
+        -scores,
+    ))
+
+
+def allocate_seats(categories, total_seats, reserved_seats):
+    """
+    Split an ordered merit list into seat holders and per-category waitlists.
+
+    `categories` is the array of applicant categories in merit order.
+    Open seats (total less reserved) go to the top of the whole list; each
+    reserved category then fills its seats from its own remaining
+    applicants, and reserved seats left vacant fall back to the next
+    applicants in overall merit. Returns a boolean seat mask and an array of
+    waitlist numbers counted within each category (0 for seat holders).
+    """
+    count = len(categories)
+    seat = np.zeros(count, dtype=bool)
+    reserved_total = sum(reserved_seats.values())
+    open_seats = max(total_seats - reserved_total, 0)
+    seat[:open_seats] = True
+
+    vacant = 0
+    for category, seats in reserved_seats.items():
+        candidates = np.flatnonzero(~seat & (categories == category))
+        seat[candidates[:seats]] = True
+        vacant += max(seats - len(candidates), 0)
+    if vacant:
+        seat[np.flatnonzero(~seat)[:vacant]] = True
+
+    waitlist = np.zeros(count, dtype=np.int64)
+    for category in np.unique(categories[~seat]):
+        waiting = np.flatnonzero(~seat & (categories == category))
+        waitlist[waiting] = np.arange(1, len(waiting) + 1)
+    return seat, waitlist
+
+
+def write_merit_results(changed, batch_size=2000):
+    """
+    Store (application id, merit_score, merit_rank, waitlist_number) rows with executemany, see bulk_update_values
+    """
+    now = timezone.now()
+    bulk_update_values(
+        Application, MERIT_FIELDS + ('updated_at',), [row + (now,) for row in changed], batch_size=batch_size
+    )
+
+
+def _max_marks(admission_cycle, program, test_type):
+    return AdmissionTest.objects.filter(
+        admission_cycle=admission_cycle, program=program, test_type=test_type
+    ).order_by('-test_date').values_list('total_marks', flat=True).first()
+
+
+def compute_merit_list(admission_cycle, program, weights=None, batch_size=2000):
+    """
+    Compute merit scores, ranks and waitlist numbers for one program in a cycle.
+
+    Every application not in draft/cancelled is scored; those meeting the
+    requirement's minimum percentage are ranked 1..n in merit order.
+    Applications within the program's seats (see allocate_seats) get no
+    waitlist number, the rest are numbered within their category. Without
+    an AdmissionRequirement, applications are ranked but not waitlisted.
+    Only changed rows are written (see write_merit_results). Returns a summary.
+    """
+    weights = weights or get_merit_weights()
+    requirement = AdmissionRequirement.objects.filter(admission_cycle=admission_cycle, program=program).first()
+    rows = list(
+        Application.objects.filter(admission_cycle=admission_cycle, program=program)
+        .exclude(status__in=UNRANKED_STATUSES)
+        .order_by('id')
+        .values_list(
+            'id', 'applicant__category', 'overall_percentage', 'entrance_exam_score', 'interview_score',
+            'submission_date', 'application_date', *MERIT_FIELDS
+        )
+    )
+    summary = {
+        'program': program.name,
+        'applications': len(rows),
+        'ranked': 0,
+        'seats': requirement.total_seats if requirement else None,
+        'seat_holders': {},
+        'waitlisted': {},
+        'updated': 0,
+    }
+    if not rows:
+        return summary
+
+    columns = list(zip(*rows))
+    application_ids = np.array(columns[0], dtype=np.int64)
+    categories = np.array(columns[1], dtype=object)
+    overall = _float_array(columns[2])
+    entrance = _float_array(columns[3])
+    interview = _float_array(columns[4])
+    submitted = np.array([
+        (submission_date or application_date).timestamp()
+        for submission_date, application_date in zip(columns[5], columns[6])
+    ], dtype=np.float64)
+
+    if requirement is not None:
+        # Components the program does not assess carry no weight
+        weights = {
+            **weights,
+            'entrance_exam_score': weights['entrance_exam_score'] if requirement.entrance_exam_required else 0,
+            'interview_score': weights['interview_score'] if requirement.interview_required else 0,
+        }
+    entrance_max = _max_marks(admission_cycle, program, 'entrance_exam') or np.nanmax(entrance, initial=0) or None
+    interview_max = _max_marks(admission_cycle, program, 'interview') or 100
+
+    scores = compute_merit_scores(overall, entrance, interview, weights, entrance_max, interview_max)
+    eligible = np.ones(len(rows), dtype=bool)
+    if requirement is not None:
+        eligible = np.nan_to_num(overall, nan=0.0) >= float(requirement.minimum_percentage)
+
+    order = merit_order(scores, entrance, overall, submitted, application_ids)
+    order = order[eligible[order]]
+    ranks = np.zeros(len(rows), dtype=np.int64)
+    ranks[order] = np.arange(1, len(order) + 1)
+
+    waitlist = np.zeros(len(rows), dtype=np.int64)
+    if requirement is not None:
+        reserved_seats = {
+            category: getattr(requirement, field) for category, field in RESERVED_CATEGORIES.items()
+        }
+        seat, ordered_waitlist = allocate_seats(categories[order], requirement.total_seats, reserved_seats)
+        waitlist[order] = ordered_waitlist
+        holders, holder_counts = np.unique(categories[order][seat], return_counts=True)
+        waiting, waiting_counts = np.unique(categories[order][~seat], return_counts=True)
+        summary['seat_holders'] = dict(zip(holders.tolist(), holder_counts.tolist()))
+        summary['waitlisted'] = dict(zip(waiting.tolist(), waiting_counts.tolist()))
+
+    changed = []
+    for index, row in enumerate(rows):
+        values = (Decimal(f'{scores[index]:.2f}'), int(ranks[index]) or None, int(waitlist[index]) or None)
+        if values != row[-3:]:
+            changed.append((row[0],) + values)
+    write_merit_results(changed, batch_size=batch_size)
+
+    summary['ranked'] = len(order)
+    summary['updated'] = len(changed)
+    return summary
+
+
+def compute_cycle_merit_lists(admission_cycle, program=None, weights=None):
+    """
+    Compute the merit list of every program with applications in a cycle; returns summaries per program
+    """
+    programs = Program.objects.filter(
+        id__in=Application.objects.filter(admission_cycle=admission_cycle).values('program_id')
+    ).order_by('name')
+    if program is not None:
+        programs = programs.filter(id=program.id)
+    return [compute_merit_list(admission_cycle, cycle_program, weights=weights) for cycle_program in programs]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0004_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboundemail',
+            name='email_type',
+            field=models.CharField(choices=[('admission_confirmation', 'Admission Confirmation'), ('rejection', 'Rejection'), ('fee_payment_confirmation', 'Fee Payment Confirmation'), ('fee_reminder', 'Fee Reminder'), ('other', 'Other')], default='other', max_length=30),
+        ),
+    ]
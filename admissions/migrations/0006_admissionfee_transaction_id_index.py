@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0005_alter_outboundemail_email_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='admissionfee',
+            index=models.Index(fields=['transaction_id'], name='admissions__transac_a9de31_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0006_admissionfee_transaction_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['admission_cycle', 'program', 'merit_rank'], name='admissions__admissi_6d774e_idx'),
+        ),
+    ]
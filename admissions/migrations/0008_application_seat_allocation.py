@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0007_application_merit_rank_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='allocated_category',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='allocation_round',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='preference_order',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
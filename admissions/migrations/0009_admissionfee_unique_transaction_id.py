@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:22
+
+from django.db import migrations, models
+
+
+def blank_transaction_ids_to_null(apps, schema_editor):
+    AdmissionFee = apps.get_model('admissions', 'AdmissionFee')
+
+    AdmissionFee.objects.filter(transaction_id='').update(transaction_id=None)
+    duplicates = list(
+        AdmissionFee.objects.exclude(transaction_id=None)
+        .values('transaction_id')
+        .annotate(fees=models.Count('id'))
+        .filter(fees__gt=1)
+        .values_list('transaction_id', flat=True)[:20]
+    )
+    if duplicates:
+        # Payment rows are not merged automatically; an accountant has to decide which one stands
+        raise RuntimeError(
+            'AdmissionFee rows share transaction ids and must be resolved before this migration: '
+            + ', '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0008_application_seat_allocation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='admissionfee',
+            name='transaction_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(blank_transaction_ids_to_null, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='admissionfee',
+            name='admissions__transac_a9de31_idx',
+        ),
+        migrations.AlterField(
+            model_name='admissionfee',
+            name='transaction_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
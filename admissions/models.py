@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from students.models import Program, Department
 
 class AdmissionCycle(models.Model):
@@ -162,6 +163,11 @@ class Application(models.Model):
     merit_rank = models.PositiveIntegerField(null=True, blank=True)
     waitlist_number = models.PositiveIntegerField(null=True, blank=True)
 
+    # Seat Allocation
+    preference_order = models.PositiveSmallIntegerField(null=True, blank=True)  # 1 = applicant's first choice
+    allocated_category = models.CharField(max_length=20, blank=True)  # Seat bucket held: 'open' or a reserved category
+    allocation_round = models.PositiveIntegerField(null=True, blank=True)
+
     # Additional Information
     statement_of_purpose = models.TextField(blank=True)
     extracurricular_activities = models.TextField(blank=True)
@@ -177,6 +183,9 @@ class Application(models.Model):
 
     class Meta:
         unique_together = ['applicant', 'admission_cycle', 'program']
+        indexes = [
+            models.Index(fields=['admission_cycle', 'program', 'merit_rank']),
+        ]
 
     def __str__(self):
         return f"{self.applicant.application_number} - {self.program.name}"
@@ -299,10 +308,56 @@ class AdmissionFee(models.Model):
     paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     payment_date = models.DateTimeField(null=True, blank=True)
     payment_method = models.CharField(max_length=50, blank=True)
-    transaction_id = models.CharField(max_length=100, blank=True)
+    # NULL when there is no reference: MySQL has no partial unique index, and NULLs never collide
+    transaction_id = models.CharField(max_length=100, blank=True, null=True, unique=True)
     is_paid = models.BooleanField(default=False)
     receipt_number = models.CharField(max_length=50, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        if not self.transaction_id:
+            self.transaction_id = None
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.application.applicant.application_number} - {self.get_fee_type_display()} - {self.amount}"
+
+class OutboundEmail(models.Model):
+    """Queued outbound emails delivered by the send_queued_emails worker"""
+    EMAIL_TYPES = (
+        ('admission_confirmation', 'Admission Confirmation'),
+        ('rejection', 'Rejection'),
+        ('fee_payment_confirmation', 'Fee Payment Confirmation'),
+        ('fee_reminder', 'Fee Reminder'),
+        ('other', 'Other'),
+    )
+
+    EMAIL_STATUS = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    email_type = models.CharField(max_length=30, choices=EMAIL_TYPES, default='other')
+    application = models.ForeignKey(Application, on_delete=models.SET_NULL, null=True, blank=True, related_name='outbound_emails')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipient = models.EmailField()
+    status = models.CharField(max_length=10, choices=EMAIL_STATUS, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} - {self.subject} ({self.status})"
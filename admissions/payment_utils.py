@@ -0,0 +1,128 @@
+"""
+Fee payment recording utilities for admitted applicants
+"""
+import hashlib
+import hmac
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import Application, AdmissionFee
+from .email_utils import queue_fee_payment_confirmation_email
+
+# Gateway callback statuses that mean the money was captured
+SUCCESSFUL_PAYMENT_STATUSES = ('success', 'succeeded', 'captured', 'paid')
+
+
+class PaymentConflict(ValueError):
+    """The transaction id is already recorded against another application or payment"""
+
+
+def parse_payment_amount(value):
+    """
+    Parse a payment amount into a positive Decimal; raises ValueError otherwise
+    """
+    try:
+        amount = Decimal(str(value)).quantize(Decimal('0.01'))
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"Invalid payment amount '{value}'")
+    if amount <= 0:
+        raise ValueError('Payment amount must be positive')
+    return amount
+
+
+def record_admission_fee_payment(application_id, amount, transaction_id='', payment_method='Online'):
+    """
+    Record the first semester fee payment of an admitted application exactly once.
+
+    The application row is locked with SELECT ... FOR UPDATE, so concurrent
+    submissions and gateway retries for it are serialised. A transaction id
+    that is already recorded returns the existing fee instead of a second
+    one; across applications the unique AdmissionFee.transaction_id decides
+    which of two concurrent payments wins. The application update, the fee
+    row and the confirmation email commit together. Returns (fee, created, email_queued). Raises
+    Application.DoesNotExist, ValueError on invalid input, and
+    PaymentConflict when the payment clashes with one already recorded.
+    """
+    amount = parse_payment_amount(amount)
+    transaction_id = (transaction_id or '').strip()
+
+    with transaction.atomic():
+        application = (
+            Application.objects.select_for_update()
+            .select_related('applicant', 'program')
+            .get(id=application_id)
+        )
+        if application.admission_decision != 'admitted':
+            raise ValueError('Only admitted students can pay fees')
+
+        if transaction_id:
+            existing = AdmissionFee.objects.filter(transaction_id=transaction_id).first()
+            if existing is not None:
+                if existing.application_id != application.id:
+                    raise PaymentConflict(
+                        f"Transaction {transaction_id} is already recorded for another application"
+                    )
+                return existing, False, False
+
+        if application.first_semester_fee_paid:
+            if transaction_id and transaction_id != application.first_semester_fee_transaction_id:
+                raise PaymentConflict(
+                    f"First semester fee is already paid with transaction "
+                    f"{application.first_semester_fee_transaction_id or 'without a reference'}"
+                )
+            existing = application.fee_payments.filter(fee_type='tuition_fee', is_paid=True).order_by('id').first()
+            if existing is not None:
+                return existing, False, False
+
+        paid_at = timezone.now()
+        application.first_semester_fee_paid = True
+        application.first_semester_fee_payment_date = paid_at
+        application.first_semester_fee_transaction_id = transaction_id
+        application.save(update_fields=[
+            'first_semester_fee_paid', 'first_semester_fee_payment_date',
+            'first_semester_fee_transaction_id', 'updated_at'
+        ])
+
+        try:
+            with transaction.atomic():
+                fee = AdmissionFee.objects.create(
+                    application=application,
+                    fee_type='tuition_fee',
+                    amount=amount,
+                    paid_amount=amount,
+                    payment_date=paid_at,
+                    payment_method=payment_method,
+                    transaction_id=transaction_id or None,
+                    is_paid=True,
+                    due_date=paid_at.date()
+                )
+        except IntegrityError:
+            # Committed meanwhile for another application, whose row lock did not serialise with ours
+            raise PaymentConflict(f"Transaction {transaction_id} is already recorded for another application")
+
+        payment_details = {
+            'amount': float(amount),
+            'transaction_id': transaction_id,
+            'payment_method': payment_method,
+            'payment_date': paid_at
+        }
+        # A failed enqueue must not roll back the payment itself
+        with transaction.atomic():
+            email_queued = queue_fee_payment_confirmation_email(application, payment_details)
+
+    return fee, True, email_queued
+
+
+def verify_gateway_signature(payload, signature):
+    """
+    Check the HMAC-SHA256 hex digest a payment gateway sent for a raw request body
+    """
+    secret = getattr(settings, 'PAYMENT_GATEWAY_WEBHOOK_SECRET', '')
+    if not secret or not signature:
+        return False
+    signature = signature.strip().lower()
+    if signature.startswith('sha256='):
+        signature = signature[len('sha256='):]
+    expected = hmac.new(secret.encode('utf-8'), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
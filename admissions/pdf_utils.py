@@ -9,45 +9,93 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from django.conf import settings
 from django.utils import timezone
+from decimal import Decimal
+from functools import lru_cache
 from io import BytesIO
+import hashlib
+import json
 import os
+import tempfile
 
-def generate_admission_letter_pdf(application):
+# Bump when the letter layout or wording changes so cached letters are re-rendered
+LETTER_TEMPLATE_VERSION = 1
+
+LETTER_CACHE_DIR = 'admission_letters'
+
+@lru_cache(maxsize=None)
+def get_letter_styles():
     """
-    Generate a provisional admission letter PDF for an admitted applicant
+    Build the admission letter paragraph styles once per process
     """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
-
-    # Get styles
     styles = getSampleStyleSheet()
 
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        ),
+        'header': ParagraphStyle(
+            'CustomHeader',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            textColor=colors.darkred
+        ),
+        'body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=12,
+            alignment=TA_LEFT
+        ),
+    }
 
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        textColor=colors.darkred
-    )
+def build_admission_letter_context(application):
+    """
+    Collect the values printed on an admission letter as plain data
+    """
+    department = getattr(application.program, 'department', None)
+    letter_date = application.admission_decision_date or timezone.now()
 
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_LEFT
-    )
+    return {
+        'template_version': LETTER_TEMPLATE_VERSION,
+        'application_id': application.id,
+        'application_number': application.applicant.application_number,
+        'first_name': application.applicant.first_name,
+        'last_name': application.applicant.last_name,
+        'letter_date': letter_date.strftime("%B %d, %Y"),
+        'academic_year': application.admission_cycle.academic_year,
+        'program_name': application.program.name,
+        'department_name': department.name if department else None,
+        'admission_decision': application.admission_decision,
+        'first_semester_fee_amount': str(application.first_semester_fee_amount) if application.first_semester_fee_amount else None,
+        'first_semester_fee_paid': application.first_semester_fee_paid,
+    }
+
+def admission_letter_content_hash(context):
+    """
+    Hash of the letter context; a new hash means the letter must be re-rendered
+    """
+    payload = json.dumps(context, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+def render_admission_letter_pdf(context):
+    """
+    Render an admission letter from its context and return the PDF bytes
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
+
+    # Get styles
+    letter_styles = get_letter_styles()
+    title_style = letter_styles['title']
+    header_style = letter_styles['header']
+    body_style = letter_styles['body']
 
     # Build the document content
     story = []
@@ -59,11 +107,11 @@ def generate_admission_letter_pdf(application):
 
     # Application details table
     app_data = [
-        ["Application Number:", application.applicant.application_number],
-        ["Date:", timezone.now().strftime("%B %d, %Y")],
-        ["Academic Year:", application.admission_cycle.academic_year],
-        ["Program:", application.program.name],
-        ["Department:", application.program.department.name if hasattr(application.program, 'department') else "N/A"],
+        ["Application Number:", context['application_number']],
+        ["Date:", context['letter_date']],
+        ["Academic Year:", context['academic_year']],
+        ["Program:", context['program_name']],
+        ["Department:", context['department_name'] or "N/A"],
     ]
 
     app_table = Table(app_data, colWidths=[2*inch, 4*inch])
@@ -79,8 +127,8 @@ def generate_admission_letter_pdf(application):
 
     # Applicant information
     story.append(Paragraph("Dear Mr./Ms. {} {},".format(
-        application.applicant.first_name,
-        application.applicant.last_name
+        context['first_name'],
+        context['last_name']
     ), body_style))
 
     story.append(Spacer(1, 12))
@@ -96,23 +144,23 @@ def generate_admission_letter_pdf(application):
     3. Meeting all eligibility criteria
     4. Completion of the admission formalities within the specified deadline
     """.format(
-        application.program.name,
-        application.program.department.name if hasattr(application.program, 'department') else "University",
-        application.admission_cycle.academic_year
+        context['program_name'],
+        context['department_name'] or "University",
+        context['academic_year']
     )
 
     story.append(Paragraph(admission_text, body_style))
     story.append(Spacer(1, 16))
 
     # Fee information
-    if application.first_semester_fee_amount:
+    if context['first_semester_fee_amount']:
         fee_text = """
         <strong>First Semester Fee Details:</strong><br/>
         Amount: ₹{:,.2f}<br/>
         Status: {}
         """.format(
-            application.first_semester_fee_amount,
-            "PAID" if application.first_semester_fee_paid else "PENDING"
+            Decimal(context['first_semester_fee_amount']),
+            "PAID" if context['first_semester_fee_paid'] else "PENDING"
         )
         story.append(Paragraph(fee_text, body_style))
         story.append(Spacer(1, 16))
@@ -138,7 +186,7 @@ def generate_admission_letter_pdf(application):
         ["", ""],
         ["_________________________", "_________________________"],
         ["Admission Officer", "Registrar"],
-        ["Date: {}".format(timezone.now().strftime("%B %d, %Y")), "University ERP System"],
+        ["Date: {}".format(context['letter_date']), "University ERP System"],
     ]
 
     signature_table = Table(signature_data, colWidths=[3*inch, 3*inch])
@@ -153,8 +201,85 @@ def generate_admission_letter_pdf(application):
 
     # Build the PDF
     doc.build(story)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
+
+def generate_admission_letter_pdf(application):
+    """
+    Generate a provisional admission letter PDF for an admitted applicant
+    """
+    return BytesIO(render_admission_letter_pdf(build_admission_letter_context(application)))
+
+def admission_letter_cache_path(context, media_root=None):
+    """
+    Location of the cached letter for a context under MEDIA_ROOT
+    """
+    media_root = media_root or settings.MEDIA_ROOT
+    return os.path.join(
+        str(media_root),
+        LETTER_CACHE_DIR,
+        str(context['application_id']),
+        f"{admission_letter_content_hash(context)}.pdf"
+    )
+
+def write_admission_letter(context, path):
+    """
+    Render a letter to `path` atomically and drop older versions of it
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(render_admission_letter_pdf(context))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Letters rendered for an earlier decision or fee state are stale now
+    current = os.path.basename(path)
+    for name in os.listdir(directory):
+        if name != current and name.endswith('.pdf'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    return path
+
+def get_admission_letter_path(application):
+    """
+    Return the path of the cached admission letter, rendering it if needed.
+
+    Letters are keyed by a hash of their content, so a change to the
+    decision or fee fields produces a new file and the old one is removed.
+    """
+    context = build_admission_letter_context(application)
+    path = admission_letter_cache_path(context)
+    if not os.path.exists(path):
+        write_admission_letter(context, path)
+    return path
+
+@lru_cache(maxsize=None)
+def get_receipt_styles():
+    """
+    Build the fee receipt paragraph styles once per process
+    """
+    styles = getSampleStyleSheet()
+
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        ),
+        'normal': styles['Normal'],
+    }
 
 def generate_fee_receipt_pdf(application, payment_details):
     """
@@ -163,16 +288,8 @@ def generate_fee_receipt_pdf(application, payment_details):
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
 
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
+    receipt_styles = get_receipt_styles()
+    title_style = receipt_styles['title']
 
     story = []
 
@@ -205,7 +322,7 @@ def generate_fee_receipt_pdf(application, payment_details):
     story.append(receipt_table)
     story.append(Spacer(1, 30))
 
-    story.append(Paragraph("Thank you for your payment!", styles['Normal']))
+    story.append(Paragraph("Thank you for your payment!", receipt_styles['normal']))
 
     doc.build(story)
     buffer.seek(0)
@@ -0,0 +1,181 @@
+"""
+Applicant portal status cache utilities
+"""
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from university_erp.cache_utils import shared_cache_configured
+from .models import Applicant, Application
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'portal'
+
+# Application ids resolved to application numbers per query when invalidating in bulk
+INVALIDATION_BATCH_SIZE = 2000
+
+_local_entries = OrderedDict()  # application number -> (version, checked_at, entry), least recently used first
+_local_lock = threading.Lock()
+
+
+def _settings():
+    return (
+        getattr(settings, 'PORTAL_STATUS_CACHE_TIMEOUT', 3600),
+        getattr(settings, 'PORTAL_STATUS_LOCAL_TTL', 2),
+        getattr(settings, 'PORTAL_STATUS_LOCAL_SIZE', 10000),
+    )
+
+
+def _version_key(application_number):
+    return f"{CACHE_KEY_PREFIX}:{application_number}:version"
+
+
+def _entry_key(application_number):
+    return f"{CACHE_KEY_PREFIX}:{application_number}"
+
+
+def build_portal_status(application_number):
+    """
+    Read the portal status payload of an applicant from the database, or None if there is no such applicant
+    """
+    applicant = Applicant.objects.filter(application_number=application_number).values(
+        'id', 'first_name', 'last_name', 'email', 'application_number'
+    ).first()
+    if applicant is None:
+        return None
+
+    applications = Application.objects.filter(applicant_id=applicant['id']).order_by('id').values(
+        'id', 'program__name', 'admission_cycle__name', 'status', 'admission_decision',
+        'admission_decision_date', 'first_semester_fee_amount', 'first_semester_fee_paid',
+        'first_semester_fee_payment_date', 'admission_letter_generated'
+    )
+    return {
+        'applicant_name': f"{applicant['first_name']} {applicant['last_name']}",
+        'application_number': applicant['application_number'],
+        'email': applicant['email'],
+        'applications': [
+            {
+                'id': app['id'],
+                'program_name': app['program__name'],
+                'admission_cycle': app['admission_cycle__name'],
+                'application_status': app['status'],
+                'admission_decision': app['admission_decision'],
+                'admission_decision_date': app['admission_decision_date'],
+                'first_semester_fee_amount': app['first_semester_fee_amount'],
+                'first_semester_fee_paid': app['first_semester_fee_paid'],
+                'first_semester_fee_payment_date': app['first_semester_fee_payment_date'],
+                'admission_letter_generated': app['admission_letter_generated'],
+                'can_download_letter': app['admission_decision'] == 'admitted' and app['admission_letter_generated']
+            }
+            for app in applications
+        ]
+    }
+
+
+def _build_entry(application_number):
+    data = build_portal_status(application_number)
+    if data is None:
+        return None
+    # The ETag hashes the rendered body, so every process agrees on it and a rebuild with the same content keeps it
+    etag = '"{}"'.format(hashlib.sha1(JSONRenderer().render(data)).hexdigest())
+    return (etag, data)
+
+
+def get_portal_status(application_number):
+    """
+    Return (etag, payload) of an applicant's portal status, or (None, None) if there is no such applicant.
+
+    Entries live in the shared cache under a per-applicant version that
+    invalidate_portal_status() replaces on commit; an entry built from an
+    older version is never served. Each process also keeps recent entries
+    for PORTAL_STATUS_LOCAL_TTL seconds, so polls within that window
+    (including If-None-Match revalidations) touch neither the shared cache
+    nor the database. Without Redis/Memcached (see shared_cache_configured)
+    only the per-process entries are kept. Unknown application numbers are
+    never cached, so guessed numbers cannot push real entries out.
+    """
+    timeout, local_ttl, local_size = _settings()
+    now = time.monotonic()
+    with _local_lock:
+        local = _local_entries.get(application_number)
+        if local is not None and now - local[1] < local_ttl:
+            _local_entries.move_to_end(application_number)
+            return local[2]
+
+    if not shared_cache_configured():
+        version, entry = None, _build_entry(application_number)
+    else:
+        version_key = _version_key(application_number)
+        entry_key = _entry_key(application_number)
+        try:
+            cached = cache.get_many([version_key, entry_key])
+            version = cached.get(version_key)
+            stored = cached.get(entry_key)
+            if version is not None and stored is not None and stored[0] == version:
+                entry = stored[1]
+            else:
+                entry = _build_entry(application_number)
+                if entry is not None and version is None:
+                    # Only an applicant that exists gets a version key; if a change committed while the entry
+                    # was built already created one, the entry may predate it and is not shared
+                    new_version = uuid.uuid4().hex
+                    version = new_version if cache.add(version_key, new_version, timeout=None) else None
+                if entry is not None and version is not None:
+                    # Built under the version read above: a change committed meanwhile bumps it and orphans this entry
+                    cache.set(entry_key, (version, entry), timeout)
+        except Exception as e:
+            # The shared cache being down must not take the portal with it
+            logger.warning(f"Portal status cache unavailable for {application_number}: {str(e)}")
+            version, entry = None, _build_entry(application_number)
+
+    if entry is None:
+        return (None, None)
+    with _local_lock:
+        _local_entries[application_number] = (version, now, entry)
+        _local_entries.move_to_end(application_number)
+        while len(_local_entries) > local_size:
+            _local_entries.popitem(last=False)
+    return entry
+
+
+def invalidate_portal_status(application_numbers=(), applicant_ids=(), application_ids=()):
+    """
+    Expire the cached portal status of applicants when the open transaction commits.
+
+    Applicants can be given by application number, applicant id or the ids
+    of their applications; the latter two are resolved with one query per
+    INVALIDATION_BATCH_SIZE ids.
+    """
+    numbers = set(application_numbers)
+    applicant_ids = list(applicant_ids)
+    application_ids = list(application_ids)
+    for start in range(0, len(applicant_ids), INVALIDATION_BATCH_SIZE):
+        numbers.update(Applicant.objects.filter(
+            id__in=applicant_ids[start:start + INVALIDATION_BATCH_SIZE]
+        ).values_list('application_number', flat=True))
+    for start in range(0, len(application_ids), INVALIDATION_BATCH_SIZE):
+        numbers.update(Application.objects.filter(
+            id__in=application_ids[start:start + INVALIDATION_BATCH_SIZE]
+        ).values_list('applicant__application_number', flat=True))
+    if not numbers:
+        return
+
+    def bump_versions():
+        with _local_lock:
+            for application_number in numbers:
+                _local_entries.pop(application_number, None)
+        if not shared_cache_configured():
+            return
+        try:
+            cache.set_many({_version_key(number): uuid.uuid4().hex for number in numbers}, timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate portal status cache for {len(numbers)} applicants: {str(e)}")
+
+    transaction.on_commit(bump_versions)
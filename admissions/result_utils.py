@@ -0,0 +1,263 @@
+"""
+Admission test result import and ranking utilities for OMR/CSV result files
+"""
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from django.db import connection, transaction
+from django.utils import timezone
+from university_erp.db_utils import bulk_update_values
+from .models import AdmissionTest, Application, TestRegistration, TestResult
+
+RESULT_CHUNK_SIZE = 5000
+
+# Accepted header spellings of each column, after lowercasing and replacing spaces with underscores
+RESULT_COLUMNS = {
+    'admit_card_number': ('admit_card_number', 'admit_card', 'admit_card_no', 'roll_number', 'roll_no'),
+    'marks_obtained': ('marks_obtained', 'marks', 'score', 'total_marks_obtained'),
+    'grade': ('grade',),
+    'remarks': ('remarks', 'remark', 'comments'),
+}
+REQUIRED_COLUMNS = ('admit_card_number', 'marks_obtained')
+
+# OMR exports mark candidates who did not sit the test with one of these instead of marks
+ABSENT_MARKERS = ('ab', 'abs', 'absent', 'a')
+
+# Validation errors kept in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+def _open_result_file(result_file):
+    """
+    Text stream over a path, a binary upload or a text stream, with the CSV dialect sniffed from its head
+    """
+    if isinstance(result_file, str):
+        stream = open(result_file, encoding='utf-8-sig', newline='')
+    elif isinstance(result_file, io.TextIOBase):
+        stream = result_file
+    else:
+        stream = io.TextIOWrapper(result_file, encoding='utf-8-sig', newline='')
+
+    sample = stream.read(8192)
+    stream.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t|')
+    except csv.Error:
+        dialect = csv.excel
+    return stream, dialect
+
+
+def _column_map(header):
+    normalized = [str(name or '').strip().lower().replace(' ', '_') for name in header]
+    columns = {}
+    for column, aliases in RESULT_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[column] = normalized.index(alias)
+                break
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"Result file is missing the column(s): {', '.join(missing)}")
+    return columns
+
+
+def _read_chunks(reader, columns, chunk_size):
+    chunk = []
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue
+        chunk.append((reader.line_num, {
+            column: row[index].strip() if index < len(row) else ''
+            for column, index in columns.items()
+        }))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_marks(value, total_marks):
+    if value.lower() in ABSENT_MARKERS:
+        return None
+    try:
+        marks = Decimal(value)
+        if not marks.is_finite():
+            raise ValueError
+        marks = marks.quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid marks '{value}'")
+    if marks < 0 or marks > total_marks:
+        raise ValueError(f"Marks {marks} outside 0-{total_marks}")
+    return marks
+
+
+def _percentage(marks, total_marks):
+    return (marks * 100 / total_marks).quantize(Decimal('0.01')) if total_marks else Decimal('0.00')
+
+
+def import_test_results(result_file, test=None, publish=False, strict=False, chunk_size=RESULT_CHUNK_SIZE):
+    """
+    Load an OMR/CSV result file into TestResult, then rank the tests it touched.
+
+    Rows are keyed by admit card number and streamed in chunks: each chunk
+    resolves its registrations with one query, is validated (known admit
+    card, of `test` when given, marks within the test's total, no repeats
+    in the file) and upserted with bulk_create. Candidates marked absent
+    get no result, are flagged as not appeared and lose any entrance exam
+    score and rank copied to their application. With `publish`, results
+    are stamped with the publication date. With `strict`, any invalid row
+    aborts the whole import; otherwise invalid rows are reported and
+    skipped. Returns a summary with the rejected rows.
+    """
+    stream, dialect = _open_result_file(result_file)
+    reader = csv.reader(stream, dialect)
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise ValueError('Result file is empty')
+    columns = _column_map(header)
+
+    summary = {'rows': 0, 'imported': 0, 'absent': 0, 'rejected': 0, 'tests': {}}
+    errors = []
+    seen = set()
+    test_ids = set()
+    now = timezone.now()
+
+    update_fields = ['marks_obtained', 'percentage', 'grade', 'remarks']
+    if publish:
+        update_fields.append('result_published_date')
+    upsert_options = {'update_conflicts': True, 'update_fields': update_fields}
+    # MySQL's ON DUPLICATE KEY UPDATE cannot name the conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        upsert_options['unique_fields'] = ['test_registration']
+
+    def reject(line_number, admit_card_number, message):
+        summary['rejected'] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'line': line_number, 'admit_card_number': admit_card_number, 'error': message})
+
+    with transaction.atomic():
+        for chunk in _read_chunks(reader, columns, chunk_size):
+            summary['rows'] += len(chunk)
+            registrations = {
+                row[0]: row[1:]
+                for row in TestRegistration.objects.filter(
+                    admit_card_number__in={values['admit_card_number'] for _, values in chunk}
+                ).values_list('admit_card_number', 'id', 'test_id', 'test__total_marks')
+            }
+
+            results = []
+            appeared = []
+            absent = []
+            for line_number, values in chunk:
+                admit_card_number = values['admit_card_number']
+                registration = registrations.get(admit_card_number)
+                if not admit_card_number:
+                    reject(line_number, admit_card_number, 'Admit card number is missing')
+                    continue
+                if registration is None:
+                    reject(line_number, admit_card_number, 'Unknown admit card number')
+                    continue
+                registration_id, test_id, total_marks = registration
+                if test is not None and test_id != test.id:
+                    reject(line_number, admit_card_number, f"Admit card is registered for another test ({test_id})")
+                    continue
+                if admit_card_number in seen:
+                    reject(line_number, admit_card_number, 'Admit card number is repeated in the file')
+                    continue
+                try:
+                    marks = _parse_marks(values['marks_obtained'], total_marks)
+                except ValueError as e:
+                    reject(line_number, admit_card_number, str(e))
+                    continue
+
+                seen.add(admit_card_number)
+                test_ids.add(test_id)
+                if marks is None:
+                    absent.append(registration_id)
+                    continue
+                appeared.append(registration_id)
+                results.append(TestResult(
+                    test_registration_id=registration_id,
+                    marks_obtained=marks,
+                    percentage=_percentage(marks, total_marks),
+                    grade=values.get('grade', '')[:5],
+                    remarks=values.get('remarks', ''),
+                    result_published_date=now if publish else None,
+                ))
+
+            TestResult.objects.bulk_create(results, batch_size=1000, **upsert_options)
+            TestRegistration.objects.filter(id__in=appeared, is_appeared=False).update(is_appeared=True)
+            if absent:
+                TestResult.objects.filter(test_registration_id__in=absent).delete()
+                TestRegistration.objects.filter(id__in=absent, is_appeared=True).update(is_appeared=False)
+                # Ranking only visits results, so a candidate re-imported as absent keeps no stale merit score
+                Application.objects.filter(
+                    test_registrations__id__in=absent, test_registrations__test__test_type='entrance_exam'
+                ).exclude(
+                    entrance_exam_score__isnull=True, entrance_exam_rank__isnull=True
+                ).update(entrance_exam_score=None, entrance_exam_rank=None, updated_at=now)
+            summary['imported'] += len(results)
+            summary['absent'] += len(absent)
+
+        if strict and summary['rejected']:
+            raise ValueError(
+                f"{summary['rejected']} invalid row(s) in the result file; nothing was imported "
+                f"(first: line {errors[0]['line']}: {errors[0]['error']})"
+            )
+
+        for admission_test in AdmissionTest.objects.filter(id__in=test_ids).order_by('id'):
+            summary['tests'][admission_test.test_name] = rank_test_results(admission_test)
+
+    summary['errors'] = errors
+    return summary
+
+
+def rank_test_results(admission_test):
+    """
+    Dense-rank every result of a test by marks (equal marks share a rank) in one ordered read.
+
+    Ranks that changed are written back, and for entrance exams the marks
+    and rank are copied to Application.entrance_exam_score/entrance_exam_rank
+    for the merit list. Returns counts.
+    """
+    rows = TestResult.objects.filter(test_registration__test=admission_test).order_by(
+        '-marks_obtained'
+    ).values_list(
+        'id', 'marks_obtained', 'rank', 'test_registration__application_id',
+        'test_registration__application__entrance_exam_score',
+        'test_registration__application__entrance_exam_rank',
+    )
+
+    ranked_results = []
+    ranked_applications = []
+    count = rank = 0
+    previous_marks = None
+    for result_id, marks, stored_rank, application_id, stored_score, stored_application_rank in rows.iterator(
+        chunk_size=RESULT_CHUNK_SIZE
+    ):
+        count += 1
+        if marks != previous_marks:
+            rank += 1
+            previous_marks = marks
+        if rank != stored_rank:
+            ranked_results.append((result_id, rank))
+        if (marks, rank) != (stored_score, stored_application_rank):
+            ranked_applications.append((application_id, marks, rank))
+
+    bulk_update_values(TestResult, ('rank',), ranked_results)
+    if admission_test.test_type == 'entrance_exam':
+        now = timezone.now()
+        bulk_update_values(
+            Application, ('entrance_exam_score', 'entrance_exam_rank', 'updated_at'),
+            [row + (now,) for row in ranked_applications]
+        )
+    else:
+        ranked_applications = []
+
+    return {
+        'results': count,
+        'ranks_updated': len(ranked_results),
+        'applications_updated': len(ranked_applications),
+    }
@@ -0,0 +1,82 @@
+from rest_framework import serializers
+from .models import (
+    AdmissionCycle, Applicant, Application, ApplicationDocument,
+    AdmissionTest, TestResult
+)
+
+class AdmissionCycleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AdmissionCycle
+        fields = [
+            'id', 'name', 'academic_year', 'application_start_date', 'application_end_date',
+            'entrance_exam_date', 'interview_start_date', 'interview_end_date',
+            'result_announcement_date', 'admission_confirmation_deadline', 'session_start_date',
+            'is_active', 'created_at'
+        ]
+
+class ApplicantSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Applicant
+        fields = [
+            'id', 'application_number', 'first_name', 'last_name', 'email', 'phone_number',
+            'date_of_birth', 'gender', 'nationality', 'category', 'address_line1', 'address_line2',
+            'city', 'state', 'pincode', 'country', 'guardian_name', 'guardian_relation',
+            'guardian_phone', 'guardian_email', 'guardian_occupation', 'guardian_annual_income',
+            'profile_photo', 'is_active', 'created_at', 'updated_at'
+        ]
+
+class ApplicationSerializer(serializers.ModelSerializer):
+    applicant_name = serializers.CharField(read_only=True)
+    program_name = serializers.CharField(read_only=True)
+    admission_cycle_name = serializers.CharField(read_only=True)
+    fee_payment_status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'status', 'application_date', 'submission_date', 'application_fee_paid',
+            'application_fee_amount', 'payment_reference', 'admission_decision',
+            'admission_decision_date', 'admission_letter_generated',
+            'admission_letter_generated_date', 'first_semester_fee_amount',
+            'first_semester_fee_paid', 'first_semester_fee_payment_date',
+            'first_semester_fee_transaction_id', 'previous_school_name', 'previous_school_board',
+            'graduation_year', 'overall_percentage', 'entrance_exam_score', 'entrance_exam_rank',
+            'interview_date', 'interview_score', 'interview_feedback', 'merit_score', 'merit_rank',
+            'waitlist_number', 'preference_order', 'allocated_category', 'allocation_round', 'statement_of_purpose', 'extracurricular_activities',
+            'work_experience', 'review_date', 'review_comments', 'created_at', 'updated_at',
+            'applicant', 'admission_cycle', 'program', 'admission_decision_by', 'reviewed_by',
+            'applicant_name', 'program_name', 'admission_cycle_name', 'fee_payment_status'
+        ]
+
+    def get_fee_payment_status(self, obj):
+        return {
+            'first_semester_fee_paid': obj.first_semester_fee_paid,
+            'first_semester_fee_amount': obj.first_semester_fee_amount,
+            'first_semester_fee_payment_date': obj.first_semester_fee_payment_date
+        }
+
+class ApplicationDocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationDocument
+        fields = [
+            'id', 'document_type', 'document_file', 'document_name', 'is_mandatory',
+            'verification_status', 'verification_date', 'verification_comments', 'uploaded_at',
+            'application', 'verified_by'
+        ]
+
+class AdmissionTestSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AdmissionTest
+        fields = [
+            'id', 'test_type', 'test_name', 'test_date', 'start_time', 'end_time',
+            'duration_minutes', 'total_marks', 'venue', 'instructions', 'syllabus', 'is_active',
+            'created_at', 'admission_cycle', 'program'
+        ]
+
+class TestResultSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TestResult
+        fields = [
+            'id', 'marks_obtained', 'percentage', 'rank', 'grade', 'remarks',
+            'result_published_date', 'created_at', 'test_registration'
+        ]
@@ -0,0 +1,17 @@
+"""
+Signal handlers that expire the cached applicant portal status
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Applicant, Application
+from .portal_utils import invalidate_portal_status
+
+
+@receiver([post_save, post_delete], sender=Applicant)
+def applicant_changed(sender, instance, **kwargs):
+    invalidate_portal_status(application_numbers=[instance.application_number])
+
+
+@receiver([post_save, post_delete], sender=Application)
+def application_changed(sender, instance, **kwargs):
+    invalidate_portal_status(applicant_ids=[instance.applicant_id])
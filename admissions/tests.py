@@ -1,3 +1,257 @@
+import random
+from datetime import date
+from decimal import Decimal
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from students.models import Department, Program
+from .allocation_utils import OPEN_SEATS, SeatMatrix, run_seat_allocation
+from .merit_utils import RESERVED_CATEGORIES
+from .models import AdmissionCycle, AdmissionRequirement, Applicant, Application
 
-# Create your tests here.
+CATEGORIES = ('general', 'general', 'general', 'sc', 'st', 'obc')
+
+
+def random_market(rng, applicants, programs):
+    """
+    SeatMatrix input of a random market: (applications, preferences, capacities)
+    """
+    applications = {}
+    preferences = {}
+    ranks = {program_id: list(range(1, applicants + 1)) for program_id in range(programs)}
+    for ranked in ranks.values():
+        rng.shuffle(ranked)
+    application_id = 0
+    for applicant_id in range(applicants):
+        category = rng.choice(CATEGORIES)
+        preferences[applicant_id] = []
+        for program_id in rng.sample(range(programs), rng.randint(1, programs)):
+            application_id += 1
+            applications[application_id] = (applicant_id, program_id, ranks[program_id][applicant_id], category)
+            preferences[applicant_id].append(application_id)
+    capacities = {}
+    for program_id in range(programs):
+        capacities[(program_id, OPEN_SEATS)] = rng.randint(0, 3)
+        for category in RESERVED_CATEGORIES:
+            capacities[(program_id, category)] = rng.randint(0, 1)
+    return applications, preferences, capacities
+
+
+class SeatMatrixTests(TestCase):
+    def assertStable(self, matrix):
+        for key, heap in matrix.buckets.items():
+            self.assertLessEqual(len(heap), matrix.capacities.get(key, 0))
+        for applicant_id, application_ids in matrix.preferences.items():
+            held_id = matrix.held.get(applicant_id)
+            for application_id in application_ids:
+                if application_id == held_id:
+                    break
+                _, program_id, rank, category = matrix.applications[application_id]
+                keys = [(program_id, OPEN_SEATS)]
+                if category in RESERVED_CATEGORIES:
+                    keys.append((program_id, category))
+                for key in keys:
+                    heap = matrix.buckets[key]
+                    would_take = len(heap) < matrix.capacities.get(key, 0) or (heap and -heap[0][0] > rank)
+                    self.assertFalse(would_take, f"Applicant {applicant_id} blocks with {key}")
+
+    def test_random_markets_are_stable(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            applications, preferences, capacities = random_market(rng, rng.randint(1, 12), rng.randint(1, 4))
+            matrix = SeatMatrix(applications, preferences, capacities)
+            matrix.solve(applicant_ids=preferences)
+            self.assertStable(matrix)
+
+    def test_withdrawals_never_move_remaining_applicants_down(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            applications, preferences, capacities = random_market(rng, rng.randint(2, 12), rng.randint(1, 4))
+            before = SeatMatrix(applications, preferences, dict(capacities))
+            before.solve(applicant_ids=preferences)
+
+            withdrawn = set(rng.sample(sorted(preferences), rng.randint(1, len(preferences) - 1)))
+            remaining = {
+                applicant_id: application_ids
+                for applicant_id, application_ids in preferences.items()
+                if applicant_id not in withdrawn
+            }
+            after = SeatMatrix(
+                {application_id: row for application_id, row in applications.items() if row[0] not in withdrawn},
+                remaining,
+                dict(capacities),
+            )
+            after.solve(applicant_ids=remaining)
+            self.assertStable(after)
+            for applicant_id in remaining:
+                if applicant_id in before.held:
+                    self.assertIn(applicant_id, after.held)
+                    self.assertLessEqual(
+                        after.position[after.held[applicant_id]], before.position[before.held[applicant_id]]
+                    )
+
+
+class SeatAllocationRerunTests(TestCase):
+    def setUp(self):
+        department = Department.objects.create(name='CS', code='CS', established_date=date(2000, 1, 1))
+        self.cycle = AdmissionCycle.objects.create(
+            name='Fall', academic_year='2025-2026', application_start_date=date(2025, 1, 1),
+            application_end_date=date(2025, 3, 1), session_start_date=date(2025, 8, 1)
+        )
+        self.programs = [
+            Program.objects.create(
+                name=f'Program {index}', code=f'P{index}', program_type='undergraduate', department=department,
+                duration_years=4, total_credits=160, fees_per_semester=Decimal('50000')
+            )
+            for index in range(3)
+        ]
+        for program, seats in zip(self.programs, (6, 8, 5)):
+            AdmissionRequirement.objects.create(
+                program=program, admission_cycle=self.cycle, minimum_percentage=40, application_fee=100,
+                total_seats=seats, reserved_seats_sc=1, reserved_seats_st=1, reserved_seats_obc=1
+            )
+
+    def make_market(self, rng, applicants):
+        for index in range(applicants):
+            applicant = Applicant.objects.create(
+                application_number=f'APP{index:05d}', first_name='F', last_name='L', email=f'a{index}@x.com',
+                phone_number='1', date_of_birth=date(2005, 1, 1), gender='male', category=rng.choice(CATEGORIES),
+                address_line1='x', city='c', state='s', pincode='1', guardian_name='g', guardian_relation='f',
+                guardian_phone='1'
+            )
+            for preference, program in enumerate(rng.sample(self.programs, rng.randint(1, 3)), 1):
+                Application.objects.create(
+                    applicant=applicant, admission_cycle=self.cycle, program=program, status='submitted',
+                    previous_school_name='s', previous_school_board='b', graduation_year=2024,
+                    overall_percentage=Decimal(60), preference_order=preference
+                )
+        for program in self.programs:
+            application_ids = list(Application.objects.filter(program=program).values_list('id', flat=True))
+            rng.shuffle(application_ids)
+            for rank, application_id in enumerate(application_ids, 1):
+                Application.objects.filter(id=application_id).update(merit_rank=rank)
+
+    def outcome(self):
+        return {
+            application_id: (status, category)
+            for application_id, status, category in Application.objects.values_list(
+                'id', 'status', 'allocated_category'
+            )
+        }
+
+    def test_rerun_after_withdrawals_matches_a_fresh_run(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                Applicant.objects.all().delete()
+                rng = random.Random(seed)
+                self.make_market(rng, 40)
+                run_seat_allocation(self.cycle)
+
+                admitted = list(Application.objects.filter(status='admitted').values_list('id', flat=True))
+                Application.objects.filter(id__in=rng.sample(admitted, 6)).update(status='cancelled')
+                rerun = run_seat_allocation(self.cycle)
+                after_rerun = self.outcome()
+
+                Application.objects.exclude(status='cancelled').update(
+                    status='submitted', admission_decision='pending', allocated_category='', allocation_round=None
+                )
+                run_seat_allocation(self.cycle)
+                self.assertEqual(self.outcome(), after_rerun)
+                self.assertEqual(run_seat_allocation(self.cycle)['updated'], 0)
+                self.assertLess(rerun['updated'], Application.objects.count())
+
+    def test_paid_seats_are_kept(self):
+        self.make_market(random.Random(3), 40)
+        run_seat_allocation(self.cycle)
+        paid = list(Application.objects.filter(status='admitted').values_list('id', 'allocated_category')[:5])
+        Application.objects.filter(id__in=[application_id for application_id, _ in paid]).update(
+            first_semester_fee_paid=True
+        )
+        run_seat_allocation(self.cycle)
+        self.assertEqual(
+            set(Application.objects.filter(first_semester_fee_paid=True).values_list('id', 'allocated_category')),
+            set(paid),
+        )
+
+
+class ApplicationListQueryTests(TestCase):
+    # Query parameter -> Application field it filters
+    FILTER_FIELDS = {
+        'program': 'program_id', 'cycle': 'admission_cycle_id', 'status': 'status', 'decision': 'admission_decision',
+    }
+
+    def setUp(self):
+        department = Department.objects.create(name='CS', code='CS', established_date=date(2000, 1, 1))
+        self.cycles = [
+            AdmissionCycle.objects.create(
+                name=f'Fall {year}', academic_year=f'{year}-{year + 1}', application_start_date=date(year, 1, 1),
+                application_end_date=date(year, 3, 1), session_start_date=date(year, 8, 1)
+            )
+            for year in (2024, 2025)
+        ]
+        self.programs = [
+            Program.objects.create(
+                name=f'Program {index}', code=f'P{index}', program_type='undergraduate', department=department,
+                duration_years=4, total_credits=160, fees_per_semester=Decimal('50000')
+            )
+            for index in range(2)
+        ]
+        applicants = Applicant.objects.bulk_create([
+            Applicant(
+                application_number=f'APP{index:05d}', first_name=f'F{index}', last_name='L',
+                email=f'a{index}@x.com', phone_number='1', date_of_birth=date(2005, 1, 1), gender='male',
+                category='general', address_line1='x', city='c', state='s', pincode='1', guardian_name='g',
+                guardian_relation='f', guardian_phone='1'
+            )
+            for index in range(60)
+        ])
+        Application.objects.bulk_create([
+            Application(
+                applicant=applicant, admission_cycle=self.cycles[index % 2], program=self.programs[index % 3 % 2],
+                status=('submitted', 'admitted', 'rejected')[index % 3],
+                admission_decision=('pending', 'admitted', 'not_admitted')[index % 3],
+                previous_school_name='s', previous_school_board='b', graduation_year=2024,
+                overall_percentage=Decimal(60)
+            )
+            for index, applicant in enumerate(applicants)
+        ])
+        self.names = {
+            application_id: f'{first_name} {last_name}'
+            for application_id, first_name, last_name in Application.objects.values_list(
+                'id', 'applicant__first_name', 'applicant__last_name'
+            )
+        }
+        self.client = APIClient()
+        self.url = reverse('application-list-create')
+
+    def test_page_costs_one_query_at_any_page_size(self):
+        filters = [
+            {},
+            {'program': self.programs[0].id},
+            {'cycle': self.cycles[1].id, 'status': 'submitted'},
+            {'decision': 'admitted', 'program': self.programs[1].id},
+        ]
+        for params in filters:
+            expected = Application.objects.filter(
+                **{self.FILTER_FIELDS[name]: value for name, value in params.items()}
+            ).count()
+            for page_size in (1, 7, 20, 500):
+                with self.subTest(params=params, page_size=page_size):
+                    with self.assertNumQueries(1):
+                        response = self.client.get(self.url, {**params, 'page_size': page_size})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(len(response.data['results']), min(page_size, expected))
+                    for row in response.data['results']:
+                        self.assertEqual(row['applicant_name'], self.names[row['id']])
+
+    def test_following_pages_cost_one_query(self):
+        seen = []
+        response = self.client.get(self.url, {'page_size': 7, 'status': 'rejected'})
+        seen.extend(row['id'] for row in response.data['results'])
+        while response.data['next']:
+            with self.assertNumQueries(1):
+                response = self.client.get(response.data['next'])
+            seen.extend(row['id'] for row in response.data['results'])
+        self.assertEqual(seen, list(
+            Application.objects.filter(status='rejected').order_by('-id').values_list('id', flat=True)
+        ))
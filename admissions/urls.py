@@ -7,6 +7,8 @@ urlpatterns = [
 
     # Admission Cycle URLs
     path('cycles/', views.AdmissionCycleListView.as_view(), name='admission-cycle-list'),
+    path('cycles/<int:cycle_id>/allocate-seats/', views.allocate_cycle_seats, name='allocate-cycle-seats'),
+    path('cycles/<int:cycle_id>/admission-letters/', views.download_cycle_admission_letters, name='download-cycle-admission-letters'),
 
     # Applicant URLs
     path('applicants/', views.ApplicantListCreateView.as_view(), name='applicant-list-create'),
@@ -18,10 +20,13 @@ urlpatterns = [
     # Admission Decision Management URLs
     path('applications/<int:application_id>/admit/', views.admit_applicant, name='admit-applicant'),
     path('applications/<int:application_id>/reject/', views.reject_applicant, name='reject-applicant'),
+    path('applications/bulk-decision/', views.bulk_admission_decision, name='bulk-admission-decision'),
+    path('applications/merit-list/', views.compute_merit_list, name='compute-merit-list'),
     path('applications/<int:application_id>/status/', views.check_admission_status, name='check-admission-status'),
 
     # Fee Payment URLs
     path('applications/<int:application_id>/pay-fee/', views.record_fee_payment, name='record-fee-payment'),
+    path('payments/callback/', views.payment_gateway_callback, name='payment-gateway-callback'),
 
     # PDF Generation URLs
     path('applications/<int:application_id>/admission-letter/', views.generate_admission_letter, name='generate-admission-letter'),
@@ -32,6 +37,7 @@ urlpatterns = [
     # Test URLs
     path('tests/', views.AdmissionTestListView.as_view(), name='admission-test-list'),
     path('test-results/', views.TestResultListView.as_view(), name='test-result-list'),
+    path('test-results/import/', views.import_test_result_file, name='import-test-results'),
 
     # Applicant Portal URLs
     path('portal/<str:application_number>/', views.applicant_portal_status, name='applicant-portal-status'),
@@ -1,15 +1,35 @@
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
-from django.http import HttpResponse
+from rest_framework.pagination import CursorPagination
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from django.utils import timezone
+from django.utils.http import parse_etags
 from django.shortcuts import get_object_or_404
+import json
 from .models import (
     AdmissionCycle, AdmissionRequirement, Applicant, Application,
-    ApplicationDocument, AdmissionTest, TestRegistration, TestResult, AdmissionFee
+    ApplicationDocument, AdmissionTest, TestRegistration, TestResult
 )
-from .pdf_utils import generate_admission_letter_pdf, generate_fee_receipt_pdf
-from .email_utils import send_admission_confirmation_email, send_rejection_email, send_fee_payment_confirmation_email
+from .serializers import (
+    AdmissionCycleSerializer, ApplicantSerializer, ApplicationSerializer,
+    ApplicationDocumentSerializer, AdmissionTestSerializer, TestResultSerializer
+)
+from students.models import Program
+from .pdf_utils import get_admission_letter_path, generate_fee_receipt_pdf
+from .email_utils import queue_admission_confirmation_email, queue_rejection_email
+from .decision_utils import CLOSED_STATUSES, apply_bulk_decisions
+from .merit_utils import compute_cycle_merit_lists
+from .allocation_utils import run_seat_allocation
+from .result_utils import import_test_results
+from .portal_utils import get_portal_status, invalidate_portal_status
+from .archive_utils import stream_cycle_letters_zip
+from .payment_utils import (
+    PaymentConflict, SUCCESSFUL_PAYMENT_STATUSES, record_admission_fee_payment, verify_gateway_signature
+)
+from university_erp.export_utils import StreamingExportMixin
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])  # Allow unauthenticated access to API root
@@ -24,13 +44,19 @@ def admissions_api_root(request):
         'public_endpoints': {
             'portal_status': '/api/admissions/portal/{application_number}/ - Check applicant portal status (No auth required)',
             'cycles': '/api/admissions/cycles/ - List admission cycles (No auth required)',
-            'applications': '/api/admissions/applications/ - List applications (No auth required)',
+            'applications': '/api/admissions/applications/ - List applications, filter with ?cycle=&program=&status=&decision= (No auth required)',
         },
         'protected_endpoints': {
             'admit_student': '/api/admissions/applications/{id}/admit/ - Admit an applicant (Auth required)',
             'reject_student': '/api/admissions/applications/{id}/reject/ - Reject an applicant (Auth required)',
-            'record_payment': '/api/admissions/applications/{id}/pay-fee/ - Record fee payment (Auth required)',
+            'bulk_decision': '/api/admissions/applications/bulk-decision/ - Apply decisions to a merit list (Auth required)',
+            'compute_merit_list': '/api/admissions/applications/merit-list/ - Compute merit scores, ranks and waitlists for a cycle (Auth required)',
+            'seat_allocation': '/api/admissions/cycles/{id}/allocate-seats/ - Run a counselling round over applicant preferences, again after withdrawals (Auth required)',
+            'import_test_results': '/api/admissions/test-results/import/ - Upload an OMR/CSV result file, ranks tests and fills entrance scores (Staff only)',
+            'record_payment': '/api/admissions/applications/{id}/pay-fee/ - Record fee payment, idempotent on transaction_id (Auth required)',
+            'payment_callback': '/api/admissions/payments/callback/ - Payment gateway webhook (HMAC X-Signature required)',
             'download_letter': '/api/admissions/applications/{id}/admission-letter/ - Download admission letter (Auth required)',
+            'download_cycle_letters': '/api/admissions/cycles/{id}/admission-letters/ - Stream a ZIP of all admission letters for a cycle (Staff only)',
         },
         'test_endpoints': {
             'check_kunal_status': '/api/admissions/portal/APP2025003/ - Check Kunal Tomar\'s admission status',
@@ -43,74 +69,64 @@ def admissions_api_root(request):
         }
     })
 
-class AdmissionCycleListView(generics.ListAPIView):
+class AdmissionCycleListView(StreamingExportMixin, generics.ListAPIView):
     queryset = AdmissionCycle.objects.all()
+    serializer_class = AdmissionCycleSerializer
     permission_classes = [permissions.AllowAny]  # Allow public access
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class AdmissionCycleSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = AdmissionCycle
-                fields = '__all__'
-        return AdmissionCycleSerializer
-
-class ApplicantListCreateView(generics.ListCreateAPIView):
+class ApplicantListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Applicant.objects.all()
+    serializer_class = ApplicantSerializer
     permission_classes = [permissions.AllowAny]  # Allow public access for viewing
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ApplicantSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Applicant
-                fields = '__all__'
-        return ApplicantSerializer
-
 class ApplicantDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Applicant.objects.all()
+    serializer_class = ApplicantSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]  # Read access for all, write for authenticated
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ApplicantSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Applicant
-                fields = '__all__'
-        return ApplicantSerializer
+class ApplicationCursorPagination(CursorPagination):
+    """Keyset pagination so deep pages of large cycles cost the same as the first"""
+    ordering = '-id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 500
 
-class ApplicationListCreateView(generics.ListCreateAPIView):
+class ApplicationListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Application.objects.all()
+    serializer_class = ApplicationSerializer
     permission_classes = [permissions.AllowAny]  # Allow public access for viewing
+    pagination_class = ApplicationCursorPagination
+
+    def get_queryset(self):
+        # Related names are joined/annotated in the main query so a page costs a constant number of queries
+        queryset = Application.objects.select_related(
+            'applicant', 'program', 'admission_cycle'
+        ).annotate(
+            applicant_name=Concat('applicant__first_name', Value(' '), 'applicant__last_name'),
+            program_name=F('program__name'),
+            admission_cycle_name=F('admission_cycle__name'),
+        )
+        cycle_id = self.request.query_params.get('cycle', None)
+        program_id = self.request.query_params.get('program', None)
+        status_filter = self.request.query_params.get('status', None)
+        decision = self.request.query_params.get('decision', None)
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ApplicationSerializer(serializers.ModelSerializer):
-            applicant_name = serializers.SerializerMethodField()
-            program_name = serializers.SerializerMethodField()
-            admission_cycle_name = serializers.SerializerMethodField()
-            fee_payment_status = serializers.SerializerMethodField()
-
-            class Meta:
-                model = Application
-                fields = '__all__'
-
-            def get_applicant_name(self, obj):
-                return f"{obj.applicant.first_name} {obj.applicant.last_name}"
+        if cycle_id:
+            queryset = queryset.filter(admission_cycle_id=cycle_id)
+        if program_id:
+            queryset = queryset.filter(program_id=program_id)
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        if decision:
+            queryset = queryset.filter(admission_decision=decision)
 
-            def get_program_name(self, obj):
-                return obj.program.name
+        return queryset
 
-            def get_admission_cycle_name(self, obj):
-                return obj.admission_cycle.name
+    def perform_create(self, serializer):
+        application = serializer.save()
+        # Reload through get_queryset so the response carries the annotated name columns
+        serializer.instance = self.get_queryset().get(pk=application.pk)
 
-            def get_fee_payment_status(self, obj):
-                return {
-                    'first_semester_fee_paid': obj.first_semester_fee_paid,
-                    'first_semester_fee_amount': obj.first_semester_fee_amount,
-                    'first_semester_fee_payment_date': obj.first_semester_fee_payment_date
-                }
-        return ApplicationSerializer
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -137,15 +153,15 @@ def admit_applicant(request, application_id):
         application.first_semester_fee_amount = fee_amount
         application.save()
 
-        # Send admission confirmation email
-        email_sent = send_admission_confirmation_email(application)
+        # Queue admission confirmation email for the outbox worker
+        email_queued = queue_admission_confirmation_email(application)
 
         return Response({
             'message': 'Applicant admitted successfully',
             'application_id': application.id,
             'admission_decision': application.admission_decision,
             'first_semester_fee_amount': application.first_semester_fee_amount,
-            'email_sent': email_sent
+            'email_queued': email_queued
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -170,14 +186,14 @@ def reject_applicant(request, application_id):
         application.admission_decision_by = request.user
         application.save()
 
-        # Send rejection email
-        email_sent = send_rejection_email(application)
+        # Queue rejection email for the outbox worker
+        email_queued = queue_rejection_email(application)
 
         return Response({
             'message': 'Applicant rejected successfully',
             'application_id': application.id,
             'admission_decision': application.admission_decision,
-            'email_sent': email_sent
+            'email_queued': email_queued
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -188,22 +204,113 @@ def reject_applicant(request, application_id):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def record_fee_payment(request, application_id):
+def bulk_admission_decision(request):
     """
-    Record first semester fee payment for an admitted student
+    Apply admitted/rejected/waitlisted decisions to a merit list in one transaction
     """
     try:
-        application = get_object_or_404(Application, id=application_id)
+        admission_cycle = None
+        program = None
+        if request.data.get('admission_cycle'):
+            admission_cycle = get_object_or_404(AdmissionCycle, id=request.data.get('admission_cycle'))
+        if request.data.get('program'):
+            program = get_object_or_404(Program, id=request.data.get('program'))
+
+        report = apply_bulk_decisions(
+            request.data.get('decisions') or [],
+            admission_cycle=admission_cycle,
+            program=program,
+            decided_by=request.user,
+            overwrite=str(request.data.get('overwrite', '')).lower() in ('1', 'true', 'yes'),
+            notify=str(request.data.get('notify', '')).lower() in ('1', 'true', 'yes'),
+        )
 
-        if application.admission_decision != 'admitted':
-            return Response(
-                {'error': 'Only admitted students can pay fees'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return Response({
+            'message': 'Bulk admission decisions applied successfully',
+            **report
+        }, status=status.HTTP_200_OK)
 
-        # Get payment details from request
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def compute_merit_list(request):
+    """
+    Compute merit scores, ranks and category waitlists for a cycle, optionally for one program
+    """
+    try:
+        if not request.data.get('admission_cycle'):
+            return Response({'error': 'admission_cycle is required'}, status=status.HTTP_400_BAD_REQUEST)
+        admission_cycle = get_object_or_404(AdmissionCycle, id=request.data.get('admission_cycle'))
+        program = None
+        if request.data.get('program'):
+            program = get_object_or_404(Program, id=request.data.get('program'))
+
+        programs = compute_cycle_merit_lists(admission_cycle, program=program)
+
+        return Response({
+            'message': 'Merit lists computed successfully',
+            'admission_cycle': admission_cycle.id,
+            'programs': programs
+        }, status=status.HTTP_200_OK)
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def allocate_cycle_seats(request, cycle_id):
+    """
+    Allocate the seats of a cycle across programs by applicant preference and merit rank
+    """
+    admission_cycle = get_object_or_404(AdmissionCycle, id=cycle_id)
+    try:
+        report = run_seat_allocation(
+            admission_cycle,
+            decided_by=request.user,
+            notify=str(request.data.get('notify', '')).lower() in ('1', 'true', 'yes'),
+        )
+
+        return Response({
+            'message': 'Seat allocation completed successfully',
+            'admission_cycle': admission_cycle.id,
+            **report
+        }, status=status.HTTP_200_OK)
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def record_fee_payment(request, application_id):
+    """
+    Record first semester fee payment for an admitted student.
+
+    Safe to retry: a transaction_id (or Idempotency-Key header) that is
+    already recorded returns the original payment with duplicate=true.
+    """
+    try:
         payment_amount = request.data.get('payment_amount')
-        transaction_id = request.data.get('transaction_id', '')
+        transaction_id = request.data.get('transaction_id') or request.headers.get('Idempotency-Key', '')
         payment_method = request.data.get('payment_method', 'Online')
 
         if not payment_amount:
@@ -212,43 +319,110 @@ def record_fee_payment(request, application_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Update payment status
-        application.first_semester_fee_paid = True
-        application.first_semester_fee_payment_date = timezone.now()
-        application.first_semester_fee_transaction_id = transaction_id
-        application.save()
+        fee, created, email_queued = record_admission_fee_payment(
+            application_id, payment_amount, transaction_id, payment_method
+        )
+
+        return Response({
+            'message': 'Fee payment recorded successfully' if created else 'Fee payment already recorded',
+            'application_id': fee.application_id,
+            'fee_paid': True,
+            'payment_date': fee.payment_date,
+            'transaction_id': fee.transaction_id,
+            'duplicate': not created,
+            'email_queued': email_queued
+        }, status=status.HTTP_200_OK)
 
-        # Create fee record
-        AdmissionFee.objects.create(
-            application=application,
-            fee_type='tuition_fee',
-            amount=payment_amount,
-            paid_amount=payment_amount,
-            payment_date=timezone.now(),
-            payment_method=payment_method,
-            transaction_id=transaction_id,
-            is_paid=True,
-            due_date=timezone.now().date()
+    except Application.DoesNotExist:
+        return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    except PaymentConflict as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-        # Send fee payment confirmation email
-        payment_details = {
-            'amount': float(payment_amount),
-            'transaction_id': transaction_id,
-            'payment_method': payment_method,
-            'payment_date': application.first_semester_fee_payment_date
-        }
-        email_sent = send_fee_payment_confirmation_email(application, payment_details)
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])  # Authenticated by the gateway's HMAC signature instead
+def payment_gateway_callback(request):
+    """
+    Payment gateway webhook for first semester fee payments.
+
+    The raw body must be signed with HMAC-SHA256 using
+    PAYMENT_GATEWAY_WEBHOOK_SECRET and the hex digest sent in the
+    X-Signature header. Only events with an explicit successful status are
+    recorded. The application is given by application_id, or by the
+    applicant's application_number when exactly one of their applications
+    is admitted. Gateways retry until they get a 2xx, so retries and
+    out-of-order duplicates are acknowledged with duplicate=true instead of
+    being recorded again.
+    """
+    payload = request.body
+    if not verify_gateway_signature(payload, request.headers.get('X-Signature', '')):
+        return Response({'error': 'Invalid signature'}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        event = json.loads(payload or b'{}')
+        if not isinstance(event, dict):
+            raise ValueError('Payload must be a JSON object')
+    except ValueError as e:
+        return Response({'error': f'Invalid payload: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    transaction_id = str(event.get('transaction_id') or '').strip()
+    if not transaction_id:
+        return Response({'error': 'transaction_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    payment_status = str(event.get('status') or '').strip().lower()
+    if not payment_status:
+        return Response({'error': 'status is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if payment_status not in SUCCESSFUL_PAYMENT_STATUSES:
+        return Response({'message': f'Ignored payment with status {payment_status}', 'recorded': False})
+
+    try:
+        application_id = event.get('application_id')
+        if not application_id and event.get('application_number'):
+            # The fee is paid against an admission; any other application of the applicant is not a candidate
+            admitted = list(Application.objects.filter(
+                applicant__application_number=event['application_number'], admission_decision='admitted'
+            ).exclude(status__in=CLOSED_STATUSES).values_list('id', flat=True)[:2])
+            if len(admitted) > 1:
+                return Response(
+                    {'error': 'Applicant has several admitted applications; application_id is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            application_id = admitted[0] if admitted else None
+        if not application_id:
+            return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        fee, created, email_queued = record_admission_fee_payment(
+            application_id, event.get('amount'), transaction_id, event.get('payment_method') or 'Online'
+        )
 
         return Response({
-            'message': 'Fee payment recorded successfully',
-            'application_id': application.id,
-            'fee_paid': application.first_semester_fee_paid,
-            'payment_date': application.first_semester_fee_payment_date,
-            'transaction_id': transaction_id,
-            'email_sent': email_sent
+            'message': 'Fee payment recorded successfully' if created else 'Fee payment already recorded',
+            'recorded': True,
+            'duplicate': not created,
+            'application_id': fee.application_id,
+            'transaction_id': fee.transaction_id,
+            'email_queued': email_queued
         }, status=status.HTTP_200_OK)
 
+    except Application.DoesNotExist:
+        return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    except PaymentConflict as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     except Exception as e:
         return Response(
             {'error': str(e)},
@@ -291,7 +465,10 @@ def generate_admission_letter(request, application_id):
     Generate and download provisional admission letter PDF
     """
     try:
-        application = get_object_or_404(Application, id=application_id)
+        application = get_object_or_404(
+            Application.objects.select_related('applicant', 'program__department', 'admission_cycle'),
+            id=application_id
+        )
 
         if application.admission_decision != 'admitted':
             return Response(
@@ -299,19 +476,24 @@ def generate_admission_letter(request, application_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Generate PDF
-        pdf_buffer = generate_admission_letter_pdf(application)
+        # Serve the cached PDF, rendering it only if this version is missing
+        letter_path = get_admission_letter_path(application)
 
-        # Update letter generation status
-        application.admission_letter_generated = True
-        application.admission_letter_generated_date = timezone.now()
-        application.save()
+        # Update letter generation status on first download only
+        if not application.admission_letter_generated:
+            Application.objects.filter(id=application.id, admission_letter_generated=False).update(
+                admission_letter_generated=True,
+                admission_letter_generated_date=timezone.now()
+            )
+            invalidate_portal_status(applicant_ids=[application.applicant_id])
 
         # Create HTTP response
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="admission_letter_{application.applicant.application_number}.pdf"'
-
-        return response
+        return FileResponse(
+            open(letter_path, 'rb'),
+            as_attachment=True,
+            filename=f"admission_letter_{application.applicant.application_number}.pdf",
+            content_type='application/pdf'
+        )
 
     except Exception as e:
         return Response(
@@ -320,38 +502,40 @@ def generate_admission_letter(request, application_id):
         )
 
 @api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])  # Bulk letter downloads are staff only
+def download_cycle_admission_letters(request, cycle_id):
+    """
+    Stream a ZIP of every admitted applicant's letter (and optionally fee receipts) for a cycle
+    """
+    admission_cycle = get_object_or_404(AdmissionCycle, id=cycle_id)
+    include_receipts = request.query_params.get('include_receipts', '').lower() in ('1', 'true', 'yes')
+
+    response = StreamingHttpResponse(
+        stream_cycle_letters_zip(admission_cycle, include_receipts=include_receipts),
+        content_type='application/zip'
+    )
+    response['Content-Disposition'] = f'attachment; filename="admission_letters_cycle_{admission_cycle.id}.zip"'
+    return response
+
+@api_view(['GET'])
+@authentication_classes([])  # Public, and authenticating would cost a session lookup per poll
 @permission_classes([permissions.AllowAny])  # Allow public access to portal status
 def applicant_portal_status(request, application_number):
     """
-    Get application status for applicant portal
+    Get application status for applicant portal, served from the portal status cache
     """
     try:
-        applicant = get_object_or_404(Applicant, application_number=application_number)
-        applications = Application.objects.filter(applicant=applicant).select_related('program', 'admission_cycle')
-
-        application_data = []
-        for app in applications:
-            app_data = {
-                'id': app.id,
-                'program_name': app.program.name,
-                'admission_cycle': app.admission_cycle.name,
-                'application_status': app.status,
-                'admission_decision': app.admission_decision,
-                'admission_decision_date': app.admission_decision_date,
-                'first_semester_fee_amount': app.first_semester_fee_amount,
-                'first_semester_fee_paid': app.first_semester_fee_paid,
-                'first_semester_fee_payment_date': app.first_semester_fee_payment_date,
-                'admission_letter_generated': app.admission_letter_generated,
-                'can_download_letter': app.admission_decision == 'admitted' and app.admission_letter_generated
-            }
-            application_data.append(app_data)
+        etag, data = get_portal_status(application_number)
+        if data is None:
+            return Response({'error': 'Applicant not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response({
-            'applicant_name': f"{applicant.first_name} {applicant.last_name}",
-            'application_number': applicant.application_number,
-            'email': applicant.email,
-            'applications': application_data
-        }, status=status.HTTP_200_OK)
+        # Ask clients to revalidate every poll; unchanged statuses cost a 304 without a body
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if '*' in if_none_match or etag in if_none_match or f'W/{etag}' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(data, status=status.HTTP_200_OK, headers=headers)
 
     except Exception as e:
         return Response(
@@ -359,38 +543,52 @@ def applicant_portal_status(request, application_number):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-class DocumentUploadView(generics.ListCreateAPIView):
+class DocumentUploadView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = ApplicationDocument.objects.all()
+    serializer_class = ApplicationDocumentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]  # Read access for all
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class DocumentSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = ApplicationDocument
-                fields = '__all__'
-        return DocumentSerializer
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def import_test_result_file(request):
+    """
+    Import an OMR/CSV test result file keyed by admit card number and rank the tests it covers
+    """
+    result_file = request.FILES.get('file')
+    if result_file is None:
+        return Response({'error': 'A result file is required in the "file" field'}, status=status.HTTP_400_BAD_REQUEST)
+    test = None
+    if request.data.get('test'):
+        test = get_object_or_404(AdmissionTest, id=request.data.get('test'))
+
+    try:
+        report = import_test_results(
+            result_file,
+            test=test,
+            publish=str(request.data.get('publish', '')).lower() in ('1', 'true', 'yes'),
+            strict=str(request.data.get('strict', '')).lower() in ('1', 'true', 'yes'),
+        )
+
+        return Response({
+            'message': 'Test results imported successfully',
+            **report
+        }, status=status.HTTP_200_OK)
 
-class AdmissionTestListView(generics.ListAPIView):
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+class AdmissionTestListView(StreamingExportMixin, generics.ListAPIView):
     queryset = AdmissionTest.objects.all()
+    serializer_class = AdmissionTestSerializer
     permission_classes = [permissions.AllowAny]  # Allow public access
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class AdmissionTestSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = AdmissionTest
-                fields = '__all__'
-        return AdmissionTestSerializer
-
-class TestResultListView(generics.ListAPIView):
+class TestResultListView(StreamingExportMixin, generics.ListAPIView):
     queryset = TestResult.objects.all()
+    serializer_class = TestResultSerializer
     permission_classes = [permissions.AllowAny]  # Allow public access
-
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class TestResultSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = TestResult
-                fields = '__all__'
-        return TestResultSerializer
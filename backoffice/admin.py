@@ -1,8 +1,9 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import (
     Employee, Payroll, FinanceAccount, Transaction, FeeStructure,
-    StudentFeePayment, Inventory
+    StudentFeePayment, Inventory, LedgerEntry, AccountBalance, StudentFeeBalance
 )
+from .ledger_utils import post_transaction
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
@@ -24,9 +25,35 @@ class FinanceAccountAdmin(admin.ModelAdmin):
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
-    list_display = ('transaction_id', 'transaction_type', 'amount', 'transaction_date', 'account', 'created_by')
-    list_filter = ('transaction_type', 'transaction_date', 'account__account_type')
+    list_display = ('transaction_id', 'transaction_type', 'amount', 'transaction_date', 'account', 'contra_account', 'is_posted', 'created_by')
+    list_filter = ('transaction_type', 'transaction_date', 'is_posted', 'account__account_type')
     search_fields = ('transaction_id', 'description', 'reference_number')
+    readonly_fields = ('is_posted', 'posted_at')
+    actions = ['post_to_ledger']
+
+    def post_to_ledger(self, request, queryset):
+        posted = failed = 0
+        for txn in queryset.filter(is_posted=False):
+            try:
+                post_transaction(txn)
+                posted += 1
+            except ValueError as e:
+                failed += 1
+                self.message_user(request, str(e), level=messages.WARNING)
+        self.message_user(request, f"{posted} transactions posted, {failed} failed.")
+    post_to_ledger.short_description = "Post selected transactions to the ledger"
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ('transaction', 'account', 'debit', 'credit', 'period')
+    list_filter = ('period', 'account__account_type')
+    search_fields = ('transaction__transaction_id', 'account__account_code')
+
+@admin.register(AccountBalance)
+class AccountBalanceAdmin(admin.ModelAdmin):
+    list_display = ('account', 'period', 'debit_total', 'credit_total', 'rollup_debit_total', 'rollup_credit_total')
+    list_filter = ('period', 'account__account_type')
+    search_fields = ('account__account_code', 'account__account_name')
 
 @admin.register(FeeStructure)
 class FeeStructureAdmin(admin.ModelAdmin):
@@ -40,6 +67,12 @@ class StudentFeePaymentAdmin(admin.ModelAdmin):
     list_filter = ('status', 'payment_method', 'payment_date')
     search_fields = ('student__student_id', 'receipt_number')
 
+@admin.register(StudentFeeBalance)
+class StudentFeeBalanceAdmin(admin.ModelAdmin):
+    list_display = ('student', 'total_due', 'total_paid', 'outstanding', 'overdue_amount', 'next_due_date', 'updated_at')
+    list_filter = ('next_due_date',)
+    search_fields = ('student__student_id', 'student__user__first_name', 'student__user__last_name')
+
 @admin.register(Inventory)
 class InventoryAdmin(admin.ModelAdmin):
     list_display = ('item_code', 'item_name', 'category', 'status', 'purchase_date', 'assigned_to')
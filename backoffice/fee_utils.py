@@ -0,0 +1,299 @@
+"""
+Fee ledger utilities for semester dues, late fees and outstanding balances
+"""
+from collections import defaultdict
+from decimal import Decimal
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (
+    Case, Count, DecimalField, Exists, ExpressionWrapper, F, Max, Min, OuterRef, Q, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
+from students.models import Student, Program
+from .models import FeeStructure, StudentFeePayment, StudentFeeBalance
+
+# Dues that still count towards what a student owes
+OPEN_DUE_STATUSES = ('pending', 'partial', 'overdue')
+
+BALANCE_FIELDS = (
+    'total_due', 'total_late_fees', 'total_paid', 'total_waived', 'outstanding',
+    'overdue_amount', 'open_dues', 'next_due_date',
+)
+
+ZERO = Decimal('0.00')
+
+# Primary-key range covered by each late-fee UPDATE, keeping row locks short during live payments
+SWEEP_BATCH_SIZE = 10000
+REMINDER_BATCH_SIZE = 2000
+
+
+def due_receipt_number(fee_structure_id, student_id):
+    """
+    Deterministic receipt number of a generated due, so generation is idempotent
+    """
+    return f"DUE-{fee_structure_id}-{student_id}"
+
+
+def generate_semester_dues(fee_structure, processed_by, students=None):
+    """
+    Create one pending StudentFeePayment due per student for a fee structure.
+
+    Defaults to the active students of the structure's program in its
+    semester. Students who already have a due for the structure are skipped,
+    so re-running is safe. Returns the number of dues created, recounted
+    after the insert: a due a concurrent run inserted first for the same
+    student is skipped by ignore_conflicts but still counted.
+    """
+    if students is None:
+        students = Student.objects.filter(
+            program_id=fee_structure.program_id,
+            current_semester=fee_structure.semester,
+            status='active'
+        )
+    student_ids = list(
+        students.exclude(
+            Exists(StudentFeePayment.objects.filter(student=OuterRef('pk'), fee_structure=fee_structure))
+        ).values_list('id', flat=True)
+    )
+    if not student_ids:
+        return 0
+
+    with transaction.atomic():
+        StudentFeePayment.objects.bulk_create([
+            StudentFeePayment(
+                student_id=student_id,
+                fee_structure=fee_structure,
+                receipt_number=due_receipt_number(fee_structure.id, student_id),
+                amount_due=fee_structure.total_fee,
+                status='pending',
+                processed_by=processed_by,
+            )
+            for student_id in student_ids
+        ], batch_size=1000, ignore_conflicts=True)
+        created = StudentFeePayment.objects.filter(fee_structure=fee_structure, student_id__in=student_ids).count()
+        refresh_fee_balances(student_ids=student_ids)
+
+    return created
+
+
+def generate_dues(processed_by, program_id=None, semester=None, academic_year=None):
+    """
+    Generate dues for every active fee structure matching the filters; returns counts per structure
+    """
+    fee_structures = FeeStructure.objects.filter(is_active=True).select_related('program')
+    if program_id:
+        fee_structures = fee_structures.filter(program_id=program_id)
+    if semester:
+        fee_structures = fee_structures.filter(semester=semester)
+    if academic_year:
+        fee_structures = fee_structures.filter(academic_year=academic_year)
+
+    return {
+        str(fee_structure): generate_semester_dues(fee_structure, processed_by)
+        for fee_structure in fee_structures
+    }
+
+
+def apply_late_fees(as_of=None, batch_size=SWEEP_BATCH_SIZE):
+    """
+    Mark unpaid dues past their due date overdue and apply late fees with set-based UPDATEs.
+
+    Fee structures past due are grouped by program and late_fee_penalty,
+    and each group is updated with one UPDATE per primary-key range, so no
+    model instances are loaded and row locks are held only briefly. A due
+    gets its structure's penalty percent of the amount still unpaid, once;
+    the status check sits in the WHERE clause, so a payment committed first
+    wins. Returns {program_id: dues marked overdue}.
+    """
+    as_of = as_of or timezone.localdate()
+    groups = defaultdict(list)
+    for fee_structure_id, program_id, penalty in FeeStructure.objects.filter(
+        due_date__lt=as_of
+    ).values_list('id', 'program_id', 'late_fee_penalty'):
+        groups[(program_id, penalty)].append(fee_structure_id)
+
+    marked = defaultdict(int)
+    for (program_id, penalty), fee_structure_ids in groups.items():
+        unpaid = StudentFeePayment.objects.filter(
+            fee_structure_id__in=fee_structure_ids, status__in=('pending', 'partial')
+        )
+        bounds = unpaid.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            continue
+
+        late_fee = Cast(
+            (F('amount_due') - F('amount_paid')) * Value(penalty) / Value(100),
+            output_field=DecimalField(max_digits=8, decimal_places=2)
+        )
+        for range_start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            marked[program_id] += unpaid.filter(
+                id__gte=range_start, id__lt=range_start + batch_size
+            ).update(
+                late_fee_applied=Case(When(late_fee_applied=0, then=late_fee), default=F('late_fee_applied')),
+                status='overdue',
+            )
+
+    return dict(marked)
+
+
+def build_fee_reminder_email(due):
+    """
+    Build the subject and body of an overdue fee reminder from a due's values
+    """
+    outstanding = due['amount_due'] + due['late_fee_applied'] - due['amount_paid']
+    subject = f"Fee Overdue - {due['fee_structure__academic_year']} Semester {due['fee_structure__semester']}"
+    body = (
+        f"Dear {due['student__user__first_name']} {due['student__user__last_name']},\n\n"
+        f"Your semester fee for {due['fee_structure__academic_year']} semester {due['fee_structure__semester']} "
+        f"was due on {due['fee_structure__due_date']:%B %d, %Y} and has not been paid in full.\n\n"
+        f"Student ID: {due['student__student_id']}\n"
+        f"Reference: {due['receipt_number']}\n"
+        f"Amount due: Rs. {due['amount_due']}\n"
+        f"Late fee: Rs. {due['late_fee_applied']}\n"
+        f"Amount paid: Rs. {due['amount_paid']}\n"
+        f"Outstanding: Rs. {outstanding}\n\n"
+        f"Please pay the outstanding amount at the earliest to avoid further action.\n\n"
+        f"Accounts Office"
+    )
+    return subject, body
+
+
+def queue_overdue_reminders(batch_size=REMINDER_BATCH_SIZE):
+    """
+    Queue one reminder email per overdue due that has not had one, and refresh the affected balances.
+
+    Dues are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED, so
+    concurrent sweeps never queue the same reminder twice and live payments
+    on other rows are not blocked. Returns {program_id: reminders queued}.
+    """
+    from admissions.models import OutboundEmail
+
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'accounts@university.edu')
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    queued = defaultdict(int)
+
+    while True:
+        with transaction.atomic():
+            due_ids = list(
+                StudentFeePayment.objects.select_for_update(skip_locked=True)
+                .filter(status='overdue', reminder_queued_at__isnull=True)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not due_ids:
+                break
+
+            dues = list(StudentFeePayment.objects.filter(id__in=due_ids).values(
+                'id', 'receipt_number', 'amount_due', 'amount_paid', 'late_fee_applied', 'student_id',
+                'student__student_id', 'student__program_id', 'student__user__email',
+                'student__user__first_name', 'student__user__last_name',
+                'fee_structure__academic_year', 'fee_structure__semester', 'fee_structure__due_date',
+            ))
+            emails = []
+            for due in dues:
+                if not due['student__user__email']:
+                    continue
+                subject, body = build_fee_reminder_email(due)
+                emails.append(OutboundEmail(
+                    email_type='fee_reminder',
+                    subject=subject,
+                    body=body,
+                    from_email=from_email,
+                    recipient=due['student__user__email'],
+                    max_attempts=max_attempts,
+                ))
+                queued[due['student__program_id']] += 1
+
+            OutboundEmail.objects.bulk_create(emails, batch_size=1000)
+            StudentFeePayment.objects.filter(id__in=due_ids).update(reminder_queued_at=timezone.now())
+            refresh_fee_balances(student_ids={due['student_id'] for due in dues})
+
+    return dict(queued)
+
+
+def sweep_overdue_fees(as_of=None, batch_size=SWEEP_BATCH_SIZE):
+    """
+    Run the overdue sweep: flip overdue dues, apply late fees and queue reminders.
+
+    Returns per-program counts keyed by program name.
+    """
+    marked = apply_late_fees(as_of=as_of, batch_size=batch_size)
+    queued = queue_overdue_reminders()
+
+    program_names = dict(
+        Program.objects.filter(id__in=set(marked) | set(queued)).values_list('id', 'name')
+    )
+    return {
+        program_names.get(program_id, str(program_id)): {
+            'marked_overdue': marked.get(program_id, 0),
+            'reminders_queued': queued.get(program_id, 0),
+        }
+        for program_id in sorted(set(marked) | set(queued))
+    }
+
+
+def _balance_aggregates():
+    money = DecimalField(max_digits=12, decimal_places=2)
+    open_dues = Q(status__in=OPEN_DUE_STATUSES)
+    unpaid = ExpressionWrapper(
+        Greatest(F('amount_due') + F('late_fee_applied') - F('amount_paid'), Value(ZERO)),
+        output_field=money
+    )
+    return {
+        'total_due': Coalesce(Sum('amount_due'), Value(ZERO), output_field=money),
+        'total_late_fees': Coalesce(Sum('late_fee_applied'), Value(ZERO), output_field=money),
+        'total_paid': Coalesce(Sum('amount_paid'), Value(ZERO), output_field=money),
+        'total_waived': Coalesce(Sum(unpaid, filter=Q(status='waived')), Value(ZERO), output_field=money),
+        'outstanding': Coalesce(Sum(unpaid, filter=open_dues), Value(ZERO), output_field=money),
+        'overdue_amount': Coalesce(Sum(unpaid, filter=Q(status='overdue')), Value(ZERO), output_field=money),
+        'open_dues': Count('id', filter=open_dues),
+        'next_due_date': Min('fee_structure__due_date', filter=open_dues),
+    }
+
+
+def refresh_fee_balances(student_ids=None):
+    """
+    Recompute the stored balances of the given students (all students if None) with one grouped aggregate.
+
+    Students without any dues get a zero balance row.
+    """
+    payments = StudentFeePayment.objects.all()
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        if not student_ids:
+            return 0
+        payments = payments.filter(student_id__in=student_ids)
+    else:
+        student_ids = list(Student.objects.values_list('id', flat=True))
+
+    totals = {
+        row['student_id']: row
+        for row in payments.values('student_id').annotate(**_balance_aggregates()).order_by()
+    }
+    balances = []
+    for student_id in student_ids:
+        row = totals.get(student_id, {})
+        balances.append(StudentFeeBalance(
+            student_id=student_id,
+            updated_at=timezone.now(),
+            **{field: row.get(field, 0 if field != 'next_due_date' else None) for field in BALANCE_FIELDS}
+        ))
+
+    upsert_options = {'update_conflicts': True, 'update_fields': list(BALANCE_FIELDS) + ['updated_at']}
+    # MySQL's ON DUPLICATE KEY UPDATE cannot name the conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        upsert_options['unique_fields'] = ['student']
+    StudentFeeBalance.objects.bulk_create(balances, batch_size=1000, **upsert_options)
+    return len(balances)
+
+
+def get_student_fee_balance(student_id):
+    """
+    Return a student's stored fee balance in one indexed read, building it on first use
+    """
+    balance = StudentFeeBalance.objects.filter(student_id=student_id).first()
+    if balance is None and Student.objects.filter(id=student_id).exists():
+        refresh_fee_balances(student_ids=[student_id])
+        balance = StudentFeeBalance.objects.filter(student_id=student_id).first()
+    return balance
@@ -0,0 +1,389 @@
+"""
+Double-entry ledger utilities for the chart of accounts
+"""
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.utils import timezone
+from .models import FinanceAccount, AccountClosure, Transaction, LedgerEntry, AccountBalance
+
+ZERO = Decimal('0.00')
+
+# Accounts whose balance is normally on the debit side; the rest are credit-normal
+DEBIT_NORMAL_TYPES = ('asset', 'expense')
+BALANCE_SHEET_TYPES = ('asset', 'liability', 'equity')
+
+
+def period_start(day):
+    """
+    First day of the month a date is booked in
+    """
+    return day.replace(day=1)
+
+
+def parse_period(value):
+    """
+    Parse 'YYYY-MM' or 'YYYY-MM-DD' into the first day of that month; None means the current month
+    """
+    if not value:
+        return period_start(timezone.localdate())
+    for fmt in ('%Y-%m', '%Y-%m-%d'):
+        try:
+            return period_start(datetime.strptime(value, fmt).date())
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid period '{value}'. Use YYYY-MM.")
+
+
+# Closure table
+
+def add_account_to_closure(account):
+    """
+    Link a new account to itself and to every ancestor of its parent
+    """
+    links = [AccountClosure(ancestor_id=account.id, descendant_id=account.id, depth=0)]
+    if account.parent_account_id:
+        links += [
+            AccountClosure(ancestor_id=ancestor_id, descendant_id=account.id, depth=depth + 1)
+            for ancestor_id, depth in AccountClosure.objects.filter(
+                descendant_id=account.parent_account_id
+            ).values_list('ancestor_id', 'depth')
+        ]
+    AccountClosure.objects.bulk_create(links, ignore_conflicts=True)
+
+
+def validate_account_parent(account):
+    """
+    Raise ValueError if the account's parent is the account itself or one of its sub-accounts
+    """
+    if account.id is None or account.parent_account_id is None:
+        return
+    if AccountClosure.objects.filter(ancestor_id=account.id, descendant_id=account.parent_account_id).exists():
+        raise ValueError(f"Account {account.account_code} cannot be moved under its own sub-account")
+
+
+def move_account_in_closure(account):
+    """
+    Re-link an account's subtree after its parent changed, then refresh rolled-up balances
+    """
+    with transaction.atomic():
+        subtree = dict(
+            AccountClosure.objects.filter(ancestor_id=account.id).values_list('descendant_id', 'depth')
+        )
+        # Drop the links from the old ancestors into the subtree
+        AccountClosure.objects.filter(descendant_id__in=list(subtree)).exclude(
+            ancestor_id__in=list(subtree)
+        ).delete()
+
+        if account.parent_account_id:
+            new_ancestors = AccountClosure.objects.filter(
+                descendant_id=account.parent_account_id
+            ).values_list('ancestor_id', 'depth')
+            AccountClosure.objects.bulk_create([
+                AccountClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=ancestor_depth + 1 + depth)
+                for ancestor_id, ancestor_depth in new_ancestors
+                for descendant_id, depth in subtree.items()
+            ], batch_size=1000)
+
+        rebuild_rollup_balances()
+
+
+def rebuild_account_closure():
+    """
+    Recompute the whole closure table from parent_account links
+    """
+    parents = dict(FinanceAccount.objects.values_list('id', 'parent_account_id'))
+    links = []
+    for account_id in parents:
+        ancestor_id, depth, seen = account_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            links.append(AccountClosure(ancestor_id=ancestor_id, descendant_id=account_id, depth=depth))
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+
+    with transaction.atomic():
+        AccountClosure.objects.all().delete()
+        AccountClosure.objects.bulk_create(links, batch_size=1000)
+    return len(links)
+
+
+# Balances
+
+CLOSING_FIELDS = {
+    'debit_total': 'closing_debit_total',
+    'credit_total': 'closing_credit_total',
+    'rollup_debit_total': 'closing_rollup_debit_total',
+    'rollup_credit_total': 'closing_rollup_credit_total',
+}
+
+
+def _open_periods(account_ids, period):
+    """
+    Create the missing balance rows of a period, opening with the closing totals of each account's previous row
+    """
+    existing = set(
+        AccountBalance.objects.filter(account_id__in=account_ids, period=period).values_list('account_id', flat=True)
+    )
+    created = []
+    for account_id in sorted(set(account_ids) - existing):
+        # Locked so a back-dated posting still running cannot change the totals being carried forward
+        previous = AccountBalance.objects.select_for_update().filter(
+            account_id=account_id, period__lt=period
+        ).order_by('-period').values(*CLOSING_FIELDS.values()).first() or {}
+        created.append(AccountBalance(account_id=account_id, period=period, **previous))
+    AccountBalance.objects.bulk_create(created, ignore_conflicts=True)
+
+
+def apply_balance_changes(lines, period):
+    """
+    Add ledger lines to the stored balances of one period.
+
+    `lines` is a list of (account_id, debit, credit). Each account's own
+    totals change, and the rolled-up totals of every ancestor found through
+    the closure table change with it, in the caller's transaction. The
+    closing totals of the period and of every later period move with them.
+    """
+    account_ids = {account_id for account_id, _, _ in lines}
+    ancestors = defaultdict(list)
+    for ancestor_id, descendant_id in AccountClosure.objects.filter(
+        descendant_id__in=account_ids
+    ).values_list('ancestor_id', 'descendant_id'):
+        ancestors[descendant_id].append(ancestor_id)
+
+    changes = defaultdict(lambda: [ZERO, ZERO, ZERO, ZERO])
+    for account_id, debit, credit in lines:
+        changes[account_id][0] += debit
+        changes[account_id][1] += credit
+        for ancestor_id in ancestors[account_id] or [account_id]:
+            changes[ancestor_id][2] += debit
+            changes[ancestor_id][3] += credit
+
+    _open_periods(list(changes), period)
+    now = timezone.now()
+    # Rows are updated in account order so concurrent postings lock them in the same order
+    for account_id in sorted(changes):
+        amounts = dict(zip(CLOSING_FIELDS, changes[account_id]))
+        AccountBalance.objects.filter(account_id=account_id, period=period).update(
+            **{field: F(field) + amount for field, amount in amounts.items()}, updated_at=now
+        )
+        # Postings are almost always in the latest period, so this usually touches only the row above
+        AccountBalance.objects.filter(account_id=account_id, period__gte=period).update(
+            **{closing: F(closing) + amounts[field] for field, closing in CLOSING_FIELDS.items()}, updated_at=now
+        )
+
+
+def post_transaction(txn):
+    """
+    Post a transaction: debit its account, credit its contra account and update balances atomically.
+
+    Raises ValueError if it cannot be posted; posting twice is a no-op.
+    """
+    with transaction.atomic():
+        txn = Transaction.objects.select_for_update().get(pk=txn.pk)
+        if txn.is_posted:
+            return txn
+        if txn.contra_account_id is None:
+            raise ValueError(f"Transaction {txn.transaction_id} has no contra account to credit")
+        if txn.contra_account_id == txn.account_id:
+            raise ValueError(f"Transaction {txn.transaction_id} debits and credits the same account")
+        if txn.amount <= 0:
+            raise ValueError(f"Transaction {txn.transaction_id} must have a positive amount")
+
+        period = period_start(txn.transaction_date)
+        lines = [(txn.account_id, txn.amount, ZERO), (txn.contra_account_id, ZERO, txn.amount)]
+        LedgerEntry.objects.bulk_create([
+            LedgerEntry(transaction=txn, account_id=account_id, debit=debit, credit=credit, period=period)
+            for account_id, debit, credit in lines
+        ])
+        apply_balance_changes(lines, period)
+
+        txn.is_posted = True
+        txn.posted_at = timezone.now()
+        Transaction.objects.filter(pk=txn.pk).update(is_posted=True, posted_at=txn.posted_at)
+    return txn
+
+
+def unpost_transaction(txn):
+    """
+    Reverse a posted transaction's ledger entries and balances
+    """
+    with transaction.atomic():
+        entries = list(LedgerEntry.objects.filter(transaction_id=txn.pk))
+        for period in {entry.period for entry in entries}:
+            apply_balance_changes(
+                [(entry.account_id, -entry.debit, -entry.credit) for entry in entries if entry.period == period],
+                period
+            )
+        LedgerEntry.objects.filter(transaction_id=txn.pk).delete()
+        Transaction.objects.filter(pk=txn.pk).update(is_posted=False, posted_at=None)
+    txn.is_posted = False
+    txn.posted_at = None
+    return txn
+
+
+def rebuild_rollup_balances():
+    """
+    Recompute rolled-up totals from each account's own totals through the closure table
+    """
+    with transaction.atomic():
+        balances = {
+            (balance.account_id, balance.period): balance
+            for balance in AccountBalance.objects.select_for_update()
+        }
+        for balance in balances.values():
+            balance.rollup_debit_total = ZERO
+            balance.rollup_credit_total = ZERO
+
+        missing = []
+        for row in AccountBalance.objects.values(
+            'period', ancestor_id=F('account__ancestor_links__ancestor_id')
+        ).annotate(debit=Sum('debit_total'), credit=Sum('credit_total')):
+            key = (row['ancestor_id'], row['period'])
+            balance = balances.get(key)
+            if balance is None:
+                balance = AccountBalance(account_id=key[0], period=key[1])
+                missing.append(balance)
+            balance.rollup_debit_total = row['debit']
+            balance.rollup_credit_total = row['credit']
+
+        AccountBalance.objects.bulk_update(
+            balances.values(), ['rollup_debit_total', 'rollup_credit_total'], batch_size=1000
+        )
+        AccountBalance.objects.bulk_create(missing, batch_size=1000)
+        rebuild_closing_balances()
+    return len(balances) + len(missing)
+
+
+def rebuild_closing_balances():
+    """
+    Recompute the running closing totals of every balance row from the monthly totals
+    """
+    with transaction.atomic():
+        balances = list(AccountBalance.objects.select_for_update().order_by('account_id', 'period'))
+        account_id, running = None, {}
+        for balance in balances:
+            if balance.account_id != account_id:
+                account_id, running = balance.account_id, dict.fromkeys(CLOSING_FIELDS, ZERO)
+            for field, closing in CLOSING_FIELDS.items():
+                running[field] += getattr(balance, field)
+                setattr(balance, closing, running[field])
+        AccountBalance.objects.bulk_update(balances, list(CLOSING_FIELDS.values()), batch_size=1000)
+    return len(balances)
+
+
+def rebuild_ledger_balances():
+    """
+    Recompute every stored balance from the ledger entries
+    """
+    with transaction.atomic():
+        AccountBalance.objects.all().delete()
+        AccountBalance.objects.bulk_create([
+            AccountBalance(
+                account_id=row['account_id'],
+                period=row['period'],
+                debit_total=row['debit'],
+                credit_total=row['credit'],
+            )
+            for row in LedgerEntry.objects.values('account_id', 'period')
+            .annotate(debit=Sum('debit'), credit=Sum('credit'))
+            .order_by()
+        ], batch_size=1000)
+        return rebuild_rollup_balances()
+
+
+# Statements
+
+def _normal_balance(account_type, debit, credit):
+    return debit - credit if account_type in DEBIT_NORMAL_TYPES else credit - debit
+
+
+def _cumulative_balances(period):
+    # The latest row of each account up to the period holds its closing totals: one index probe per account
+    latest = AccountBalance.objects.filter(
+        account_id=OuterRef('pk'), period__lte=period
+    ).order_by('-period').values('id')[:1]
+    return (
+        AccountBalance.objects.filter(
+            id__in=FinanceAccount.objects.annotate(balance_id=Subquery(latest)).values('balance_id')
+        )
+        .values(
+            'account_id', 'account__account_code', 'account__account_name',
+            'account__account_type', 'account__parent_account_id',
+            debit=F('closing_debit_total'),
+            credit=F('closing_credit_total'),
+            rollup_debit=F('closing_rollup_debit_total'),
+            rollup_credit=F('closing_rollup_credit_total'),
+        )
+        .order_by('account__account_code')
+    )
+
+
+def trial_balance(period):
+    """
+    Closing debit and credit balance of every account at the end of `period`
+    """
+    accounts = []
+    total_debit = total_credit = ZERO
+    for row in _cumulative_balances(period):
+        net = row['debit'] - row['credit']
+        if not net:
+            continue
+        debit_balance = net if net > 0 else ZERO
+        credit_balance = -net if net < 0 else ZERO
+        total_debit += debit_balance
+        total_credit += credit_balance
+        accounts.append({
+            'account_id': row['account_id'],
+            'account_code': row['account__account_code'],
+            'account_name': row['account__account_name'],
+            'account_type': row['account__account_type'],
+            'debit': debit_balance,
+            'credit': credit_balance,
+        })
+
+    return {
+        'period': period,
+        'accounts': accounts,
+        'total_debit': total_debit,
+        'total_credit': total_credit,
+        'is_balanced': total_debit == total_credit,
+    }
+
+
+def balance_sheet(period):
+    """
+    Assets, liabilities and equity at the end of `period`, with sub-account rollups
+    """
+    sections = {account_type: {'accounts': [], 'total': ZERO} for account_type in BALANCE_SHEET_TYPES}
+    net_income = ZERO
+
+    for row in _cumulative_balances(period):
+        account_type = row['account__account_type']
+        own_balance = _normal_balance(account_type, row['debit'], row['credit'])
+        if account_type not in sections:
+            # Revenue less expenses not yet closed to equity
+            net_income += own_balance if account_type == 'revenue' else -own_balance
+            continue
+
+        sections[account_type]['total'] += own_balance
+        sections[account_type]['accounts'].append({
+            'account_id': row['account_id'],
+            'account_code': row['account__account_code'],
+            'account_name': row['account__account_name'],
+            'parent_account': row['account__parent_account_id'],
+            'balance': own_balance,
+            'rollup_balance': _normal_balance(account_type, row['rollup_debit'], row['rollup_credit']),
+        })
+
+    liabilities_and_equity = sections['liability']['total'] + sections['equity']['total'] + net_income
+    return {
+        'period': period,
+        'assets': sections['asset'],
+        'liabilities': sections['liability'],
+        'equity': sections['equity'],
+        'net_income': net_income,
+        'total_liabilities_and_equity': liabilities_and_equity,
+        'is_balanced': sections['asset']['total'] == liabilities_and_equity,
+    }
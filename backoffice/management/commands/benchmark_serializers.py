@@ -0,0 +1,78 @@
+"""
+Django management command that measures per-request serializer cost on the backoffice list endpoints
+"""
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from backoffice import views
+
+LIST_VIEWS = [
+    views.EmployeeListCreateView,
+    views.PayrollListCreateView,
+    views.FinanceAccountListView,
+    views.TransactionListCreateView,
+    views.FeeStructureListView,
+    views.StudentFeePaymentListView,
+    views.InventoryListCreateView,
+]
+
+def _build_inline_serializer(model):
+    """Rebuild a serializer class the way views did inside get_serializer_class"""
+    class InlineSerializer(serializers.ModelSerializer):
+        class Meta:
+            pass
+    InlineSerializer.Meta.model = model
+    InlineSerializer.Meta.fields = '__all__'
+    return InlineSerializer
+
+def _time_per_call(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+class Command(BaseCommand):
+    help = 'Compare per-request serializer construction cost of inline vs module-level serializers on backoffice list endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Simulated requests per endpoint')
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=settings.REST_FRAMEWORK.get('PAGE_SIZE', 20),
+            help='Rows serialized per simulated request (defaults to the API page size)'
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(options['iterations'], 1)
+
+        self.stdout.write(
+            f"{'Endpoint':<28} {'Rows':>5} {'Build before':>13} {'Build after':>12} "
+            f"{'Page before':>12} {'Page after':>11}"
+        )
+        for view_class in LIST_VIEWS:
+            model = view_class.queryset.model
+            serializer_class = view_class.serializer_class
+            # Rows are fetched once so only serializer work is timed
+            rows = list(view_class.queryset.all()[:options['page_size']])
+
+            def build_before():
+                return _build_inline_serializer(model)(many=True).child.fields
+
+            def build_after():
+                return serializer_class(many=True).child.fields
+
+            def page_before():
+                return _build_inline_serializer(model)(rows, many=True).data
+
+            def page_after():
+                return serializer_class(rows, many=True).data
+
+            timings = [_time_per_call(func, iterations) * 1000 for func in (build_before, build_after, page_before, page_after)]
+            self.stdout.write(
+                f"{view_class.__name__:<28} {len(rows):>5} {timings[0]:>11.3f}ms {timings[1]:>10.3f}ms "
+                f"{timings[2]:>10.3f}ms {timings[3]:>9.3f}ms"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Benchmark finished ({iterations} simulated requests per endpoint)'))
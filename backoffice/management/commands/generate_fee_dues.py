@@ -0,0 +1,60 @@
+"""
+Django management command to generate semester fee dues and refresh outstanding balances
+"""
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from backoffice.fee_utils import generate_dues, sweep_overdue_fees, refresh_fee_balances
+
+class Command(BaseCommand):
+    help = 'Create per-student dues from active fee structures in bulk and update the outstanding-balance table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--program', type=int, help='Only generate dues for this program ID')
+        parser.add_argument('--semester', type=int, help='Only generate dues for this semester')
+        parser.add_argument('--academic-year', type=str, help='Only generate dues for this academic year, e.g. 2025-2026')
+        parser.add_argument(
+            '--processed-by',
+            type=str,
+            help='Username recorded on generated dues (defaults to the first superuser)'
+        )
+        parser.add_argument(
+            '--apply-late-fees',
+            action='store_true',
+            help='Also run the overdue sweep (late fees and reminders) for dues past their due date'
+        )
+        parser.add_argument(
+            '--refresh-balances',
+            action='store_true',
+            help='Recompute the outstanding balance of every student afterwards'
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options['processed_by']:
+            processed_by = User.objects.filter(username=options['processed_by']).first()
+        else:
+            processed_by = User.objects.filter(is_superuser=True).order_by('id').first()
+        if processed_by is None:
+            raise CommandError('No user found to record as processor')
+
+        started = time.monotonic()
+        created = generate_dues(
+            processed_by,
+            program_id=options['program'],
+            semester=options['semester'],
+            academic_year=options['academic_year']
+        )
+        for fee_structure, count in created.items():
+            self.stdout.write(f'{fee_structure}: {count} dues created')
+
+        if options['apply_late_fees']:
+            counts = sweep_overdue_fees()
+            self.stdout.write(f"{sum(c['marked_overdue'] for c in counts.values())} dues marked overdue")
+        if options['refresh_balances']:
+            self.stdout.write(f'{refresh_fee_balances()} balances refreshed')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Generated {sum(created.values())} dues from {len(created)} fee structures in {elapsed:.1f}s'
+        ))
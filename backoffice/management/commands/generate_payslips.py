@@ -0,0 +1,141 @@
+"""
+Django management command to render payslip PDFs for a whole pay period
+"""
+import calendar
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.dateparse import parse_date
+from backoffice.models import Payroll
+from backoffice.pdf_utils import (
+    build_payslip_context, payslip_cache_path, write_payslip, merged_payslips_path, write_merged_payslips
+)
+
+def _render_payslips(jobs):
+    """Worker entry point; renders a batch from plain data so it never touches the database"""
+    pages = 0
+    errors = []
+    for context, path in jobs:
+        try:
+            pages += write_payslip(context, path)
+        except Exception as e:
+            errors.append(f"{context['employee_id']}: {str(e)}")
+    return len(jobs) - len(errors), pages, errors
+
+def _render_merged(contexts, path):
+    """Worker entry point for the merged, printable PDF of the whole period"""
+    return write_merged_payslips(contexts, path)
+
+class Command(BaseCommand):
+    help = 'Render one payslip PDF per employee for a pay period in a process pool, optionally with a merged PDF'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='Pay month as YYYY-MM (shortcut for the first to the last day of the month)'
+        )
+        parser.add_argument('--start', type=str, help='Pay period start date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=str, help='Pay period end date (YYYY-MM-DD)')
+        parser.add_argument('--department', type=int, help='Only render payslips for this department ID')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of rendering processes (defaults to the CPU count)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Payslips handed to a worker per task'
+        )
+        parser.add_argument(
+            '--merged',
+            action='store_true',
+            help='Also write a single PDF with every payslip of the period, for printing'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render payslips even if the current version is already cached'
+        )
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                year, month = (int(part) for part in options['month'].split('-'))
+                start = date(year, month, 1)
+                end = date(year, month, calendar.monthrange(year, month)[1])
+            except ValueError:
+                raise CommandError(f"Invalid month '{options['month']}'. Use YYYY-MM.")
+        else:
+            start = parse_date(options['start'] or '')
+            end = parse_date(options['end'] or '')
+            if start is None or end is None:
+                raise CommandError('Pass --month YYYY-MM or both --start and --end')
+
+        payrolls = Payroll.objects.filter(
+            pay_period_start=start, pay_period_end=end
+        ).select_related('employee__user', 'employee__department').order_by('employee__employee_id')
+        if options['department']:
+            payrolls = payrolls.filter(employee__department_id=options['department'])
+
+        media_root = str(settings.MEDIA_ROOT)
+        contexts = []
+        jobs = []
+        cached = 0
+        for payroll in payrolls.iterator(chunk_size=2000):
+            context = build_payslip_context(payroll)
+            contexts.append(context)
+            path = payslip_cache_path(context, media_root)
+            if not options['force'] and os.path.exists(path):
+                cached += 1
+                continue
+            jobs.append((context, path))
+
+        if not contexts:
+            raise CommandError(f'No payroll rows found for {start} to {end}; run the payroll first')
+
+        self.stdout.write(f"{len(jobs)} payslips to render, {cached} already cached")
+        if not jobs and not options['merged']:
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+
+        started = time.monotonic()
+        rendered = pages = failures = 0
+        merged_path = merged_payslips_path(start, end, media_root) if options['merged'] else None
+        batch_size = max(options['batch_size'], 1)
+        with ProcessPoolExecutor(max_workers=max(options['workers'], 1)) as executor:
+            # The merged document is one long render, so it starts first and runs alongside the batches
+            merged_future = executor.submit(_render_merged, contexts, merged_path) if merged_path else None
+            futures = [
+                executor.submit(_render_payslips, jobs[index:index + batch_size])
+                for index in range(0, len(jobs), batch_size)
+            ]
+            for future in as_completed(futures):
+                batch_rendered, batch_pages, errors = future.result()
+                rendered += batch_rendered
+                pages += batch_pages
+                failures += len(errors)
+                for error in errors:
+                    self.stdout.write(self.style.ERROR(f'❌ Failed to render a payslip: {error}'))
+
+            if merged_future is not None:
+                try:
+                    pages += merged_future.result()
+                    self.stdout.write(f"Merged payslips written to {merged_path}")
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f'❌ Failed to render the merged PDF: {str(e)}'))
+
+        elapsed = time.monotonic() - started
+        rate = pages / elapsed if elapsed else pages
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rendered {rendered} payslips ({pages} pages) in {elapsed:.1f}s ({rate:.1f} pages/s), {failures} failed'
+        ))
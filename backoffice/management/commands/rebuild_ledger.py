@@ -0,0 +1,38 @@
+"""
+Django management command to rebuild the account closure table and ledger balances
+"""
+import time
+from django.core.management.base import BaseCommand
+from backoffice.ledger_utils import rebuild_account_closure, rebuild_ledger_balances, post_transaction
+from backoffice.models import Transaction
+
+class Command(BaseCommand):
+    help = 'Recompute the chart-of-accounts closure table and per-period account balances from ledger entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--post-pending',
+            action='store_true',
+            help='Post unposted transactions that have a contra account before rebuilding'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        links = rebuild_account_closure()
+
+        if options['post_pending']:
+            posted = 0
+            for txn in Transaction.objects.filter(is_posted=False, contra_account__isnull=False).iterator():
+                try:
+                    post_transaction(txn)
+                    posted += 1
+                except ValueError as e:
+                    self.stdout.write(self.style.WARNING(f'⚠️ {e}'))
+            self.stdout.write(f'Posted {posted} pending transactions')
+
+        balances = rebuild_ledger_balances()
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt {links} closure links and {balances} account balances in {elapsed:.1f}s'
+        ))
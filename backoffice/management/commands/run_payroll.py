@@ -0,0 +1,66 @@
+"""
+Django management command to compute payrolls for all active employees for a pay period
+"""
+import calendar
+import time
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from backoffice.payroll_utils import run_payroll
+
+class Command(BaseCommand):
+    help = 'Run payroll for a pay period; re-running recomputes unpaid rows and leaves paid ones untouched'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='Pay month as YYYY-MM (shortcut for the first to the last day of the month)'
+        )
+        parser.add_argument('--start', type=str, help='Pay period start date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=str, help='Pay period end date (YYYY-MM-DD)')
+        parser.add_argument('--department', type=int, help='Only run payroll for this department ID')
+        parser.add_argument(
+            '--processed-by',
+            type=str,
+            help='Username recorded as processor (defaults to the first superuser)'
+        )
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                year, month = (int(part) for part in options['month'].split('-'))
+                start = date(year, month, 1)
+                end = date(year, month, calendar.monthrange(year, month)[1])
+            except ValueError:
+                raise CommandError(f"Invalid month '{options['month']}'. Use YYYY-MM.")
+        else:
+            start = parse_date(options['start'] or '')
+            end = parse_date(options['end'] or '')
+            if start is None or end is None:
+                raise CommandError('Pass --month YYYY-MM or both --start and --end')
+
+        User = get_user_model()
+        if options['processed_by']:
+            processed_by = User.objects.filter(username=options['processed_by']).first()
+        else:
+            processed_by = User.objects.filter(is_superuser=True).order_by('id').first()
+        if processed_by is None:
+            raise CommandError('No user found to record as payroll processor')
+
+        started = time.monotonic()
+        try:
+            summary = run_payroll(start, end, processed_by=processed_by, department=options['department'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            f"{summary['created']} created, {summary['updated']} recomputed, "
+            f"{summary['skipped_paid']} already paid"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Payroll for {start} to {end}: {summary['employees']} employees, "
+            f"net {summary['total_net']} in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,46 @@
+"""
+Django management command to mark overdue fee dues, apply late fees and queue reminders
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from backoffice.fee_utils import sweep_overdue_fees, SWEEP_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Nightly set-based sweep: flip unpaid dues past their due date to overdue, apply late fees and queue reminders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--as-of',
+            type=str,
+            help='Treat this date (YYYY-MM-DD) as today; defaults to the current date'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help='Primary-key range covered by each UPDATE statement'
+        )
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options['as_of']:
+            as_of = parse_date(options['as_of'])
+            if as_of is None:
+                raise CommandError(f"Invalid date '{options['as_of']}'. Use YYYY-MM-DD.")
+
+        started = time.monotonic()
+        counts = sweep_overdue_fees(as_of=as_of, batch_size=max(options['batch_size'], 1))
+        elapsed = time.monotonic() - started
+
+        for program, program_counts in counts.items():
+            self.stdout.write(
+                f"{program}: {program_counts['marked_overdue']} marked overdue, "
+                f"{program_counts['reminders_queued']} reminders queued"
+            )
+
+        marked = sum(program_counts['marked_overdue'] for program_counts in counts.values())
+        queued = sum(program_counts['reminders_queued'] for program_counts in counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Marked {marked} dues overdue and queued {queued} reminders in {elapsed:.1f}s'
+        ))
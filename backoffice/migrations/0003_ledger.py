@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_account_closure(apps, schema_editor):
+    FinanceAccount = apps.get_model('backoffice', 'FinanceAccount')
+    AccountClosure = apps.get_model('backoffice', 'AccountClosure')
+
+    parents = dict(FinanceAccount.objects.values_list('id', 'parent_account_id'))
+    links = []
+    for account_id in parents:
+        ancestor_id, depth, seen = account_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            links.append(AccountClosure(ancestor_id=ancestor_id, descendant_id=account_id, depth=depth))
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+    AccountClosure.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backoffice', '0002_remove_hostel_warden_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='contra_account',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='contra_transactions', to='backoffice.financeaccount'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='is_posted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='posted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the month')),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('rollup_debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('rollup_credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='backoffice.financeaccount')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period'], name='backoffice__period_0f98fa_idx')],
+                'unique_together': {('account', 'period')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AccountClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='backoffice.financeaccount')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='backoffice.financeaccount')),
+            ],
+            options={
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('period', models.DateField(help_text='First day of the month the entry is booked in')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='backoffice.financeaccount')),
+                ('transaction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='backoffice.transaction')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['account', 'period'], name='backoffice__account_dee95c_idx')],
+            },
+        ),
+        migrations.RunPython(build_account_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backoffice', '0003_ledger'),
+        ('students', '0003_enrollment_attendance_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentFeeBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_due', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_late_fees', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_paid', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_waived', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('outstanding', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('overdue_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('open_dues', models.PositiveIntegerField(default=0)),
+                ('next_due_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='studentfeepayment',
+            index=models.Index(fields=['student', 'status'], name='backoffice__student_3c7251_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfeepayment',
+            index=models.Index(fields=['fee_structure', 'status'], name='backoffice__fee_str_dcbfb2_idx'),
+        ),
+        migrations.AddField(
+            model_name='studentfeebalance',
+            name='student',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fee_balance', to='students.student'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfeebalance',
+            index=models.Index(fields=['outstanding'], name='backoffice__outstan_cc88da_idx'),
+        ),
+    ]
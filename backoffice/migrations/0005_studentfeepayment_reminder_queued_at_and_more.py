@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backoffice', '0004_fee_balances'),
+        ('students', '0003_enrollment_attendance_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentfeepayment',
+            name='reminder_queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='studentfeepayment',
+            index=models.Index(fields=['status', 'reminder_queued_at'], name='backoffice__status_3c1ef0_idx'),
+        ),
+    ]
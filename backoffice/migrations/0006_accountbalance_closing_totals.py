@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:12
+
+from decimal import Decimal
+from django.db import migrations, models
+
+CLOSING_FIELDS = {
+    'debit_total': 'closing_debit_total',
+    'credit_total': 'closing_credit_total',
+    'rollup_debit_total': 'closing_rollup_debit_total',
+    'rollup_credit_total': 'closing_rollup_credit_total',
+}
+
+
+def fill_closing_totals(apps, schema_editor):
+    AccountBalance = apps.get_model('backoffice', 'AccountBalance')
+
+    balances = list(AccountBalance.objects.order_by('account_id', 'period'))
+    account_id, running = None, {}
+    for balance in balances:
+        if balance.account_id != account_id:
+            account_id, running = balance.account_id, dict.fromkeys(CLOSING_FIELDS, Decimal('0.00'))
+        for field, closing in CLOSING_FIELDS.items():
+            running[field] += getattr(balance, field)
+            setattr(balance, closing, running[field])
+    AccountBalance.objects.bulk_update(balances, list(CLOSING_FIELDS.values()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backoffice', '0005_studentfeepayment_reminder_queued_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountbalance',
+            name='closing_credit_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.AddField(
+            model_name='accountbalance',
+            name='closing_debit_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.AddField(
+            model_name='accountbalance',
+            name='closing_rollup_credit_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.AddField(
+            model_name='accountbalance',
+            name='closing_rollup_debit_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.RunPython(fill_closing_totals, migrations.RunPython.noop),
+    ]
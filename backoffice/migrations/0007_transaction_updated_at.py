@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:24
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    Transaction = apps.get_model('backoffice', 'Transaction')
+    Transaction.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backoffice', '0006_accountbalance_closing_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemovedTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_id', models.CharField(max_length=20)),
+                ('removed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['updated_at'], name='backoffice__updated_8c3885_idx'),
+        ),
+    ]
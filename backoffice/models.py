@@ -104,9 +104,30 @@ class FinanceAccount(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored parent so a move can be detected and the closure table updated
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
     def __str__(self):
         return f"{self.account_code} - {self.account_name}"
 
+class AccountClosure(models.Model):
+    """Ancestor/descendant pairs of the chart of accounts, including each account with itself"""
+    ancestor = models.ForeignKey(FinanceAccount, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(FinanceAccount, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['ancestor', 'descendant']
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
 class Transaction(models.Model):
     """Financial Transactions"""
     TRANSACTION_TYPES = (
@@ -126,15 +147,70 @@ class Transaction(models.Model):
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     transaction_date = models.DateField()
     account = models.ForeignKey(FinanceAccount, on_delete=models.CASCADE, related_name='transactions')
+    # Double entry: `account` is debited and `contra_account` credited when the transaction is posted
+    contra_account = models.ForeignKey(
+        FinanceAccount, on_delete=models.PROTECT, null=True, blank=True, related_name='contra_transactions'
+    )
+    is_posted = models.BooleanField(default=False)
+    posted_at = models.DateTimeField(null=True, blank=True)
     reference_number = models.CharField(max_length=50, blank=True)
     student = models.ForeignKey(Student, on_delete=models.SET_NULL, null=True, blank=True)
     employee = models.ForeignKey(Employee, on_delete=models.SET_NULL, null=True, blank=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['updated_at'])]
 
     def __str__(self):
         return f"{self.transaction_id} - {self.description} - {self.amount}"
 
+class RemovedTransaction(models.Model):
+    """Transaction ID that stopped naming a transaction, by deletion or renumbering"""
+    transaction_id = models.CharField(max_length=20)
+    removed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.transaction_id} removed {self.removed_at}"
+
+class LedgerEntry(models.Model):
+    """Debit or credit line of a posted transaction"""
+    transaction = models.ForeignKey(Transaction, on_delete=models.CASCADE, related_name='ledger_entries')
+    account = models.ForeignKey(FinanceAccount, on_delete=models.PROTECT, related_name='ledger_entries')
+    debit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    period = models.DateField(help_text='First day of the month the entry is booked in')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['account', 'period'])]
+
+    def __str__(self):
+        return f"{self.transaction_id} - {self.account_id} Dr {self.debit} Cr {self.credit}"
+
+class AccountBalance(models.Model):
+    """Monthly debit/credit totals of an account, on its own and rolled up with its sub-accounts"""
+    account = models.ForeignKey(FinanceAccount, on_delete=models.CASCADE, related_name='balances')
+    period = models.DateField(help_text='First day of the month')
+    debit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    rollup_debit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    rollup_credit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Running totals through the end of the period, carried forward from the account's previous row
+    closing_debit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    closing_credit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    closing_rollup_debit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    closing_rollup_credit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['account', 'period']
+        indexes = [models.Index(fields=['period'])]
+
+    def __str__(self):
+        return f"{self.account_id} - {self.period:%Y-%m}"
+
 class FeeStructure(models.Model):
     """Fee Structure for Programs"""
     program = models.ForeignKey('students.Program', on_delete=models.CASCADE, related_name='fee_structures')
@@ -191,11 +267,38 @@ class StudentFeePayment(models.Model):
     status = models.CharField(max_length=20, choices=PAYMENT_STATUS, default='pending')
     remarks = models.TextField(blank=True)
     processed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    reminder_queued_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', 'status']),
+            models.Index(fields=['fee_structure', 'status']),
+            models.Index(fields=['status', 'reminder_queued_at']),
+        ]
+
     def __str__(self):
         return f"{self.student.student_id} - {self.receipt_number} - {self.amount_paid}"
 
+class StudentFeeBalance(models.Model):
+    """Outstanding fee balance per student, maintained from StudentFeePayment dues"""
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, related_name='fee_balance')
+    total_due = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_late_fees = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_waived = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    outstanding = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overdue_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    open_dues = models.PositiveIntegerField(default=0)
+    next_due_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['outstanding'])]
+
+    def __str__(self):
+        return f"{self.student_id} - outstanding {self.outstanding}"
+
 class Inventory(models.Model):
     """University Inventory Management"""
     ITEM_CATEGORIES = (
@@ -0,0 +1,232 @@
+"""
+Batch payroll run utilities
+"""
+from decimal import Decimal
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from .models import Employee, Payroll
+
+DEFAULT_PAYROLL_RATES = {
+    'house_rent_allowance_rate': 0.40,
+    'special_allowance_rate': 0.10,
+    'medical_allowance': 1250,
+    'transport_allowance': 1600,
+    'overtime_multiplier': 2.0,
+    'hours_per_day': 8,
+    'provident_fund_rate': 0.12,
+    'provident_fund_wage_ceiling': 15000,
+    'esi_rate': 0.0075,
+    'esi_gross_ceiling': 21000,
+    'tax_standard_deduction': 75000,
+    'tax_slabs': [
+        (400000, 0.00), (800000, 0.05), (1200000, 0.10), (1600000, 0.15),
+        (2000000, 0.20), (2400000, 0.25), (None, 0.30),
+    ],
+}
+
+# Per-employee inputs a run accepts; missing values fall back to the existing unpaid row, then 0
+PAYROLL_INPUT_FIELDS = ('days_absent', 'overtime_hours', 'bonus', 'loan_deduction', 'other_deductions')
+
+PAYROLL_AMOUNT_FIELDS = (
+    'basic_salary', 'house_rent_allowance', 'medical_allowance', 'transport_allowance',
+    'special_allowance', 'overtime_amount', 'bonus', 'provident_fund', 'tax_deduction',
+    'esi_deduction', 'loan_deduction', 'other_deductions', 'gross_salary', 'total_deductions',
+    'net_salary',
+)
+
+
+def get_payroll_rates():
+    """
+    Payroll rates from settings.PAYROLL_RATES over the defaults
+    """
+    return {**DEFAULT_PAYROLL_RATES, **getattr(settings, 'PAYROLL_RATES', {})}
+
+
+def _paise(values):
+    # Round to whole paise once per component so totals add up exactly
+    return np.rint(values * 100).astype(np.int64)
+
+
+def _annual_tax(taxable, slabs):
+    tax = np.zeros_like(taxable)
+    lower = 0.0
+    for upper, rate in slabs:
+        upper = np.inf if upper is None else float(upper)
+        tax += np.clip(taxable - lower, 0, upper - lower) * rate
+        lower = upper
+    return tax
+
+
+def compute_payroll(basic, days_in_period, days_absent, overtime_hours, bonus, loan, other, rates=None):
+    """
+    Compute payroll components for arrays of employees at once.
+
+    All arguments except `days_in_period` are equal-length NumPy arrays of
+    monthly amounts. Returns a dict of int64 arrays in paise keyed by
+    Payroll field name.
+    """
+    rates = rates or get_payroll_rates()
+    days_worked = np.clip(days_in_period - days_absent, 0, days_in_period)
+    worked_ratio = days_worked / days_in_period
+
+    earned_basic = _paise(basic * worked_ratio)
+    hra = _paise(earned_basic / 100 * rates['house_rent_allowance_rate'])
+    special = _paise(earned_basic / 100 * rates['special_allowance_rate'])
+    medical = _paise(rates['medical_allowance'] * worked_ratio)
+    transport = _paise(rates['transport_allowance'] * worked_ratio)
+    hourly_rate = basic / (days_in_period * rates['hours_per_day'])
+    overtime = _paise(hourly_rate * overtime_hours * rates['overtime_multiplier'])
+    bonus = _paise(bonus)
+
+    gross = earned_basic + hra + special + medical + transport + overtime + bonus
+
+    pf_wages = np.minimum(earned_basic, rates['provident_fund_wage_ceiling'] * 100)
+    provident_fund = _paise(pf_wages / 100 * rates['provident_fund_rate'])
+    esi = np.where(
+        gross <= rates['esi_gross_ceiling'] * 100,
+        _paise(gross / 100 * rates['esi_rate']),
+        0
+    )
+    # Monthly TDS: the tax on this month's gross annualised, spread over twelve months
+    annual_taxable = np.maximum(gross / 100 * 12 - rates['tax_standard_deduction'], 0)
+    tax = _paise(_annual_tax(annual_taxable, rates['tax_slabs']) / 12)
+    loan = _paise(loan)
+    other = _paise(other)
+
+    total_deductions = provident_fund + esi + tax + loan + other
+    return {
+        'basic_salary': earned_basic,
+        'house_rent_allowance': hra,
+        'medical_allowance': medical,
+        'transport_allowance': transport,
+        'special_allowance': special,
+        'overtime_amount': overtime,
+        'bonus': bonus,
+        'provident_fund': provident_fund,
+        'tax_deduction': tax,
+        'esi_deduction': esi,
+        'loan_deduction': loan,
+        'other_deductions': other,
+        'gross_salary': gross,
+        'total_deductions': total_deductions,
+        'net_salary': gross - total_deductions,
+        'days_worked': days_worked.astype(np.int64),
+    }
+
+
+def run_payroll(pay_period_start, pay_period_end, processed_by, inputs=None, department=None):
+    """
+    Compute and store payrolls for every active employee for one pay period.
+
+    `inputs` maps employee id -> {days_absent, overtime_hours, bonus,
+    loan_deduction, other_deductions}. Rows are upserted on the
+    (employee, pay_period_start, pay_period_end) key, so re-running a period
+    recomputes unpaid rows in place; rows already marked paid are left alone.
+    Raises ValueError on an invalid period.
+    """
+    if pay_period_end < pay_period_start:
+        raise ValueError('pay_period_end must not be before pay_period_start')
+    inputs = inputs or {}
+    days_in_period = (pay_period_end - pay_period_start).days + 1
+
+    period_payrolls = Payroll.objects.filter(
+        employee=OuterRef('pk'), pay_period_start=pay_period_start, pay_period_end=pay_period_end
+    )
+    employees = Employee.objects.filter(employment_status='active').annotate(
+        already_paid=Exists(period_payrolls.filter(payment_status=True))
+    )
+    if department is not None:
+        employees = employees.filter(department=department)
+    rows = list(employees.order_by('id').values_list('id', 'basic_salary', 'already_paid'))
+
+    skipped_paid = sum(1 for row in rows if row[2])
+    rows = [row for row in rows if not row[2]]
+    summary = {
+        'pay_period_start': pay_period_start,
+        'pay_period_end': pay_period_end,
+        'employees': len(rows),
+        'created': 0,
+        'updated': 0,
+        'skipped_paid': skipped_paid,
+        'total_gross': Decimal('0.00'),
+        'total_deductions': Decimal('0.00'),
+        'total_net': Decimal('0.00'),
+    }
+    if not rows:
+        return summary
+
+    employee_ids = [row[0] for row in rows]
+    existing = {
+        row['employee_id']: row
+        for row in Payroll.objects.filter(
+            employee_id__in=employee_ids, pay_period_start=pay_period_start, pay_period_end=pay_period_end
+        ).values('employee_id', *PAYROLL_INPUT_FIELDS)
+    }
+
+    def input_array(field):
+        values = []
+        for employee_id in employee_ids:
+            value = inputs.get(employee_id, {}).get(field)
+            if value is None:
+                value = existing.get(employee_id, {}).get(field, 0)
+            values.append(float(value))
+        return np.array(values, dtype=np.float64)
+
+    days_absent = np.clip(np.rint(input_array('days_absent')), 0, days_in_period)
+    overtime_hours = np.round(input_array('overtime_hours'), 2)
+    results = compute_payroll(
+        basic=np.array([float(row[1]) for row in rows], dtype=np.float64),
+        days_in_period=days_in_period,
+        days_absent=days_absent,
+        overtime_hours=overtime_hours,
+        bonus=input_array('bonus'),
+        loan=input_array('loan_deduction'),
+        other=input_array('other_deductions'),
+    )
+
+    # Column arrays to per-row Decimals, converted from exact paise
+    columns = {field: [Decimal(int(value)).scaleb(-2) for value in results[field]] for field in PAYROLL_AMOUNT_FIELDS}
+    payrolls = [
+        Payroll(
+            employee_id=employee_id,
+            pay_period_start=pay_period_start,
+            pay_period_end=pay_period_end,
+            days_worked=int(results['days_worked'][index]),
+            days_absent=int(days_absent[index]),
+            overtime_hours=Decimal(f'{overtime_hours[index]:.2f}'),
+            processed_by=processed_by,
+            **{field: columns[field][index] for field in PAYROLL_AMOUNT_FIELDS}
+        )
+        for index, employee_id in enumerate(employee_ids)
+    ]
+
+    upsert_options = {
+        'update_conflicts': True,
+        'update_fields': list(PAYROLL_AMOUNT_FIELDS) + ['days_worked', 'days_absent', 'overtime_hours', 'processed_by'],
+    }
+    # MySQL's ON DUPLICATE KEY UPDATE cannot name the conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        upsert_options['unique_fields'] = ['employee', 'pay_period_start', 'pay_period_end']
+
+    with transaction.atomic():
+        # A row paid since the employees were read must not be recomputed
+        paid_since = set(
+            Payroll.objects.select_for_update().filter(
+                employee_id__in=employee_ids, pay_period_start=pay_period_start,
+                pay_period_end=pay_period_end, payment_status=True
+            ).values_list('employee_id', flat=True)
+        )
+        if paid_since:
+            payrolls = [payroll for payroll in payrolls if payroll.employee_id not in paid_since]
+            summary['skipped_paid'] += len(paid_since)
+        Payroll.objects.bulk_create(payrolls, batch_size=1000, **upsert_options)
+
+    summary['employees'] = len(payrolls)
+    summary['updated'] = sum(1 for payroll in payrolls if payroll.employee_id in existing)
+    summary['created'] = len(payrolls) - summary['updated']
+    summary['total_gross'] = sum((payroll.gross_salary for payroll in payrolls), Decimal('0.00'))
+    summary['total_deductions'] = sum((payroll.total_deductions for payroll in payrolls), Decimal('0.00'))
+    summary['total_net'] = sum((payroll.net_salary for payroll in payrolls), Decimal('0.00'))
+    return summary
@@ -0,0 +1,287 @@
+"""
+PDF generation utilities for employee payslips
+"""
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from django.conf import settings
+from functools import lru_cache
+from io import BytesIO
+import hashlib
+import json
+import os
+import tempfile
+
+# Bump when the payslip layout or wording changes so cached payslips are re-rendered
+PAYSLIP_TEMPLATE_VERSION = 1
+
+PAYSLIP_CACHE_DIR = 'payslips'
+
+EARNING_FIELDS = (
+    ('Basic Salary', 'basic_salary'),
+    ('House Rent Allowance', 'house_rent_allowance'),
+    ('Medical Allowance', 'medical_allowance'),
+    ('Transport Allowance', 'transport_allowance'),
+    ('Special Allowance', 'special_allowance'),
+    ('Overtime', 'overtime_amount'),
+    ('Bonus', 'bonus'),
+)
+
+DEDUCTION_FIELDS = (
+    ('Provident Fund', 'provident_fund'),
+    ('Income Tax (TDS)', 'tax_deduction'),
+    ('ESI', 'esi_deduction'),
+    ('Loan Recovery', 'loan_deduction'),
+    ('Other Deductions', 'other_deductions'),
+)
+
+@lru_cache(maxsize=None)
+def get_payslip_styles():
+    """
+    Build the payslip paragraph and table styles once per process
+    """
+    styles = getSampleStyleSheet()
+
+    return {
+        'title': ParagraphStyle(
+            'PayslipTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        ),
+        'header': ParagraphStyle(
+            'PayslipHeader',
+            parent=styles['Heading2'],
+            fontSize=12,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+        ),
+        'note': ParagraphStyle(
+            'PayslipNote',
+            parent=styles['Normal'],
+            fontSize=8,
+            alignment=TA_CENTER,
+            textColor=colors.grey
+        ),
+        'details_table': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ]),
+        'amounts_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('ALIGN', (3, 0), (3, -1), 'RIGHT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+        'net_table': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+            ('BACKGROUND', (0, 0), (-1, -1), colors.lightblue),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ]),
+    }
+
+def build_payslip_context(payroll):
+    """
+    Collect the values printed on a payslip as plain data
+    """
+    employee = payroll.employee
+    department = getattr(employee, 'department', None)
+
+    context = {
+        'template_version': PAYSLIP_TEMPLATE_VERSION,
+        'payroll_id': payroll.id,
+        'employee_id': employee.employee_id,
+        'employee_name': employee.user.get_full_name() or employee.user.username,
+        'designation': employee.designation,
+        'department_name': department.name if department else None,
+        'bank_name': employee.bank_name,
+        'bank_account_number': employee.bank_account_number,
+        'pan_number': employee.pan_number,
+        'pf_number': employee.pf_number,
+        'pay_period_start': payroll.pay_period_start.isoformat(),
+        'pay_period_end': payroll.pay_period_end.isoformat(),
+        'pay_period_label': payroll.pay_period_start.strftime("%B %Y"),
+        'days_worked': payroll.days_worked,
+        'days_absent': payroll.days_absent,
+        'overtime_hours': str(payroll.overtime_hours),
+        'gross_salary': str(payroll.gross_salary),
+        'total_deductions': str(payroll.total_deductions),
+        'net_salary': str(payroll.net_salary),
+        'payment_date': payroll.payment_date.isoformat() if payroll.payment_date else None,
+    }
+    for _, field in EARNING_FIELDS + DEDUCTION_FIELDS:
+        context[field] = str(getattr(payroll, field))
+    return context
+
+def payslip_content_hash(context):
+    """
+    Hash of the payslip context; a new hash means the payslip must be re-rendered
+    """
+    payload = json.dumps(context, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+def _masked(value):
+    return f"XXXX{value[-4:]}" if value and len(value) > 4 else (value or "N/A")
+
+def build_payslip_story(context):
+    """
+    Flowables for one payslip page
+    """
+    payslip_styles = get_payslip_styles()
+
+    story = [
+        Paragraph("UNIVERSITY ERP SYSTEM", payslip_styles['title']),
+        Paragraph(f"PAYSLIP FOR {context['pay_period_label'].upper()}", payslip_styles['header']),
+        Spacer(1, 10),
+    ]
+
+    details = Table([
+        ["Employee ID:", context['employee_id'], "Pay Period:", f"{context['pay_period_start']} to {context['pay_period_end']}"],
+        ["Name:", context['employee_name'], "Days Worked:", str(context['days_worked'])],
+        ["Designation:", context['designation'], "Days Absent:", str(context['days_absent'])],
+        ["Department:", context['department_name'] or "N/A", "Overtime Hours:", context['overtime_hours']],
+        ["Bank:", context['bank_name'] or "N/A", "Account No:", _masked(context['bank_account_number'])],
+        ["PAN:", context['pan_number'] or "N/A", "PF No:", context['pf_number'] or "N/A"],
+    ], colWidths=[1.1*inch, 2.2*inch, 1.2*inch, 2.2*inch])
+    details.setStyle(payslip_styles['details_table'])
+    story.append(details)
+    story.append(Spacer(1, 16))
+
+    rows = [["Earnings", "Amount (Rs.)", "Deductions", "Amount (Rs.)"]]
+    for index in range(max(len(EARNING_FIELDS), len(DEDUCTION_FIELDS))):
+        earning = EARNING_FIELDS[index] if index < len(EARNING_FIELDS) else None
+        deduction = DEDUCTION_FIELDS[index] if index < len(DEDUCTION_FIELDS) else None
+        rows.append([
+            earning[0] if earning else "",
+            context[earning[1]] if earning else "",
+            deduction[0] if deduction else "",
+            context[deduction[1]] if deduction else "",
+        ])
+    rows.append(["Gross Salary", context['gross_salary'], "Total Deductions", context['total_deductions']])
+
+    amounts = Table(rows, colWidths=[1.9*inch, 1.45*inch, 1.9*inch, 1.45*inch])
+    amounts.setStyle(payslip_styles['amounts_table'])
+    story.append(amounts)
+    story.append(Spacer(1, 12))
+
+    net = Table([["Net Salary Payable", f"Rs. {context['net_salary']}"]], colWidths=[4.5*inch, 2.2*inch])
+    net.setStyle(payslip_styles['net_table'])
+    story.append(net)
+    story.append(Spacer(1, 30))
+
+    story.append(Paragraph(
+        "This is a computer-generated payslip and does not require a signature.",
+        payslip_styles['note']
+    ))
+    return story
+
+def render_payslips_pdf(contexts):
+    """
+    Render one payslip per page into a single PDF; returns the bytes and the page count
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
+
+    story = []
+    for index, context in enumerate(contexts):
+        if index:
+            story.append(PageBreak())
+        story.extend(build_payslip_story(context))
+
+    doc.build(story)
+    return buffer.getvalue(), doc.page
+
+def render_payslip_pdf(context):
+    """
+    Render a single payslip and return the PDF bytes
+    """
+    return render_payslips_pdf([context])[0]
+
+def payslip_cache_path(context, media_root=None):
+    """
+    Location of the cached payslip for a context under MEDIA_ROOT
+    """
+    media_root = media_root or settings.MEDIA_ROOT
+    return os.path.join(
+        str(media_root),
+        PAYSLIP_CACHE_DIR,
+        str(context['payroll_id']),
+        f"{payslip_content_hash(context)}.pdf"
+    )
+
+def merged_payslips_path(pay_period_start, pay_period_end, media_root=None):
+    """
+    Location of the merged payslip PDF of a pay period under MEDIA_ROOT
+    """
+    media_root = media_root or settings.MEDIA_ROOT
+    return os.path.join(
+        str(media_root),
+        PAYSLIP_CACHE_DIR,
+        'periods',
+        f"payslips_{pay_period_start.isoformat()}_{pay_period_end.isoformat()}.pdf"
+    )
+
+def _write_atomically(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_payslip(context, path):
+    """
+    Render a payslip to `path` atomically and drop older versions of it; returns the page count
+    """
+    data, pages = render_payslips_pdf([context])
+    _write_atomically(path, data)
+
+    # Payslips rendered before the payroll was recomputed are stale now
+    directory = os.path.dirname(path)
+    current = os.path.basename(path)
+    for name in os.listdir(directory):
+        if name != current and name.endswith('.pdf'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    return pages
+
+def write_merged_payslips(contexts, path):
+    """
+    Render all payslips of a period into one printable PDF at `path`; returns the page count
+    """
+    data, pages = render_payslips_pdf(contexts)
+    _write_atomically(path, data)
+    return pages
+
+def get_payslip_path(payroll):
+    """
+    Return the path of the cached payslip, rendering it if needed
+    """
+    context = build_payslip_context(payroll)
+    path = payslip_cache_path(context)
+    if not os.path.exists(path):
+        write_payslip(context, path)
+    return path
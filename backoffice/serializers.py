@@ -0,0 +1,81 @@
+from rest_framework import serializers
+from .models import (
+    Employee, Payroll, FinanceAccount, Transaction, FeeStructure,
+    StudentFeePayment, Inventory, StudentFeeBalance
+)
+
+class EmployeeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Employee
+        fields = [
+            'id', 'employee_id', 'employee_type', 'designation', 'employment_status', 'hire_date',
+            'contract_end_date', 'probation_period_months', 'confirmation_date', 'basic_salary',
+            'bank_account_number', 'bank_name', 'bank_ifsc', 'pan_number', 'aadhar_number',
+            'pf_number', 'esi_number', 'created_at', 'updated_at', 'user', 'department'
+        ]
+
+class PayrollSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Payroll
+        fields = [
+            'id', 'pay_period_start', 'pay_period_end', 'basic_salary', 'house_rent_allowance',
+            'medical_allowance', 'transport_allowance', 'special_allowance', 'overtime_amount',
+            'bonus', 'provident_fund', 'tax_deduction', 'esi_deduction', 'loan_deduction',
+            'other_deductions', 'gross_salary', 'total_deductions', 'net_salary', 'days_worked',
+            'days_absent', 'overtime_hours', 'payment_date', 'payment_status', 'remarks',
+            'created_at', 'employee', 'processed_by'
+        ]
+
+class FinanceAccountSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FinanceAccount
+        fields = [
+            'id', 'account_code', 'account_name', 'account_type', 'description', 'is_active',
+            'created_at', 'parent_account'
+        ]
+
+class TransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Transaction
+        fields = [
+            'id', 'transaction_id', 'transaction_type', 'description', 'amount', 'transaction_date',
+            'reference_number', 'created_at', 'account', 'contra_account', 'is_posted', 'posted_at',
+            'student', 'employee', 'created_by'
+        ]
+        read_only_fields = ['is_posted', 'posted_at']
+
+class FeeStructureSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FeeStructure
+        fields = [
+            'id', 'academic_year', 'semester', 'tuition_fee', 'admission_fee', 'development_fee',
+            'laboratory_fee', 'library_fee', 'sports_fee', 'examination_fee', 'hostel_fee',
+            'miscellaneous_fee', 'total_fee', 'late_fee_penalty', 'due_date', 'is_active',
+            'created_at', 'program'
+        ]
+
+class StudentFeePaymentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StudentFeePayment
+        fields = [
+            'id', 'receipt_number', 'amount_due', 'amount_paid', 'payment_date', 'payment_method',
+            'transaction_reference', 'late_fee_applied', 'status', 'remarks', 'created_at',
+            'student', 'fee_structure', 'processed_by'
+        ]
+
+class StudentFeeBalanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StudentFeeBalance
+        fields = [
+            'student', 'total_due', 'total_late_fees', 'total_paid', 'total_waived', 'outstanding',
+            'overdue_amount', 'open_dues', 'next_due_date', 'updated_at'
+        ]
+
+class InventorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Inventory
+        fields = [
+            'id', 'item_code', 'item_name', 'category', 'description', 'brand', 'model',
+            'serial_number', 'purchase_date', 'purchase_price', 'vendor', 'warranty_period_months',
+            'warranty_expiry_date', 'location', 'status', 'created_at', 'updated_at', 'assigned_to'
+        ]
@@ -0,0 +1,89 @@
+"""
+Signal handlers that keep the account closure table, ledger balances, fee balances and removed transaction IDs current
+"""
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import FinanceAccount, Transaction, RemovedTransaction, StudentFeePayment
+from .ledger_utils import (
+    add_account_to_closure, validate_account_parent, move_account_in_closure,
+    post_transaction, unpost_transaction
+)
+from .fee_utils import refresh_fee_balances
+
+# Transaction fields that change what is booked in the ledger
+POSTED_FIELDS = ('account_id', 'contra_account_id', 'amount', 'transaction_date')
+
+
+def _parent_changed(instance):
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or 'parent_account_id' not in loaded:
+        # Saved without loading the stored row; compare against the database
+        loaded = {
+            'parent_account_id': FinanceAccount.objects.filter(pk=instance.pk)
+            .values_list('parent_account_id', flat=True).first()
+        }
+    return loaded['parent_account_id'] != instance.parent_account_id
+
+
+@receiver(pre_save, sender=FinanceAccount)
+def finance_account_validating(sender, instance, **kwargs):
+    if instance.pk and not instance._state.adding and _parent_changed(instance):
+        validate_account_parent(instance)
+        instance._parent_moved = True
+
+
+@receiver(post_save, sender=FinanceAccount)
+def finance_account_saved(sender, instance, created, **kwargs):
+    if created:
+        add_account_to_closure(instance)
+    elif getattr(instance, '_parent_moved', False):
+        move_account_in_closure(instance)
+
+    instance._parent_moved = False
+    instance._loaded_values = {'parent_account_id': instance.parent_account_id}
+
+
+@receiver(pre_save, sender=Transaction)
+def transaction_rebooking(sender, instance, **kwargs):
+    if not instance.pk or instance._state.adding:
+        return
+    stored = Transaction.objects.filter(pk=instance.pk, is_posted=True).values(*POSTED_FIELDS).first()
+    if stored and any(stored[field] != getattr(instance, field) for field in POSTED_FIELDS):
+        # Editing a posted transaction reverses its entries and books it again after the save
+        unpost_transaction(instance)
+        instance._repost = True
+
+
+@receiver(pre_save, sender=Transaction)
+def transaction_renumbering(sender, instance, **kwargs):
+    if not instance.pk or instance._state.adding:
+        return
+    stored_id = Transaction.objects.filter(pk=instance.pk).values_list('transaction_id', flat=True).first()
+    if stored_id is not None and stored_id != instance.transaction_id:
+        # Reports keyed by transaction ID drop the old number's row
+        RemovedTransaction.objects.create(transaction_id=stored_id)
+
+
+@receiver(post_save, sender=Transaction)
+def transaction_saved(sender, instance, created, **kwargs):
+    if getattr(instance, '_repost', False):
+        instance._repost = False
+        post_transaction(instance)
+        instance.refresh_from_db(fields=['is_posted', 'posted_at'])
+
+
+@receiver(pre_delete, sender=Transaction)
+def transaction_deleting(sender, instance, **kwargs):
+    # Take a posted transaction's amounts back out of the stored balances
+    if instance.is_posted:
+        unpost_transaction(instance)
+
+
+@receiver(post_delete, sender=Transaction)
+def transaction_deleted(sender, instance, **kwargs):
+    RemovedTransaction.objects.create(transaction_id=instance.transaction_id)
+
+
+@receiver([post_save, post_delete], sender=StudentFeePayment)
+def fee_payment_changed(sender, instance, **kwargs):
+    refresh_fee_balances(student_ids=[instance.student_id])
@@ -9,15 +9,22 @@ urlpatterns = [
     # Payroll URLs
     path('payroll/', views.PayrollListCreateView.as_view(), name='payroll-list-create'),
     path('payroll/<int:pk>/', views.PayrollDetailView.as_view(), name='payroll-detail'),
+    path('payroll/run/', views.run_payroll_view, name='run-payroll'),
+    path('payroll/<int:pk>/payslip/', views.download_payslip, name='download-payslip'),
 
     # Finance URLs
     path('accounts/', views.FinanceAccountListView.as_view(), name='finance-account-list'),
     path('transactions/', views.TransactionListCreateView.as_view(), name='transaction-list-create'),
+    path('transactions/<int:pk>/post/', views.post_transaction_view, name='post-transaction'),
+    path('ledger/trial-balance/', views.trial_balance_view, name='trial-balance'),
+    path('ledger/balance-sheet/', views.balance_sheet_view, name='balance-sheet'),
 
     # Fee Management URLs
     path('fee-structures/', views.FeeStructureListView.as_view(), name='fee-structure-list'),
     path('fee-payments/', views.StudentFeePaymentListView.as_view(), name='fee-payment-list'),
     path('fee-payments/pay/', views.ProcessFeePaymentView.as_view(), name='process-fee-payment'),
+    path('fee-dues/generate/', views.generate_fee_dues_view, name='generate-fee-dues'),
+    path('fee-balances/<int:student_id>/', views.student_fee_balance, name='student-fee-balance'),
 
     # Inventory URLs
     path('inventory/', views.InventoryListCreateView.as_view(), name='inventory-list-create'),
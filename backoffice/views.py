@@ -1,138 +1,217 @@
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.db import transaction
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from .models import (
     Employee, Payroll, FinanceAccount, Transaction, FeeStructure,
     StudentFeePayment, Inventory
 )
+from .serializers import (
+    EmployeeSerializer, PayrollSerializer, FinanceAccountSerializer,
+    TransactionSerializer, FeeStructureSerializer, StudentFeePaymentSerializer,
+    InventorySerializer, StudentFeeBalanceSerializer
+)
+from university_erp.export_utils import StreamingExportMixin
+from .ledger_utils import post_transaction, parse_period, trial_balance, balance_sheet
+from .payroll_utils import run_payroll
+from .pdf_utils import get_payslip_path
+from .fee_utils import generate_dues, get_student_fee_balance
 
-class EmployeeListCreateView(generics.ListCreateAPIView):
+class EmployeeListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class EmployeeSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Employee
-                fields = '__all__'
-        return EmployeeSerializer
-
 class EmployeeDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class EmployeeSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Employee
-                fields = '__all__'
-        return EmployeeSerializer
-
-class PayrollListCreateView(generics.ListCreateAPIView):
+class PayrollListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Payroll.objects.all()
+    serializer_class = PayrollSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class PayrollSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Payroll
-                fields = '__all__'
-        return PayrollSerializer
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def run_payroll_view(request):
+    """
+    Compute payrolls for all active employees for a pay period.
+
+    Body: {pay_period_start, pay_period_end, department (optional),
+    inputs: [{employee, days_absent, overtime_hours, bonus, loan_deduction, other_deductions}]}
+    """
+    try:
+        pay_period_start = parse_date(str(request.data.get('pay_period_start', '')))
+        pay_period_end = parse_date(str(request.data.get('pay_period_end', '')))
+        if pay_period_start is None or pay_period_end is None:
+            return Response(
+                {'error': 'pay_period_start and pay_period_end are required (YYYY-MM-DD)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        inputs = {}
+        for item in request.data.get('inputs', []) or []:
+            inputs[int(item['employee'])] = {key: value for key, value in item.items() if key != 'employee'}
+
+        summary = run_payroll(
+            pay_period_start,
+            pay_period_end,
+            processed_by=request.user,
+            inputs=inputs,
+            department=request.data.get('department', None)
+        )
+        return Response(summary)
+
+    except (KeyError, TypeError, ValueError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def download_payslip(request, pk):
+    """Download the payslip PDF of a payroll row"""
+    payroll = get_object_or_404(Payroll.objects.select_related('employee__user', 'employee__department'), pk=pk)
+    if not request.user.is_staff and payroll.employee.user_id != request.user.id:
+        return Response({'error': 'You can only download your own payslips'}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        # Served from the cached PDF, rendered only if this version is missing
+        payslip_path = get_payslip_path(payroll)
+        return FileResponse(
+            open(payslip_path, 'rb'),
+            as_attachment=True,
+            filename=f"payslip_{payroll.employee.employee_id}_{payroll.pay_period_start:%Y_%m}.pdf",
+            content_type='application/pdf'
+        )
+
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 class PayrollDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Payroll.objects.all()
+    serializer_class = PayrollSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class PayrollSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Payroll
-                fields = '__all__'
-        return PayrollSerializer
-
-class FinanceAccountListView(generics.ListAPIView):
+class FinanceAccountListView(StreamingExportMixin, generics.ListAPIView):
     queryset = FinanceAccount.objects.all()
+    serializer_class = FinanceAccountSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class FinanceAccountSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = FinanceAccount
-                fields = '__all__'
-        return FinanceAccountSerializer
-
-class TransactionListCreateView(generics.ListCreateAPIView):
+class TransactionListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Transaction.objects.all()
+    serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class TransactionSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Transaction
-                fields = '__all__'
-        return TransactionSerializer
-
-class FeeStructureListView(generics.ListAPIView):
+    def perform_create(self, serializer):
+        # Transactions with a contra account are posted to the ledger in the same database transaction
+        with transaction.atomic():
+            txn = serializer.save()
+            if txn.contra_account_id:
+                try:
+                    serializer.instance = post_transaction(txn)
+                except ValueError as e:
+                    raise serializers.ValidationError({'error': str(e)})
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def post_transaction_view(request, pk):
+    """Post a transaction to the ledger"""
+    txn = get_object_or_404(Transaction, pk=pk)
+    try:
+        txn = post_transaction(txn)
+        return Response(TransactionSerializer(txn).data)
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def trial_balance_view(request):
+    """Trial balance at the end of ?period=YYYY-MM (default: current month)"""
+    try:
+        return Response(trial_balance(parse_period(request.query_params.get('period', None))))
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def balance_sheet_view(request):
+    """Balance sheet at the end of ?period=YYYY-MM (default: current month)"""
+    try:
+        return Response(balance_sheet(parse_period(request.query_params.get('period', None))))
+
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+class FeeStructureListView(StreamingExportMixin, generics.ListAPIView):
     queryset = FeeStructure.objects.all()
+    serializer_class = FeeStructureSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class FeeStructureSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = FeeStructure
-                fields = '__all__'
-        return FeeStructureSerializer
-
-class StudentFeePaymentListView(generics.ListAPIView):
+class StudentFeePaymentListView(StreamingExportMixin, generics.ListAPIView):
     queryset = StudentFeePayment.objects.all()
+    serializer_class = StudentFeePaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class StudentFeePaymentSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = StudentFeePayment
-                fields = '__all__'
-        return StudentFeePaymentSerializer
+    def get_queryset(self):
+        queryset = StudentFeePayment.objects.all()
+        student_id = self.request.query_params.get('student', None)
+        status_filter = self.request.query_params.get('status', None)
+        fee_structure_id = self.request.query_params.get('fee_structure', None)
+
+        if student_id:
+            queryset = queryset.filter(student_id=student_id)
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        if fee_structure_id:
+            queryset = queryset.filter(fee_structure_id=fee_structure_id)
+
+        return queryset
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def generate_fee_dues_view(request):
+    """
+    Generate semester dues from active fee structures.
+
+    Body: {program, semester, academic_year} (all optional filters)
+    """
+    try:
+        created = generate_dues(
+            processed_by=request.user,
+            program_id=request.data.get('program', None),
+            semester=request.data.get('semester', None),
+            academic_year=request.data.get('academic_year', None)
+        )
+        return Response({'created': sum(created.values()), 'fee_structures': created})
+
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def student_fee_balance(request, student_id):
+    """Outstanding fee balance of a student"""
+    balance = get_student_fee_balance(student_id)
+    if balance is None:
+        return Response({'error': 'Student not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(StudentFeeBalanceSerializer(balance).data)
 
 class ProcessFeePaymentView(generics.CreateAPIView):
     queryset = StudentFeePayment.objects.all()
+    serializer_class = StudentFeePaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class StudentFeePaymentSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = StudentFeePayment
-                fields = '__all__'
-        return StudentFeePaymentSerializer
-
-class InventoryListCreateView(generics.ListCreateAPIView):
+class InventoryListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Inventory.objects.all()
+    serializer_class = InventorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class InventorySerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Inventory
-                fields = '__all__'
-        return InventorySerializer
-
 class InventoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Inventory.objects.all()
+    serializer_class = InventorySerializer
     permission_classes = [permissions.IsAuthenticated]
-
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class InventorySerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Inventory
-                fields = '__all__'
-        return InventorySerializer
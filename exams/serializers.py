@@ -0,0 +1,40 @@
+from rest_framework import serializers
+from .models import (
+    Exam, QuestionBank, StudentExam, ExamResult
+)
+
+class ExamSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Exam
+        fields = [
+            'id', 'title', 'description', 'academic_year', 'semester', 'exam_date', 'start_time',
+            'end_time', 'duration_minutes', 'total_marks', 'passing_marks', 'room_number', 'status',
+            'instructions', 'created_at', 'updated_at', 'course', 'exam_type', 'invigilator',
+            'created_by'
+        ]
+
+class QuestionBankSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = QuestionBank
+        fields = [
+            'id', 'question_text', 'question_type', 'difficulty_level', 'marks', 'option_a',
+            'option_b', 'option_c', 'option_d', 'correct_answer', 'explanation', 'topic', 'chapter',
+            'learning_outcome', 'is_active', 'created_at', 'updated_at', 'course', 'created_by'
+        ]
+
+class StudentExamSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StudentExam
+        fields = [
+            'id', 'seat_number', 'registration_date', 'status', 'attendance_marked_at',
+            'special_requirements', 'student', 'exam', 'enrollment'
+        ]
+
+class ExamResultSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExamResult
+        fields = [
+            'id', 'marks_obtained', 'percentage', 'grade', 'grade_points', 'is_passed',
+            'rank_in_class', 'remarks', 'status', 'graded_at', 'published_at', 'created_at',
+            'student_exam', 'graded_by'
+        ]
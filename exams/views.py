@@ -3,99 +3,48 @@ from .models import (
     ExamType, Exam, QuestionBank, ExamQuestion, StudentExam,
     ExamResult, AnswerSheet, QuestionAnswer, GradingRubric
 )
+from .serializers import (
+    ExamSerializer, QuestionBankSerializer, StudentExamSerializer,
+    ExamResultSerializer
+)
+from university_erp.export_utils import StreamingExportMixin
 
-class ExamListCreateView(generics.ListCreateAPIView):
+class ExamListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Exam.objects.all()
+    serializer_class = ExamSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ExamSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Exam
-                fields = '__all__'
-        return ExamSerializer
-
 class ExamDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Exam.objects.all()
+    serializer_class = ExamSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ExamSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Exam
-                fields = '__all__'
-        return ExamSerializer
-
-class QuestionBankListCreateView(generics.ListCreateAPIView):
+class QuestionBankListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = QuestionBank.objects.all()
+    serializer_class = QuestionBankSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class QuestionBankSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = QuestionBank
-                fields = '__all__'
-        return QuestionBankSerializer
-
 class QuestionBankDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = QuestionBank.objects.all()
+    serializer_class = QuestionBankSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class QuestionBankSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = QuestionBank
-                fields = '__all__'
-        return QuestionBankSerializer
-
-class StudentExamListView(generics.ListAPIView):
+class StudentExamListView(StreamingExportMixin, generics.ListAPIView):
     queryset = StudentExam.objects.all()
+    serializer_class = StudentExamSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class StudentExamSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = StudentExam
-                fields = '__all__'
-        return StudentExamSerializer
-
 class ExamRegistrationView(generics.CreateAPIView):
     queryset = StudentExam.objects.all()
+    serializer_class = StudentExamSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class StudentExamSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = StudentExam
-                fields = '__all__'
-        return StudentExamSerializer
-
-class ExamResultListView(generics.ListAPIView):
+class ExamResultListView(StreamingExportMixin, generics.ListAPIView):
     queryset = ExamResult.objects.all()
+    serializer_class = ExamResultSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ExamResultSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = ExamResult
-                fields = '__all__'
-        return ExamResultSerializer
-
 class ExamResultDetailView(generics.RetrieveUpdateAPIView):
     queryset = ExamResult.objects.all()
+    serializer_class = ExamResultSerializer
     permission_classes = [permissions.IsAuthenticated]
-
-    def get_serializer_class(self):
-        from rest_framework import serializers
-        class ExamResultSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = ExamResult
-                fields = '__all__'
-        return ExamResultSerializer
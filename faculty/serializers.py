@@ -3,10 +3,11 @@ from .models import (
     Faculty, CourseAssignment, FacultyLeave, FacultyEvaluation,
     ResearchWork, FacultyWorkload
 )
+from students.cache_utils import CachedReferenceField
 
 class FacultySerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    department_name = CachedReferenceField('department', source='department_id')
 
     class Meta:
         model = Faculty
@@ -15,7 +16,7 @@ class FacultySerializer(serializers.ModelSerializer):
 
 class CourseAssignmentSerializer(serializers.ModelSerializer):
     faculty_name = serializers.CharField(source='faculty.user.get_full_name', read_only=True)
-    course_name = serializers.CharField(source='course.name', read_only=True)
+    course_name = CachedReferenceField('course', source='course_id')
 
     class Meta:
         model = CourseAssignment
@@ -31,7 +32,7 @@ class FacultyLeaveSerializer(serializers.ModelSerializer):
 
 class FacultyEvaluationSerializer(serializers.ModelSerializer):
     faculty_name = serializers.CharField(source='faculty.user.get_full_name', read_only=True)
-    course_name = serializers.CharField(source='course.name', read_only=True)
+    course_name = CachedReferenceField('course', source='course_id')
 
     class Meta:
         model = FacultyEvaluation
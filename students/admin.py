@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Department, Program, Student, Course, Enrollment,
-    Attendance, Assignment, AssignmentSubmission
+    Attendance, Assignment, AssignmentSubmission, StudentDashboardSnapshot
 )
 
 @admin.register(Department)
@@ -57,3 +57,10 @@ class AssignmentSubmissionAdmin(admin.ModelAdmin):
     list_filter = ('status', 'assignment__assignment_type', 'submitted_at')
     search_fields = ('student__student_id', 'assignment__title')
     date_hierarchy = 'submitted_at'
+
+@admin.register(StudentDashboardSnapshot)
+class StudentDashboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('student', 'is_stale', 'version', 'valid_until', 'built_at')
+    list_filter = ('is_stale',)
+    search_fields = ('student__student_id',)
+    readonly_fields = ('data', 'version', 'built_at', 'updated_at')
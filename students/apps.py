@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+
+    def ready(self):
+        from django.core.checks import register
+        from university_erp.cache_utils import check_shared_cache
+        from . import signals  # noqa: F401
+        register(check_shared_cache)
@@ -0,0 +1,220 @@
+"""
+Attendance utilities for bulk marking and enrollment attendance counters
+"""
+from collections import defaultdict
+from datetime import date as date_type
+from decimal import Decimal
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils.dateparse import parse_date
+from .models import Enrollment, Attendance
+from .dashboard_utils import mark_dashboards_stale
+
+# Statuses that count towards an enrollment's attendance percentage
+ATTENDED_STATUSES = ('present', 'late')
+VALID_STATUSES = tuple(choice for choice, _ in Attendance.ATTENDANCE_STATUS)
+
+# Per-status counter column on Enrollment
+STATUS_COUNTER_FIELDS = {
+    'present': 'attendance_present',
+    'absent': 'attendance_absent',
+    'late': 'attendance_late',
+    'excused': 'attendance_excused',
+}
+
+
+def _percentage_expression(attended, total):
+    return Coalesce(
+        Cast(attended * Value(100.0) / NullIf(total, 0), output_field=DecimalField(max_digits=5, decimal_places=2)),
+        Value(Decimal('0.00'))
+    )
+
+
+def apply_attendance_deltas(deltas):
+    """
+    Adjust enrollment attendance counters in place.
+
+    `deltas` maps enrollment id -> {status: change}. Enrollments sharing the
+    same change are updated together, so a whole class session costs a
+    handful of UPDATEs however many students it has, and no attendance
+    history is read.
+    """
+    groups = defaultdict(list)
+    for enrollment_id, changes in deltas.items():
+        key = tuple(sorted((status, change) for status, change in changes.items() if change))
+        if key:
+            groups[key].append(enrollment_id)
+
+    for key, enrollment_ids in groups.items():
+        changes = dict(key)
+        total_change = sum(changes.values())
+        attended_change = sum(changes.get(status, 0) for status in ATTENDED_STATUSES)
+        attended = sum((F(STATUS_COUNTER_FIELDS[status]) for status in ATTENDED_STATUSES), Value(attended_change))
+
+        # The percentage is assigned first: MySQL evaluates SET clauses left to right,
+        # so it must be computed from the counters before they are incremented
+        values = {
+            'attendance_percentage': _percentage_expression(attended, F('attendance_total') + total_change),
+        }
+        for status, change in changes.items():
+            values[STATUS_COUNTER_FIELDS[status]] = F(STATUS_COUNTER_FIELDS[status]) + change
+        # updated_at is left alone: it marks enrollment and status changes for the enrollment report
+        values['attendance_total'] = F('attendance_total') + total_change
+
+        Enrollment.objects.filter(id__in=enrollment_ids).update(**values)
+
+
+def record_attendance_change(deltas, enrollment_id, old_status=None, new_status=None):
+    """
+    Add one attendance write to a deltas dict for apply_attendance_deltas
+    """
+    if old_status == new_status:
+        return deltas
+    changes = deltas.setdefault(enrollment_id, defaultdict(int))
+    if old_status in STATUS_COUNTER_FIELDS:
+        changes[old_status] -= 1
+    if new_status in STATUS_COUNTER_FIELDS:
+        changes[new_status] += 1
+    return deltas
+
+
+def rebuild_attendance_stats(course_ids=None, enrollment_ids=None):
+    """
+    Recompute enrollment counters and percentages from attendance history.
+
+    Runs one grouped aggregate per course and bulk-updates its enrollments.
+    Returns the number of enrollments rewritten.
+    """
+    enrollments = Enrollment.objects.all()
+    if course_ids is not None:
+        enrollments = enrollments.filter(course_id__in=course_ids)
+    if enrollment_ids is not None:
+        enrollments = enrollments.filter(id__in=enrollment_ids)
+
+    fields = list(STATUS_COUNTER_FIELDS.values()) + ['attendance_total', 'attendance_percentage']
+    rebuilt = 0
+    for course_id in enrollments.order_by().values_list('course_id', flat=True).distinct():
+        course_enrollments = list(enrollments.filter(course_id=course_id).only('id'))
+        counts = {
+            row['enrollment_id']: row
+            for row in Attendance.objects.filter(enrollment__in=[e.id for e in course_enrollments])
+            .values('enrollment_id')
+            .annotate(
+                total=Count('id'),
+                **{status: Count('id', filter=Q(status=status)) for status in STATUS_COUNTER_FIELDS}
+            )
+        }
+
+        for enrollment in course_enrollments:
+            row = counts.get(enrollment.id, {})
+            for status, field in STATUS_COUNTER_FIELDS.items():
+                setattr(enrollment, field, row.get(status, 0))
+            enrollment.attendance_total = row.get('total', 0)
+            attended = sum(row.get(status, 0) for status in ATTENDED_STATUSES)
+            enrollment.attendance_percentage = (
+                (Decimal(attended) * 100 / enrollment.attendance_total).quantize(Decimal('0.01'))
+                if enrollment.attendance_total else Decimal('0.00')
+            )
+
+        Enrollment.objects.bulk_update(course_enrollments, fields, batch_size=1000)
+        rebuilt += len(course_enrollments)
+
+    return rebuilt
+
+
+def bulk_mark_attendance(course, date, records, marked_by):
+    """
+    Mark attendance for a whole class session in one transaction.
+
+    `records` is a list of `{enrollment_id, status, remarks}` dicts. Rows are
+    upserted on the (enrollment, date) unique key with a single INSERT ... ON
+    CONFLICT/ON DUPLICATE KEY UPDATE, then the attendance counters of the
+    affected enrollments are adjusted with set-based UPDATEs.
+    Returns a summary and per-row results; raises ValueError on bad input.
+    """
+    if isinstance(date, str):
+        parsed = parse_date(date)
+        if parsed is None:
+            raise ValueError(f"Invalid date '{date}'. Use YYYY-MM-DD.")
+        date = parsed
+    if not isinstance(date, date_type):
+        raise ValueError('A session date is required')
+    if not records:
+        raise ValueError('At least one attendance record is required')
+
+    results = []
+    summary = {'created': 0, 'updated': 0, 'skipped': 0}
+
+    wanted = {}
+    for record in records:
+        enrollment_id = record.get('enrollment_id')
+        attendance_status = record.get('status')
+        detail = None
+        try:
+            enrollment_id = int(enrollment_id)
+        except (TypeError, ValueError):
+            detail = 'Invalid enrollment_id'
+        if detail is None and attendance_status not in VALID_STATUSES:
+            detail = f"Invalid status '{attendance_status}'. Expected one of: {', '.join(VALID_STATUSES)}"
+        if detail is None and enrollment_id in wanted:
+            detail = 'Duplicate enrollment in this request'
+
+        if detail:
+            results.append({'enrollment_id': enrollment_id, 'status': attendance_status, 'outcome': 'skipped', 'detail': detail})
+            summary['skipped'] += 1
+            continue
+        wanted[enrollment_id] = record
+
+    with transaction.atomic():
+        valid_ids = set(
+            Enrollment.objects.filter(course=course, id__in=list(wanted)).values_list('id', flat=True)
+        )
+        existing_statuses = dict(
+            Attendance.objects.select_for_update().filter(enrollment_id__in=valid_ids, date=date)
+            .values_list('enrollment_id', 'status')
+        )
+
+        rows = []
+        for enrollment_id, record in wanted.items():
+            if enrollment_id not in valid_ids:
+                results.append({
+                    'enrollment_id': enrollment_id,
+                    'status': record.get('status'),
+                    'outcome': 'skipped',
+                    'detail': 'Enrollment not found for this course',
+                })
+                summary['skipped'] += 1
+                continue
+
+            outcome = 'updated' if enrollment_id in existing_statuses else 'created'
+            summary[outcome] += 1
+            results.append({'enrollment_id': enrollment_id, 'status': record['status'], 'outcome': outcome, 'detail': None})
+            rows.append(Attendance(
+                enrollment_id=enrollment_id,
+                date=date,
+                status=record['status'],
+                remarks=record.get('remarks') or '',
+                marked_by=marked_by,
+            ))
+
+        if rows:
+            upsert_options = {'update_conflicts': True, 'update_fields': ['status', 'remarks', 'marked_by']}
+            # MySQL's ON DUPLICATE KEY UPDATE cannot name the conflict target
+            if connection.features.supports_update_conflicts_with_target:
+                upsert_options['unique_fields'] = ['enrollment', 'date']
+            Attendance.objects.bulk_create(rows, **upsert_options)
+
+            # bulk_create skips model signals, so counters are adjusted here
+            deltas = {}
+            for row in rows:
+                record_attendance_change(deltas, row.enrollment_id, existing_statuses.get(row.enrollment_id), row.status)
+            apply_attendance_deltas(deltas)
+            mark_dashboards_stale(enrollment_ids=[row.enrollment_id for row in rows])
+
+    return {
+        'course_id': course.id,
+        'date': date,
+        'summary': summary,
+        'results': results,
+    }
@@ -0,0 +1,210 @@
+"""
+Reference data cache utilities for departments, programs, courses, exam types and fee structures
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from rest_framework import serializers
+from university_erp.cache_utils import shared_cache_configured
+
+logger = logging.getLogger(__name__)
+
+# Cached tables: name -> (model, fields kept per row)
+REFERENCE_TABLES = {
+    'department': ('students.Department', ('id', 'name', 'code', 'is_active')),
+    'program': ('students.Program', ('id', 'name', 'code', 'program_type', 'department_id', 'is_active')),
+    'course': ('students.Course', ('id', 'name', 'code', 'credits', 'department_id', 'semester', 'year', 'is_active')),
+    'exam_type': ('exams.ExamType', ('id', 'name', 'weightage_percentage', 'is_active')),
+    'fee_structure': (
+        'backoffice.FeeStructure',
+        ('id', 'program_id', 'academic_year', 'semester', 'total_fee', 'late_fee_penalty', 'due_date', 'is_active')
+    ),
+}
+
+CACHE_KEY_PREFIX = 'refdata'
+
+_local_tables = OrderedDict()  # name -> (version, checked_at, rows), least recently used first
+_local_lock = threading.Lock()
+_pending = threading.local()  # Tables changed in this thread's open transaction
+
+
+def _settings():
+    return (
+        getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 86400),
+        getattr(settings, 'REFERENCE_CACHE_LOCAL_TTL', 5),
+        getattr(settings, 'REFERENCE_CACHE_LOCAL_SIZE', 16),
+    )
+
+
+def _version_key(name):
+    return f"{CACHE_KEY_PREFIX}:{name}:version"
+
+
+def _rows_key(name, version):
+    return f"{CACHE_KEY_PREFIX}:{name}:{version}"
+
+
+def load_reference_table(name):
+    """
+    Read a reference table from the database as {pk: row dict}
+    """
+    model_label, fields = REFERENCE_TABLES[name]
+    model = apps.get_model(model_label)
+    rows = {row['id']: row for row in model.objects.order_by().values(*fields)}
+
+    if name == 'course':
+        for row in rows.values():
+            row['prerequisite_ids'] = []
+            row['prerequisite_names'] = []
+        for course_id, prerequisite_id in model.prerequisites.through.objects.order_by(
+            'from_course_id', 'to_course_id'
+        ).values_list('from_course_id', 'to_course_id'):
+            prerequisite = rows.get(prerequisite_id)
+            if course_id in rows and prerequisite:
+                rows[course_id]['prerequisite_ids'].append(prerequisite_id)
+                rows[course_id]['prerequisite_names'].append(f"{prerequisite['code']} - {prerequisite['name']}")
+    return rows
+
+
+def _pending_invalidations():
+    names = getattr(_pending, 'names', None)
+    if names is None:
+        names = _pending.names = set()
+    if not connection.in_atomic_block:
+        # Committed or rolled back since; either way the shared version is current
+        names.clear()
+    return names
+
+
+def _shared_version(name):
+    version = cache.get(_version_key(name))
+    if version is None:
+        cache.add(_version_key(name), uuid.uuid4().hex, timeout=None)
+        version = cache.get(_version_key(name))
+    return version
+
+
+def get_reference_table(name):
+    """
+    Return a whole reference table as {pk: row dict}.
+
+    Lookups are served from an in-process LRU. Every REFERENCE_CACHE_LOCAL_TTL
+    seconds a process compares its copy with the table's version in the
+    shared cache; on a version change it takes the rows stored under the new
+    version there, and only the first process to miss reads the database.
+    Without Redis/Memcached (see shared_cache_configured) the copy is simply
+    reread from the database once it is REFERENCE_CACHE_LOCAL_TTL old.
+    """
+    if name in _pending_invalidations():
+        # Changed in the open transaction: other processes must not see these rows yet
+        return load_reference_table(name)
+
+    timeout, local_ttl, local_size = _settings()
+    now = time.monotonic()
+    with _local_lock:
+        local = _local_tables.get(name)
+        if local is not None and now - local[1] < local_ttl:
+            _local_tables.move_to_end(name)
+            return local[2]
+
+    if not shared_cache_configured():
+        # Other processes could not see a version bumped in a per-process cache; reread the table instead
+        version, rows = None, load_reference_table(name)
+    else:
+        try:
+            version = _shared_version(name)
+            rows = local[2] if local is not None and local[0] == version else cache.get(_rows_key(name, version))
+            if rows is None:
+                rows = load_reference_table(name)
+                cache.set(_rows_key(name, version), rows, timeout)
+        except Exception as e:
+            # The shared cache being down must not take the API with it
+            logger.warning(f"Reference cache unavailable for {name}: {str(e)}")
+            version, rows = None, load_reference_table(name)
+
+    with _local_lock:
+        _local_tables[name] = (version, now, rows)
+        _local_tables.move_to_end(name)
+        while len(_local_tables) > local_size:
+            _local_tables.popitem(last=False)
+    return rows
+
+
+def get_reference(name, pk):
+    """
+    Return the cached row of one reference object, or None
+    """
+    if pk is None:
+        return None
+    return get_reference_table(name).get(pk)
+
+
+def invalidate_reference(name):
+    """
+    Serve a changed reference table fresh to the open transaction and bump its shared version on commit
+    """
+    if connection.in_atomic_block:
+        _pending_invalidations().add(name)
+
+    def bump_version():
+        _pending_invalidations().discard(name)
+        with _local_lock:
+            _local_tables.pop(name, None)
+        if not shared_cache_configured():
+            return
+        try:
+            cache.set(_version_key(name), uuid.uuid4().hex, timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate reference cache for {name}: {str(e)}")
+
+    transaction.on_commit(bump_version)
+
+
+def clear_local_reference_cache():
+    """
+    Forget every table cached in this process
+    """
+    with _local_lock:
+        _local_tables.clear()
+
+
+class CachedReferenceField(serializers.ReadOnlyField):
+    """
+    Read-only serializer field that renders an attribute of a related
+    reference object from the reference cache, given its id as the source,
+    e.g. CachedReferenceField('department', source='department_id').
+    """
+
+    def __init__(self, reference, attribute='name', **kwargs):
+        self.reference = reference
+        self.attribute = attribute
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        row = get_reference(self.reference, value)
+        return row.get(self.attribute) if row else None
+
+
+class CachedManyRelatedField(serializers.ManyRelatedField):
+    """
+    Many-to-many primary key field whose ids are read from the reference
+    cache instead of the join table; writes still go through `child_relation`.
+    """
+
+    def __init__(self, reference, attribute, **kwargs):
+        self.reference = reference
+        self.attribute = attribute
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        row = get_reference(self.reference, instance.pk)
+        return row[self.attribute] if row else []
+
+    def to_representation(self, iterable):
+        return list(iterable)
@@ -0,0 +1,158 @@
+"""
+Student dashboard snapshot utilities
+"""
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import Student, Enrollment, Attendance, Assignment, StudentDashboardSnapshot
+from .serializers import StudentSerializer, EnrollmentSerializer, AttendanceSerializer, AssignmentSerializer
+
+UPCOMING_ASSIGNMENT_LIMIT = 5
+RECENT_ATTENDANCE_LIMIT = 10
+RECENT_ATTENDANCE_DAYS = 30
+
+
+def build_dashboard_data(student):
+    """
+    Compute the dashboard payload for a student.
+
+    Returns the payload and the time after which it must be rebuilt even if
+    nothing changed: when the next upcoming assignment falls due, when the
+    oldest attendance record leaves the 30-day window, or after the
+    configured TTL, whichever comes first.
+    """
+    now = timezone.now()
+    today = timezone.localdate()
+
+    current_enrollments = list(
+        Enrollment.objects.filter(student=student, status='enrolled')
+        .select_related('course', 'student__user')
+    )
+
+    upcoming_assignments = list(
+        Assignment.objects.filter(
+            course__in=Enrollment.objects.filter(student=student, status='enrolled').values('course_id'),
+            due_date__gte=now
+        )
+        .select_related('course', 'created_by')
+        .order_by('due_date')[:UPCOMING_ASSIGNMENT_LIMIT]
+    )
+
+    recent_attendance = list(
+        Attendance.objects.filter(
+            enrollment__student=student,
+            date__gte=today - timedelta(days=RECENT_ATTENDANCE_DAYS)
+        )
+        .select_related('enrollment__student__user', 'enrollment__course')
+        .order_by('-date')[:RECENT_ATTENDANCE_LIMIT]
+    )
+
+    # Overall attendance weights each enrollment's stored percentage by its session count
+    total_sessions = sum(enrollment.attendance_total for enrollment in current_enrollments)
+    attended_sessions = sum(
+        float(enrollment.attendance_percentage) * enrollment.attendance_total for enrollment in current_enrollments
+    ) / 100
+    academic_summary = {
+        'current_semester': student.current_semester,
+        'current_year': student.current_year,
+        'cgpa': float(student.cgpa),
+        'total_credits': student.total_credits_earned,
+        'attendance_percentage': round(attended_sessions / max(total_sessions, 1) * 100, 2)
+    }
+
+    data = {
+        'student_info': StudentSerializer(student).data,
+        'current_enrollments': EnrollmentSerializer(current_enrollments, many=True).data,
+        'upcoming_assignments': AssignmentSerializer(upcoming_assignments, many=True).data,
+        'recent_attendance': AttendanceSerializer(recent_attendance, many=True).data,
+        'academic_summary': academic_summary
+    }
+
+    ttl = getattr(settings, 'STUDENT_DASHBOARD_SNAPSHOT_TTL', 3600)
+    candidates = [now + timedelta(seconds=ttl)]
+    if upcoming_assignments:
+        candidates.append(upcoming_assignments[0].due_date)
+    if recent_attendance:
+        oldest = recent_attendance[-1].date + timedelta(days=RECENT_ATTENDANCE_DAYS + 1)
+        candidates.append(timezone.make_aware(datetime.combine(oldest, time.min)))
+
+    return data, min(candidates)
+
+
+def refresh_dashboard_snapshot(student):
+    """
+    Rebuild and store a student's snapshot, returning the fresh payload.
+
+    The row's version is read before building; the payload is only stored if
+    no change marked the snapshot stale in the meantime, so a concurrent
+    write is never hidden behind an older payload.
+    """
+    snapshot, _ = StudentDashboardSnapshot.objects.get_or_create(
+        student=student,
+        defaults={'valid_until': timezone.now()}
+    )
+    version = snapshot.version
+
+    data, valid_until = build_dashboard_data(student)
+
+    StudentDashboardSnapshot.objects.filter(id=snapshot.id, version=version).update(
+        data=data,
+        is_stale=False,
+        valid_until=valid_until,
+        built_at=timezone.now(),
+        updated_at=timezone.now()
+    )
+    return data
+
+
+def get_dashboard_snapshot(student_id):
+    """
+    Return a fresh snapshot payload in one read, or None if it must be rebuilt
+    """
+    return (
+        StudentDashboardSnapshot.objects
+        .filter(student_id=student_id, is_stale=False, valid_until__gt=timezone.now())
+        .values_list('data', flat=True)
+        .first()
+    )
+
+
+def mark_dashboards_stale(student_ids=None, enrollment_ids=None, course_ids=None):
+    """
+    Flag the snapshots affected by a change so the next read rebuilds them.
+
+    Also used by bulk write paths that bypass model signals.
+    """
+    snapshots = StudentDashboardSnapshot.objects.all()
+    if student_ids is not None:
+        snapshots = snapshots.filter(student_id__in=student_ids)
+    elif enrollment_ids is not None:
+        snapshots = snapshots.filter(
+            student_id__in=Enrollment.objects.filter(id__in=enrollment_ids).values('student_id')
+        )
+    elif course_ids is not None:
+        snapshots = snapshots.filter(
+            student_id__in=Enrollment.objects.filter(course_id__in=course_ids, status='enrolled').values('student_id')
+        )
+    else:
+        return 0
+
+    return snapshots.update(is_stale=True, version=F('version') + 1)
+
+
+def warm_dashboard_snapshots(students=None, batch_size=500):
+    """
+    Build every missing, stale or expired snapshot ahead of peak traffic
+    """
+    if students is None:
+        students = Student.objects.filter(status='active')
+
+    fresh = StudentDashboardSnapshot.objects.filter(is_stale=False, valid_until__gt=timezone.now())
+    students = students.exclude(id__in=fresh.values('student_id')).select_related('user', 'program')
+
+    built = 0
+    for student in students.iterator(chunk_size=batch_size):
+        refresh_dashboard_snapshot(student)
+        built += 1
+    return built
@@ -0,0 +1,25 @@
+"""
+Django management command to pre-build student dashboard snapshots
+"""
+import time
+from django.core.management.base import BaseCommand
+from students.models import Student
+from students.dashboard_utils import warm_dashboard_snapshots
+
+class Command(BaseCommand):
+    help = 'Build missing, stale or expired student dashboard snapshots ahead of peak traffic'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--program', type=int, help='Only build snapshots for students of this program ID')
+        parser.add_argument('--batch-size', type=int, default=500, help='Students fetched per database round trip')
+
+    def handle(self, *args, **options):
+        students = Student.objects.filter(status='active')
+        if options['program']:
+            students = students.filter(program_id=options['program'])
+
+        started = time.monotonic()
+        built = warm_dashboard_snapshots(students, batch_size=options['batch_size'])
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Built {built} dashboard snapshots in {elapsed:.1f}s'))
@@ -0,0 +1,30 @@
+"""
+Django management command to recompute enrollment attendance counters from attendance history
+"""
+import time
+from django.core.management.base import BaseCommand
+from students.attendance_utils import rebuild_attendance_stats
+from students.models import Enrollment
+from students.dashboard_utils import mark_dashboards_stale
+
+class Command(BaseCommand):
+    help = 'Recompute per-enrollment attendance counts and percentages with one grouped aggregate per course'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            action='append',
+            help='Only rebuild enrollments of this course ID (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rebuilt = rebuild_attendance_stats(course_ids=options['course'])
+        if options['course']:
+            mark_dashboards_stale(course_ids=options['course'])
+        else:
+            mark_dashboards_stale(student_ids=Enrollment.objects.values('student_id'))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt attendance stats for {rebuilt} enrollments in {elapsed:.1f}s'))
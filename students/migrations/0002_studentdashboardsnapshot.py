@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:46
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentDashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('is_stale', models.BooleanField(default=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('valid_until', models.DateTimeField()),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshot', to='students.student')),
+            ],
+        ),
+    ]
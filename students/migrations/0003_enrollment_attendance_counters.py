@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_studentdashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='attendance_absent',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='attendance_excused',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='attendance_late',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='attendance_present',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='attendance_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:20
+
+from decimal import Decimal
+from django.db import migrations
+from django.db.models import Count, Q
+
+ATTENDED_STATUSES = ('present', 'late')
+STATUS_COUNTER_FIELDS = {
+    'present': 'attendance_present',
+    'absent': 'attendance_absent',
+    'late': 'attendance_late',
+    'excused': 'attendance_excused',
+}
+
+
+# Same grouped aggregate per course as students.attendance_utils.rebuild_attendance_stats
+def backfill_attendance_counters(apps, schema_editor):
+    Enrollment = apps.get_model('students', 'Enrollment')
+    Attendance = apps.get_model('students', 'Attendance')
+
+    fields = list(STATUS_COUNTER_FIELDS.values()) + ['attendance_total', 'attendance_percentage']
+    course_ids = Attendance.objects.order_by().values_list('enrollment__course_id', flat=True).distinct()
+    for course_id in course_ids:
+        counts = {
+            row['enrollment_id']: row
+            for row in Attendance.objects.filter(enrollment__course_id=course_id)
+            .values('enrollment_id')
+            .annotate(
+                total=Count('id'),
+                **{status: Count('id', filter=Q(status=status)) for status in STATUS_COUNTER_FIELDS}
+            )
+        }
+        enrollments = list(Enrollment.objects.filter(id__in=list(counts)).only('id'))
+        for enrollment in enrollments:
+            row = counts[enrollment.id]
+            for status, field in STATUS_COUNTER_FIELDS.items():
+                setattr(enrollment, field, row[status])
+            enrollment.attendance_total = row['total']
+            attended = sum(row[status] for status in ATTENDED_STATUSES)
+            enrollment.attendance_percentage = (Decimal(attended) * 100 / row['total']).quantize(Decimal('0.01'))
+        Enrollment.objects.bulk_update(enrollments, fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_enrollment_attendance_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_attendance_counters, migrations.RunPython.noop),
+    ]
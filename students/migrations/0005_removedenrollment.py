@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_backfill_attendance_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemovedEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', models.BigIntegerField()),
+                ('semester', models.PositiveIntegerField()),
+                ('year', models.PositiveIntegerField()),
+                ('removed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
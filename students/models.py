@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 class Department(models.Model):
     """University Departments"""
@@ -117,6 +118,11 @@ class Enrollment(models.Model):
     grade = models.CharField(max_length=5, blank=True)
     gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
     attendance_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
+    attendance_present = models.PositiveIntegerField(default=0)
+    attendance_absent = models.PositiveIntegerField(default=0)
+    attendance_late = models.PositiveIntegerField(default=0)
+    attendance_excused = models.PositiveIntegerField(default=0)
+    attendance_total = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -126,6 +132,17 @@ class Enrollment(models.Model):
     def __str__(self):
         return f"{self.student.student_id} - {self.course.code}"
 
+class RemovedEnrollment(models.Model):
+    """Course/semester/year group an enrollment left, by deletion or by moving to another group"""
+    # Not a foreign key, so the record outlives a deleted course
+    course_id = models.BigIntegerField()
+    semester = models.PositiveIntegerField()
+    year = models.PositiveIntegerField()
+    removed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.course_id} {self.year}/{self.semester} removed {self.removed_at}"
+
 class Attendance(models.Model):
     """Student Attendance Records"""
     ATTENDANCE_STATUS = (
@@ -145,6 +162,15 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ['enrollment', 'date']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so the enrollment counters can be adjusted by delta on save
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
     def __str__(self):
         return f"{self.enrollment.student.student_id} - {self.date} - {self.status}"
 
@@ -197,3 +223,16 @@ class AssignmentSubmission(models.Model):
 
     def __str__(self):
         return f"{self.student.student_id} - {self.assignment.title}"
+
+class StudentDashboardSnapshot(models.Model):
+    """Precomputed dashboard payload served by the student dashboard API"""
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, related_name='dashboard_snapshot')
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    is_stale = models.BooleanField(default=True)
+    version = models.PositiveIntegerField(default=0)
+    valid_until = models.DateTimeField()
+    built_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard snapshot - {self.student_id}"
@@ -3,6 +3,7 @@ from .models import (
     Department, Program, Student, Course, Enrollment,
     Attendance, Assignment, AssignmentSubmission
 )
+from .cache_utils import CachedReferenceField, CachedManyRelatedField
 
 class DepartmentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,7 +11,7 @@ class DepartmentSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class ProgramSerializer(serializers.ModelSerializer):
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    department_name = CachedReferenceField('department', source='department_id')
 
     class Meta:
         model = Program
@@ -18,7 +19,7 @@ class ProgramSerializer(serializers.ModelSerializer):
 
 class StudentSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
-    program_name = serializers.CharField(source='program.name', read_only=True)
+    program_name = CachedReferenceField('program', source='program_id')
 
     class Meta:
         model = Student
@@ -26,8 +27,13 @@ class StudentSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class CourseSerializer(serializers.ModelSerializer):
-    department_name = serializers.CharField(source='department.name', read_only=True)
-    prerequisites_names = serializers.StringRelatedField(source='prerequisites', read_only=True, many=True)
+    department_name = CachedReferenceField('department', source='department_id')
+    prerequisites = CachedManyRelatedField(
+        'course', 'prerequisite_ids',
+        child_relation=serializers.PrimaryKeyRelatedField(queryset=Course.objects.all()),
+        required=False
+    )
+    prerequisites_names = CachedReferenceField('course', attribute='prerequisite_names', source='id')
 
     class Meta:
         model = Course
@@ -35,7 +41,7 @@ class CourseSerializer(serializers.ModelSerializer):
 
 class EnrollmentSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
-    course_name = serializers.CharField(source='course.name', read_only=True)
+    course_name = CachedReferenceField('course', source='course_id')
 
     class Meta:
         model = Enrollment
@@ -44,14 +50,14 @@ class EnrollmentSerializer(serializers.ModelSerializer):
 
 class AttendanceSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='enrollment.student.user.get_full_name', read_only=True)
-    course_name = serializers.CharField(source='enrollment.course.name', read_only=True)
+    course_name = CachedReferenceField('course', source='enrollment.course_id')
 
     class Meta:
         model = Attendance
         fields = '__all__'
 
 class AssignmentSerializer(serializers.ModelSerializer):
-    course_name = serializers.CharField(source='course.name', read_only=True)
+    course_name = CachedReferenceField('course', source='course_id')
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
 
     class Meta:
@@ -0,0 +1,103 @@
+"""
+Signal handlers that keep student dashboard snapshots, attendance counters, removed enrollment groups and the
+reference cache current
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Student, Course, Enrollment, RemovedEnrollment, Attendance, Assignment
+from .dashboard_utils import mark_dashboards_stale
+from .attendance_utils import apply_attendance_deltas, record_attendance_change, rebuild_attendance_stats
+from .cache_utils import REFERENCE_TABLES, invalidate_reference
+
+
+@receiver([post_save, post_delete], sender=Student)
+def student_changed(sender, instance, **kwargs):
+    mark_dashboards_stale(student_ids=[instance.id])
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def enrollment_changed(sender, instance, **kwargs):
+    mark_dashboards_stale(student_ids=[instance.student_id])
+
+
+@receiver(pre_save, sender=Enrollment)
+def enrollment_regrouping(sender, instance, **kwargs):
+    if not instance.pk or instance._state.adding:
+        return
+    stored = Enrollment.objects.filter(pk=instance.pk).values('course_id', 'semester', 'year').first()
+    if stored and any(stored[field] != getattr(instance, field) for field in stored):
+        # The group it leaves is recounted by the next incremental enrollment report
+        RemovedEnrollment.objects.create(**stored)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    RemovedEnrollment.objects.create(course_id=instance.course_id, semester=instance.semester, year=instance.year)
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def attendance_changed(sender, instance, **kwargs):
+    mark_dashboards_stale(enrollment_ids=[instance.enrollment_id])
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, created, **kwargs):
+    loaded = getattr(instance, '_loaded_values', None)
+    if not created and 'status' not in (loaded or {}):
+        # Saved over an existing row without loading it; the previous status is unknown
+        rebuild_attendance_stats(enrollment_ids=[instance.enrollment_id])
+    else:
+        deltas = {}
+        old_enrollment_id = loaded.get('enrollment_id') if loaded else None
+        old_status = loaded.get('status') if loaded else None
+        if old_enrollment_id is not None and old_enrollment_id != instance.enrollment_id:
+            record_attendance_change(deltas, old_enrollment_id, old_status, None)
+            old_status = None
+        record_attendance_change(deltas, instance.enrollment_id, old_status, instance.status)
+        apply_attendance_deltas(deltas)
+
+    instance._loaded_values = {'enrollment_id': instance.enrollment_id, 'status': instance.status}
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    apply_attendance_deltas(record_attendance_change(
+        {}, loaded.get('enrollment_id', instance.enrollment_id), loaded.get('status', instance.status), None
+    ))
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+def assignment_changed(sender, instance, **kwargs):
+    mark_dashboards_stale(course_ids=[instance.course_id])
+
+
+@receiver(post_save, sender=Course)
+def course_changed(sender, instance, created, **kwargs):
+    if not created:
+        mark_dashboards_stale(course_ids=[instance.id])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def student_user_changed(sender, instance, created, update_fields=None, **kwargs):
+    # Student names are embedded in the snapshot; login only touches last_login
+    if not created and update_fields != frozenset(['last_login']):
+        mark_dashboards_stale(student_ids=Student.objects.filter(user_id=instance.id).values('id'))
+
+
+def reference_changed(sender, **kwargs):
+    invalidate_reference(REFERENCE_MODELS[sender])
+
+
+def course_prerequisites_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_reference('course')
+
+
+REFERENCE_MODELS = {apps.get_model(model_label): name for name, (model_label, _) in REFERENCE_TABLES.items()}
+for reference_model in REFERENCE_MODELS:
+    post_save.connect(reference_changed, sender=reference_model, dispatch_uid=f'reference_saved_{reference_model._meta.label}')
+    post_delete.connect(reference_changed, sender=reference_model, dispatch_uid=f'reference_deleted_{reference_model._meta.label}')
+m2m_changed.connect(course_prerequisites_changed, sender=Course.prerequisites.through)
@@ -20,5 +20,7 @@ urlpatterns = [
     path('enrollments/', views.EnrollmentListCreateView.as_view(), name='enrollment-list-create'),
 
     # Attendance URLs
+    path('attendance/', views.AttendanceListView.as_view(), name='attendance-list'),
     path('attendance/mark/', views.mark_attendance, name='mark-attendance'),
+    path('attendance/bulk-mark/', views.bulk_mark_attendance_view, name='bulk-mark-attendance'),
 ]
@@ -13,8 +13,11 @@ from .serializers import (
     EnrollmentSerializer, AttendanceSerializer, AssignmentSerializer,
     AssignmentSubmissionSerializer, StudentDashboardSerializer
 )
+from .dashboard_utils import get_dashboard_snapshot, refresh_dashboard_snapshot
+from .attendance_utils import bulk_mark_attendance
+from university_erp.export_utils import StreamingExportMixin
 
-class DepartmentListCreateView(generics.ListCreateAPIView):
+class DepartmentListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -24,7 +27,7 @@ class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class ProgramListCreateView(generics.ListCreateAPIView):
+class ProgramListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Program.objects.all()
     serializer_class = ProgramSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -36,13 +39,13 @@ class ProgramListCreateView(generics.ListCreateAPIView):
             queryset = queryset.filter(department_id=department_id)
         return queryset
 
-class StudentListCreateView(generics.ListCreateAPIView):
+class StudentListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Student.objects.select_related('user', 'program')
+        queryset = Student.objects.select_related('user')
         status_filter = self.request.query_params.get('status', None)
         program_id = self.request.query_params.get('program', None)
 
@@ -53,13 +56,13 @@ class StudentListCreateView(generics.ListCreateAPIView):
 
         return queryset
 
-class CourseListCreateView(generics.ListCreateAPIView):
+class CourseListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Course.objects.select_related('department')
+        queryset = Course.objects.all()
         department_id = self.request.query_params.get('department', None)
         semester = self.request.query_params.get('semester', None)
         year = self.request.query_params.get('year', None)
@@ -73,13 +76,13 @@ class CourseListCreateView(generics.ListCreateAPIView):
 
         return queryset
 
-class EnrollmentListCreateView(generics.ListCreateAPIView):
+class EnrollmentListCreateView(StreamingExportMixin, generics.ListCreateAPIView):
     queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Enrollment.objects.select_related('student__user', 'course')
+        queryset = Enrollment.objects.select_related('student__user')
         student_id = self.request.query_params.get('student', None)
         course_id = self.request.query_params.get('course', None)
 
@@ -90,47 +93,42 @@ class EnrollmentListCreateView(generics.ListCreateAPIView):
 
         return queryset
 
+class AttendanceListView(StreamingExportMixin, generics.ListAPIView):
+    queryset = Attendance.objects.all()
+    serializer_class = AttendanceSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Attendance.objects.select_related('enrollment__student__user')
+        enrollment_id = self.request.query_params.get('enrollment', None)
+        student_id = self.request.query_params.get('student', None)
+        course_id = self.request.query_params.get('course', None)
+        date_from = self.request.query_params.get('date_from', None)
+        date_to = self.request.query_params.get('date_to', None)
+
+        if enrollment_id:
+            queryset = queryset.filter(enrollment_id=enrollment_id)
+        if student_id:
+            queryset = queryset.filter(enrollment__student_id=student_id)
+        if course_id:
+            queryset = queryset.filter(enrollment__course_id=course_id)
+        if date_from:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date__lte=date_to)
+
+        return queryset
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def student_dashboard(request, student_id):
     """Student Dashboard API"""
     try:
-        student = get_object_or_404(Student, id=student_id)
-
-        # Current enrollments
-        current_enrollments = Enrollment.objects.filter(
-            student=student,
-            status='enrolled'
-        ).select_related('course')
-
-        # Upcoming assignments
-        upcoming_assignments = Assignment.objects.filter(
-            course__in=[e.course for e in current_enrollments],
-            due_date__gte=datetime.now()
-        ).order_by('due_date')[:5]
-
-        # Recent attendance
-        recent_attendance = Attendance.objects.filter(
-            enrollment__student=student,
-            date__gte=datetime.now() - timedelta(days=30)
-        ).order_by('-date')[:10]
-
-        # Academic summary
-        academic_summary = {
-            'current_semester': student.current_semester,
-            'current_year': student.current_year,
-            'cgpa': float(student.cgpa),
-            'total_credits': student.total_credits_earned,
-            'attendance_percentage': recent_attendance.filter(status='present').count() / max(recent_attendance.count(), 1) * 100
-        }
-
-        dashboard_data = {
-            'student_info': StudentSerializer(student).data,
-            'current_enrollments': EnrollmentSerializer(current_enrollments, many=True).data,
-            'upcoming_assignments': AssignmentSerializer(upcoming_assignments, many=True).data,
-            'recent_attendance': AttendanceSerializer(recent_attendance, many=True).data,
-            'academic_summary': academic_summary
-        }
+        # Served from the precomputed snapshot in a single read when it is fresh
+        dashboard_data = get_dashboard_snapshot(student_id)
+        if dashboard_data is None:
+            student = get_object_or_404(Student.objects.select_related('user', 'program'), id=student_id)
+            dashboard_data = refresh_dashboard_snapshot(student)
 
         return Response(dashboard_data)
 
@@ -166,3 +164,20 @@ def mark_attendance(request):
 
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_mark_attendance_view(request):
+    """Mark attendance for every enrollment of a class session in one request"""
+    try:
+        course = get_object_or_404(Course, id=request.data.get('course_id'))
+        result = bulk_mark_attendance(
+            course,
+            request.data.get('date', datetime.now().date()),
+            request.data.get('records', []),
+            request.user
+        )
+        return Response(result)
+
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
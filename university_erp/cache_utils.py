@@ -0,0 +1,35 @@
+"""
+Shared cache configuration utilities
+"""
+from django.conf import settings
+from django.core.checks import Warning
+
+# Backends every app server reaches without a SQL round trip, so a version bumped by one process is seen by all
+SHARED_CACHE_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+)
+
+
+def shared_cache_configured(alias='default'):
+    """
+    Whether the cache alias is Redis or Memcached rather than a per-process, file or database cache
+    """
+    return settings.CACHES.get(alias, {}).get('BACKEND') in SHARED_CACHE_BACKENDS
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """
+    System check: production deployments need CACHE_BACKEND pointed at Redis or Memcached
+    """
+    if settings.DEBUG or shared_cache_configured():
+        return []
+    return [Warning(
+        'The default cache is not Redis or Memcached.',
+        hint=(
+            'Set CACHE_BACKEND and CACHE_LOCATION (see README, Production Deployment). Until then the '
+            'reference data and applicant portal caches are kept per process and reread from the database.'
+        ),
+        id='university_erp.W001',
+    )]
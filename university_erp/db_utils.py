@@ -0,0 +1,37 @@
+"""
+Bulk write utilities shared by the apps
+"""
+from django.db import connection, transaction
+
+UPDATE_BATCH_SIZE = 2000
+
+
+def bulk_update_values(model, field_names, rows, batch_size=UPDATE_BATCH_SIZE):
+    """
+    Write (pk, value, ...) rows to the given fields of a model in one transaction.
+
+    QuerySet.bulk_update() builds a CASE WHEN per row and field, which costs
+    about a millisecond of Python per object; a single parameterized UPDATE
+    sent with executemany writes hundreds of thousands of rows in seconds.
+    Values are prepared by their model fields, so Decimals, datetimes and
+    None are stored as bulk_update() would store them. Returns the number
+    of rows sent.
+    """
+    if not rows:
+        return 0
+    meta = model._meta
+    quote_name = connection.ops.quote_name
+    fields = [meta.get_field(name) for name in field_names]
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote_name(meta.db_table),
+        ', '.join(f'{quote_name(field.column)} = %s' for field in fields),
+        quote_name(meta.pk.column),
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, [
+                [field.get_db_prep_save(value, connection) for field, value in zip(fields, values)] + [pk]
+                for pk, *values in rows[start:start + batch_size]
+            ])
+    return len(rows)
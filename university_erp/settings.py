@@ -248,6 +248,76 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='your-app-password')
 DEFAULT_FROM_EMAIL = f'University ERP System <{EMAIL_HOST_USER}>'
 EMAIL_TIMEOUT = 30
 
+# Outbound email queue (delivered by `python manage.py send_queued_emails`)
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 60
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = 3600
+# Raised to at least 3 x 8 SMTP round trips x EMAIL_TIMEOUT; workers refresh their claim every third of it
+EMAIL_OUTBOX_STALE_SECONDS = 900
+
+# Shared secret the payment gateway signs fee payment callbacks with (HMAC-SHA256)
+PAYMENT_GATEWAY_WEBHOOK_SECRET = config('PAYMENT_GATEWAY_WEBHOOK_SECRET', default='')
+
+# Shared cache. Deployments with more than one process must point CACHE_BACKEND/CACHE_LOCATION at
+# Redis or Memcached (e.g. django.core.cache.backends.redis.RedisCache, redis://127.0.0.1:6379/1);
+# with the per-process default the reference data and portal caches reread the database instead.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+# Local-memory, file and database caches cull a third of their keys past MAX_ENTRIES (300 by default);
+# Redis and Memcached evict by memory and take client options here instead
+if not any(name in CACHES['default']['BACKEND'] for name in ('redis', 'memcached')):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=100000, cast=int)}
+
+# Reference data (departments, programs, courses, exam types, fee structures) cache
+REFERENCE_CACHE_TIMEOUT = 86400    # seconds a table version is kept in the shared cache
+REFERENCE_CACHE_LOCAL_TTL = 5      # seconds a process serves its copy before re-checking the version
+REFERENCE_CACHE_LOCAL_SIZE = 16    # tables kept per process
+
+# Applicant portal status cache (GET /api/admissions/portal/<application_number>/)
+PORTAL_STATUS_CACHE_TIMEOUT = 3600  # seconds an entry is kept in the shared cache
+PORTAL_STATUS_LOCAL_TTL = 2         # seconds a process serves its copy; other processes see a change within this
+PORTAL_STATUS_LOCAL_SIZE = 10000    # applicants kept per process
+
+# Student dashboard snapshots are rebuilt at least this often (seconds)
+STUDENT_DASHBOARD_SNAPSHOT_TTL = 3600
+
+# Administrative report generation
+REPORT_WORKERS = 4
+# Workers refresh their claim every third of it while writing a report
+REPORT_CLAIM_TIMEOUT_SECONDS = 3600
+ATTENDANCE_SHORTAGE_THRESHOLD = 75
+
+# Admission merit score weights (components are scaled to percentages first)
+MERIT_WEIGHTS = {
+    'overall_percentage': 0.4,
+    'entrance_exam_score': 0.4,   # ignored for programs that do not require an entrance exam
+    'interview_score': 0.2,       # ignored for programs that do not require an interview
+}
+
+# Batch payroll run (monthly amounts in INR; rates are fractions)
+PAYROLL_RATES = {
+    'house_rent_allowance_rate': 0.40,       # of earned basic
+    'special_allowance_rate': 0.10,          # of earned basic
+    'medical_allowance': 1250,               # fixed, pro-rated by days worked
+    'transport_allowance': 1600,             # fixed, pro-rated by days worked
+    'overtime_multiplier': 2.0,              # times the hourly basic rate
+    'hours_per_day': 8,
+    'provident_fund_rate': 0.12,             # of earned basic up to the wage ceiling
+    'provident_fund_wage_ceiling': 15000,
+    'esi_rate': 0.0075,                      # of gross, for gross up to the ESI ceiling
+    'esi_gross_ceiling': 21000,
+    'tax_standard_deduction': 75000,         # annual
+    # Annual income tax slabs as (upper limit, rate); None is unbounded
+    'tax_slabs': [
+        (400000, 0.00), (800000, 0.05), (1200000, 0.10), (1600000, 0.15),
+        (2000000, 0.20), (2400000, 0.25), (None, 0.30),
+    ],
+}
+
 # Logging Configuration
 LOGGING = {
     'version': 1,